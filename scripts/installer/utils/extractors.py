@@ -1,9 +1,11 @@
 from datetime import UTC, datetime
+import hashlib
 import json
 import logging
 import os
 from pathlib import Path
 import platform
+import stat
 import subprocess
 import sys
 import tempfile
@@ -13,6 +15,7 @@ base_import_dir = Path(__file__).resolve().parents[2]
 if base_import_dir not in sys.path:
     sys.path.append(str(base_import_dir))
 
+from installer.utils.hcl_parser import HCLUnsupported, parse_hcl  # noqa: E402  (sys.path manipulation above)
 from installer.utils.logger import logger  # noqa: E402  (sys.path manipulation above)
 
 
@@ -32,9 +35,25 @@ from installer.utils.logger import logger  # noqa: E402  (sys.path manipulation
 ##     `ghcr.io/seqeralabs/cx-field-tools-installer/hcl2json:0.6-vendored-multiarch`
 ##     (mirror of upstream `tmccombs/hcl2json:0.6`, full blob copy via `skopeo copy
 ##     --multi-arch all`).
+##   - In-process parsing: `installer.utils.hcl_parser` reproduces hcl2json's output for the
+##     syntax this repo uses, so the common path launches no subprocess at all. Results are
+##     memoized per process on (path, mtime, size) and persisted under HCL_CACHE_DIR keyed by
+##     content hash, so `make verify` and test session setup pay the parse once per file
+##     edit. Cached terraform.tfvars parses hold secrets, so the directory is created 0700,
+##     entries are written 0600, and a directory owned by another user (or left group/world
+##     accessible) is never read or written. The binary / Docker path is only taken for syntax the parser declines
+##     (`HCLUnsupported`) or when CX_HCL_PARSER=binary forces it (parity debugging).
 ## ------------------------------------------------------------------------------------
 
 HCL2JSON_BIN = "/tmp/cx-installer/hcl2json"  # noqa: S108  (matches Makefile HCL2JSON_BIN; project-namespaced so bwrap jails can mount it)
+HCL_CACHE_DIR = "/tmp/cx-installer/hcl-cache"  # noqa: S108  (sits next to HCL2JSON_BIN; safe to delete at any time)
+HCL_PARSER_ENV = "CX_HCL_PARSER"
+
+# Bump when `hcl_parser` output changes so stale on-disk entries are ignored.
+_PARSER_VERSION = b"hcl_parser-1"
+
+# (abspath, st_mtime_ns, st_size) → JSON text. Text rather than dict so every caller gets a fresh copy.
+_parsed_memo: dict[tuple[str, int, int], str] = {}
 
 
 def _is_supported_extraction_platform() -> bool:
@@ -101,15 +120,82 @@ def _docker_run_hcl2json(path: str) -> dict:
         raise RuntimeError("Failed to decode Docker output as JSON.") from e
 
 
+def private_cache_dir(directory: str) -> Path | None:
+    """`directory`, created 0700 if missing. None unless it is a real directory only we can access.
+
+    Shared by the on-disk caches under /tmp/cx-installer (HCL parses, subnet inventory): a
+    directory another local user pre-created or opened up is neither read nor written.
+    """
+    cache_dir = Path(directory)
+    try:
+        cache_dir.parent.mkdir(parents=True, exist_ok=True)
+        cache_dir.mkdir(mode=0o700, exist_ok=True)
+        st = os.lstat(cache_dir)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        logger.debug(f"Ignoring cache {cache_dir}: not a private directory owned by this user.")
+        return None
+    return cache_dir
+
+
+def write_private(path: Path, payload: str) -> None:
+    """Write `payload` to `path` atomically, readable by the owner only."""
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(payload)
+    tmp.replace(path)
+
+
+def _parse_in_process(path: str) -> dict | None:
+    """Parse `path` with `hcl_parser`, via the in-memory and on-disk caches. None if unsupported."""
+    file_stat = os.stat(path)
+    memo_key = (os.path.abspath(path), file_stat.st_mtime_ns, file_stat.st_size)
+    if memo_key in _parsed_memo:
+        return json.loads(_parsed_memo[memo_key])
+
+    content = Path(path).read_bytes()
+    cache_dir = private_cache_dir(HCL_CACHE_DIR)
+    cache_file = cache_dir / f"{hashlib.sha256(_PARSER_VERSION + content).hexdigest()}.json" if cache_dir else None
+    try:
+        if cache_file is None:
+            raise FileNotFoundError(HCL_CACHE_DIR)
+        payload = cache_file.read_text()
+        result = json.loads(payload)
+    except (OSError, ValueError):
+        try:
+            result = parse_hcl(content.decode("utf-8"))
+        except (HCLUnsupported, UnicodeDecodeError) as e:
+            logger.debug(f"In-process HCL parse of {path} declined ({e}); using hcl2json.")
+            return None
+        payload = json.dumps(result)
+        # Best effort: a read-only /tmp or unusable cache dir only costs the next process a re-parse.
+        if cache_file is not None:
+            try:
+                write_private(cache_file, payload)
+            except OSError:
+                pass
+
+    _parsed_memo[memo_key] = payload
+    return result
+
+
 def hcl_to_json(path: str) -> dict:
-    """Parse an HCL file (`*.tfvars`, `*.tf`) to a Python dict via `tmccombs/hcl2json`.
+    """Parse an HCL file (`*.tfvars`, `*.tf`) to a Python dict in the shape `tmccombs/hcl2json` emits.
 
     Dispatch:
+      - In-process `hcl_parser` (cached) unless it declines the syntax or CX_HCL_PARSER=binary.
       - Supported platform + binary present → exec the extracted binary (~10-50ms per call).
       - Supported platform + binary missing → fail fast with instructions to run the Makefile
         recipe. Sandboxed environments must extract the binary before entering the sandbox.
       - Unsupported platform (Darwin until Phase 3) → fall back to per-call `docker run`.
     """
+    if os.environ.get(HCL_PARSER_ENV) != "binary":
+        result = _parse_in_process(path)
+        if result is not None:
+            return result
+
     if _can_use_binary():
         result = subprocess.run(  # noqa: S603  (cmd[0] is the vendored extracted binary path)
             [HCL2JSON_BIN, path],
@@ -131,7 +217,7 @@ def hcl_to_json(path: str) -> dict:
 
 
 def get_tfvars_as_json(tfvars_path=None):
-    """Convert a `terraform.tfvars` file to a Python dict via hcl2json.
+    """Convert a `terraform.tfvars` file to a Python dict (see `hcl_to_json`).
 
     If `tfvars_path` is None, defaults to `<cwd>/terraform.tfvars` (the production path).
     Tests can pass an explicit absolute path (e.g. to `templates/TEMPLATE_terraform.tfvars`).
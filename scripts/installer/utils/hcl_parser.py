@@ -0,0 +1,508 @@
+"""In-process HCL → dict conversion, output-compatible with `tmccombs/hcl2json`.
+
+Covers the native-syntax subset this repo's `terraform.tfvars` and `*.tf` files use, and
+reproduces hcl2json's JSON shape rather than evaluating anything:
+
+  - Literal values (strings without interpolation, numbers, bools, null, and tuples /
+    objects built from them) become plain JSON.
+  - Any other expression becomes `"${<exact source text>}"`, including comments and line
+    breaks inside the expression, because downstream code (test precompute) feeds that
+    text straight back into `terraform console`.
+  - Interpolated strings keep their literal parts and wrap each interpolation as `${...}`.
+  - Blocks become lists of bodies keyed by type then labels
+    (`locals {}` → `{"locals": [{...}]}`, `output "x" {}` → `{"output": {"x": [{...}]}}`).
+  - Object keys are emitted sorted (hcl2json marshals Go maps).
+
+Anything outside that subset — template directives (`%{if}` / `%{for}`), conditionals
+interpolated into a larger string, malformed input — raises `HCLUnsupported` so the caller
+can fall back to the hcl2json binary, which stays the reference implementation.
+"""
+
+import re
+
+
+class HCLUnsupported(ValueError):
+    """Input uses syntax the in-process parser doesn't reproduce; defer to hcl2json."""
+
+
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+_NUMBER_RE = re.compile(r"[0-9]+(\.[0-9]+)?([eE][+-]?[0-9]+)?")
+_INDEX_RE = re.compile(r"[0-9]+")
+_BINARY_OPS = ("||", "&&", "==", "!=", "<=", ">=", "<", ">", "+", "-", "*", "/", "%")
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\"}
+
+
+class _Node:
+    """Parsed expression: `kind` is lit | tmpl | tuple | object | cond | expr; `start:end` is its source range."""
+
+    __slots__ = ("end", "kind", "start", "value")
+
+    def __init__(self, kind: str, start: int, end: int, value=None):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.value = value
+
+
+class _Parser:
+    def __init__(self, src: str):
+        self.src = src
+        self.pos = 0
+
+    ## ------------------------------------------------------------------------------------
+    ## Scanning helpers
+    ## ------------------------------------------------------------------------------------
+    def _fail(self, message: str):
+        line = self.src.count("\n", 0, self.pos) + 1
+        raise HCLUnsupported(f"{message} (line {line})")
+
+    def _peek(self, text: str) -> bool:
+        return self.src.startswith(text, self.pos)
+
+    def _expect(self, text: str) -> None:
+        if not self._peek(text):
+            self._fail(f"expected {text!r}")
+        self.pos += len(text)
+
+    def _skip(self, newlines: bool) -> None:
+        """Skip blanks and comments; newlines too when they're insignificant (inside () [] ${})."""
+        src, n = self.src, len(self.src)
+        while self.pos < n:
+            c = src[self.pos]
+            if c in " \t\r" or (c == "\n" and newlines):
+                self.pos += 1
+            elif c == "#" or src.startswith("//", self.pos):
+                end = src.find("\n", self.pos)
+                self.pos = n if end == -1 else end
+            elif src.startswith("/*", self.pos):
+                end = src.find("*/", self.pos + 2)
+                if end == -1:
+                    self._fail("unterminated comment")
+                self.pos = end + 2
+            else:
+                return
+
+    def _ident(self) -> str:
+        m = _IDENT_RE.match(self.src, self.pos)
+        if not m:
+            self._fail("expected identifier")
+        self.pos = m.end()
+        return m.group()
+
+    def _keyword(self, word: str) -> bool:
+        m = _IDENT_RE.match(self.src, self.pos)
+        return bool(m) and m.group() == word
+
+    ## ------------------------------------------------------------------------------------
+    ## Bodies
+    ## ------------------------------------------------------------------------------------
+    def parse_body(self, closing: str | None) -> dict:
+        out: dict = {}
+        while True:
+            self._skip(newlines=True)
+            if self.pos >= len(self.src):
+                if closing:
+                    self._fail(f"expected {closing!r}")
+                return out
+            if closing and self._peek(closing):
+                self.pos += 1
+                return out
+
+            name = self._ident()
+            self._skip(newlines=False)
+            if self._peek("=") and not self._peek("=="):
+                self.pos += 1
+                self._skip(newlines=False)
+                if name in out:
+                    self._fail(f"duplicate attribute {name!r}")
+                out[name] = _convert(self._expression(newlines=False), self.src)
+                self._skip(newlines=False)
+                if self.pos < len(self.src) and not self._peek("\n") and not (closing and self._peek(closing)):
+                    self._fail(f"unexpected content after attribute {name!r}")
+                continue
+
+            labels = []
+            while not self._peek("{"):
+                if self._peek('"'):
+                    label = self._primary(newlines=False)
+                    if not all(isinstance(part, str) for part in label.value):
+                        self._fail("block labels must be literal strings")
+                    labels.append("".join(label.value))
+                else:
+                    labels.append(self._ident())
+                self._skip(newlines=False)
+            self.pos += 1
+            self._add_block(out, name, labels, self.parse_body(closing="}"))
+
+    def _add_block(self, out: dict, block_type: str, labels: list[str], body: dict) -> None:
+        """Mirror hcl2json's `convertBlock`: nest by type then each label, append the body to a list."""
+        key = block_type
+        for label in labels:
+            inner = out.setdefault(key, {})
+            if not isinstance(inner, dict):
+                self._fail(f"block {key!r} mixes labelled and unlabelled forms")
+            out, key = inner, label
+        existing = out.setdefault(key, [])
+        if not isinstance(existing, list):
+            self._fail(f"block {key!r} mixes labelled and unlabelled forms")
+        existing.append(body)
+
+    ## ------------------------------------------------------------------------------------
+    ## Expressions (only the structure hcl2json needs: literal or not, and source range)
+    ## ------------------------------------------------------------------------------------
+    def _expression(self, newlines: bool) -> _Node:
+        start = self.pos
+        node = self._binary(newlines)
+        mark = self.pos
+        self._skip(newlines)
+        if not self._peek("?"):
+            self.pos = mark
+            return node
+        self.pos += 1
+        self._skip(newlines)
+        self._expression(newlines)
+        self._skip(newlines)
+        self._expect(":")
+        self._skip(newlines)
+        return _Node("cond", start, self._expression(newlines).end)
+
+    def _binary(self, newlines: bool) -> _Node:
+        node = self._unary(newlines)
+        while True:
+            mark = self.pos
+            self._skip(newlines)
+            op = next((op for op in _BINARY_OPS if self._peek(op)), None)
+            if op is None or self._peek("=>"):
+                self.pos = mark
+                return node
+            self.pos += len(op)
+            self._skip(newlines)
+            node = _Node("expr", node.start, self._unary(newlines).end)
+
+    def _unary(self, newlines: bool) -> _Node:
+        if not (self._peek("!") or self._peek("-")):
+            return self._postfix(newlines)
+        start, op = self.pos, self.src[self.pos]
+        self.pos += 1
+        self._skip(newlines)
+        operand = self._unary(newlines)
+        if operand.kind == "lit":
+            # hcl2json folds `-<number>` and `!<bool>` into literals.
+            if op == "-" and isinstance(operand.value, (int, float)) and not isinstance(operand.value, bool):
+                return _Node("lit", start, operand.end, -operand.value)
+            if op == "!" and isinstance(operand.value, bool):
+                return _Node("lit", start, operand.end, not operand.value)
+        return _Node("expr", start, operand.end)
+
+    def _postfix(self, newlines: bool) -> _Node:
+        node = self._primary(newlines)
+        while True:
+            if self._peek(".") and not self._peek("..."):
+                self.pos += 1
+                if self._peek("*"):
+                    self.pos += 1
+                elif m := _INDEX_RE.match(self.src, self.pos):
+                    self.pos = m.end()
+                else:
+                    self._ident()
+            elif self._peek("["):
+                self.pos += 1
+                self._skip(newlines=True)
+                if self._peek("*"):
+                    self.pos += 1
+                else:
+                    self._expression(newlines=True)
+                self._skip(newlines=True)
+                self._expect("]")
+            else:
+                return node
+            node = _Node("expr", node.start, self.pos)
+
+    def _primary(self, newlines: bool) -> _Node:
+        start = self.pos
+        if self._peek('"'):
+            self.pos += 1
+            parts = self._template_parts(terminator='"')
+            return _Node("tmpl", start, self.pos, parts)
+        if self._peek("<<"):
+            return self._heredoc()
+        if m := _NUMBER_RE.match(self.src, self.pos):
+            self.pos = m.end()
+            value = float(m.group()) if (m.group(1) or m.group(2)) else int(m.group())
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            return _Node("lit", start, self.pos, value)
+        if self._peek("("):
+            self.pos += 1
+            self._skip(newlines=True)
+            self._expression(newlines=True)
+            self._skip(newlines=True)
+            self._expect(")")
+            return _Node("expr", start, self.pos)
+        if self._peek("["):
+            return self._tuple()
+        if self._peek("{"):
+            return self._object()
+        if _IDENT_RE.match(self.src, self.pos):
+            name = self._ident()
+            while self._peek("::"):
+                self.pos += 2
+                name += "::" + self._ident()
+            if self._peek("("):
+                return self._call(start)
+            if name in ("true", "false"):
+                return _Node("lit", start, self.pos, name == "true")
+            if name == "null":
+                return _Node("lit", start, self.pos, None)
+            return _Node("expr", start, self.pos)
+        self._fail("unsupported expression")
+
+    def _call(self, start: int) -> _Node:
+        self.pos += 1
+        while True:
+            self._skip(newlines=True)
+            if self._peek(")"):
+                break
+            self._expression(newlines=True)
+            self._skip(newlines=True)
+            if self._peek("..."):
+                self.pos += 3
+                self._skip(newlines=True)
+            if self._peek(","):
+                self.pos += 1
+            elif not self._peek(")"):
+                self._fail("expected ',' or ')' in function call")
+        self.pos += 1
+        return _Node("expr", start, self.pos)
+
+    def _tuple(self) -> _Node:
+        start = self.pos
+        self.pos += 1
+        self._skip(newlines=True)
+        if self._keyword("for"):
+            return self._for(start, closing="]")
+        items = []
+        while True:
+            self._skip(newlines=True)
+            if self._peek("]"):
+                break
+            items.append(self._expression(newlines=True))
+            self._skip(newlines=True)
+            if self._peek(","):
+                self.pos += 1
+            elif not self._peek("]"):
+                self._fail("expected ',' or ']' in tuple")
+        self.pos += 1
+        return _Node("tuple", start, self.pos, items)
+
+    def _object(self) -> _Node:
+        start = self.pos
+        self.pos += 1
+        self._skip(newlines=True)
+        if self._keyword("for"):
+            return self._for(start, closing="}")
+        items = []
+        while True:
+            self._skip(newlines=True)
+            if self._peek("}"):
+                break
+            key = self._expression(newlines=False)
+            self._skip(newlines=False)
+            if self._peek("=") and not self._peek("=="):
+                self.pos += 1
+            else:
+                self._expect(":")
+            self._skip(newlines=False)
+            items.append((key, self._expression(newlines=False)))
+            self._skip(newlines=False)
+            if self._peek(","):
+                self.pos += 1
+            elif not (self._peek("\n") or self._peek("}")):
+                self._fail("expected ',', newline or '}' in object")
+        self.pos += 1
+        return _Node("object", start, self.pos, items)
+
+    def _for(self, start: int, closing: str) -> _Node:
+        """`[for ...]` / `{for ...}` — never literal, so only the extent matters."""
+        self._ident()
+        self._skip(newlines=True)
+        self._ident()
+        self._skip(newlines=True)
+        if self._peek(","):
+            self.pos += 1
+            self._skip(newlines=True)
+            self._ident()
+            self._skip(newlines=True)
+        if not self._keyword("in"):
+            self._fail("expected 'in' in for expression")
+        self.pos += 2
+        self._skip(newlines=True)
+        self._expression(newlines=True)
+        self._skip(newlines=True)
+        self._expect(":")
+        self._skip(newlines=True)
+        self._expression(newlines=True)
+        self._skip(newlines=True)
+        if self._peek("=>"):
+            self.pos += 2
+            self._skip(newlines=True)
+            self._expression(newlines=True)
+            self._skip(newlines=True)
+            if self._peek("..."):
+                self.pos += 3
+                self._skip(newlines=True)
+        if self._keyword("if"):
+            self.pos += 2
+            self._skip(newlines=True)
+            self._expression(newlines=True)
+            self._skip(newlines=True)
+        self._expect(closing)
+        return _Node("expr", start, self.pos)
+
+    ## ------------------------------------------------------------------------------------
+    ## Templates
+    ## ------------------------------------------------------------------------------------
+    def _template_parts(self, terminator: str | None, limit: int | None = None) -> list:
+        """Parse template content up to `terminator` (quoted string) or `limit` (heredoc body).
+
+        Returns `[str | _Node, ...]` with adjacent literal text merged.
+        """
+        quoted = terminator is not None
+        end = len(self.src) if limit is None else limit
+        parts: list = []
+        buf: list[str] = []
+        while True:
+            if self.pos >= end:
+                if quoted:
+                    self._fail("unterminated string")
+                break
+            c = self.src[self.pos]
+            if quoted and c == terminator:
+                self.pos += 1
+                break
+            if quoted and c == "\n":
+                self._fail("newline in quoted string")
+            if quoted and c == "\\":
+                buf.append(self._escape())
+            elif self._peek("$${") or self._peek("%%{"):
+                buf.append(c + "{")
+                self.pos += 3
+            elif self._peek("%{"):
+                self._fail("template directives are not supported")
+            elif self._peek("${"):
+                if buf:
+                    parts.append("".join(buf))
+                    buf = []
+                self.pos += 2
+                if self._peek("~"):
+                    self._fail("template strip markers are not supported")
+                self._skip(newlines=True)
+                parts.append(self._expression(newlines=True))
+                self._skip(newlines=True)
+                self._expect("}")
+            else:
+                buf.append(c)
+                self.pos += 1
+        if buf:
+            parts.append("".join(buf))
+        return parts
+
+    def _escape(self) -> str:
+        self.pos += 1
+        c = self.src[self.pos : self.pos + 1]
+        if c in _ESCAPES:
+            self.pos += 1
+            return _ESCAPES[c]
+        width = {"u": 4, "U": 8}.get(c)
+        digits = self.src[self.pos + 1 : self.pos + 1 + width] if width else ""
+        if not width or not re.fullmatch(r"[0-9A-Fa-f]+", digits) or len(digits) != width:
+            self._fail(f"unsupported escape sequence '\\{c}'")
+        self.pos += 1 + width
+        return chr(int(digits, 16))
+
+    def _heredoc(self) -> _Node:
+        start = self.pos
+        self.pos += 2
+        flush = self._peek("-")
+        if flush:
+            self.pos += 1
+        marker = self._ident()
+        self._expect("\n")
+        closing = re.compile(rf"^[ \t]*{re.escape(marker)}[ \t]*$", re.MULTILINE)
+        m = closing.search(self.src, self.pos)
+        if not m:
+            self._fail(f"unterminated heredoc {marker!r}")
+        body_start, body_end = self.pos, m.start()
+        parts = self._template_parts(terminator=None, limit=body_end)
+        if flush:
+            if any(isinstance(p, _Node) for p in parts):
+                self._fail("interpolation inside a flush heredoc is not supported")
+            parts = [_dedent(self.src[body_start:body_end])] if parts else []
+        self.pos = m.end()
+        return _Node("tmpl", start, self.pos, parts)
+
+
+def _dedent(text: str) -> str:
+    lines = text.split("\n")
+    indents = [len(line) - len(line.lstrip(" \t")) for line in lines if line.strip()]
+    width = min(indents, default=0)
+    return "\n".join(line[width:] for line in lines)
+
+
+## ------------------------------------------------------------------------------------
+## Node → hcl2json value
+## ------------------------------------------------------------------------------------
+def _wrap(node: _Node, src: str) -> str:
+    return "${" + src[node.start : node.end] + "}"
+
+
+def _convert(node: _Node, src: str):
+    if node.kind == "lit":
+        return node.value
+    if node.kind == "tmpl":
+        if len(node.value) == 1 and isinstance(node.value[0], _Node):
+            return _convert(node.value[0], src)
+        return _template_string(node, src)
+    if node.kind == "tuple":
+        return [_convert(item, src) for item in node.value]
+    if node.kind == "object":
+        return {_object_key(key, src): _convert(value, src) for key, value in node.value}
+    return _wrap(node, src)
+
+
+def _object_key(node: _Node, src: str) -> str:
+    # Bare identifiers / traversals are taken verbatim; everything else is a template part.
+    if node.kind == "expr" and _IDENT_RE.fullmatch(src[node.start : node.end].split(".")[0]):
+        return src[node.start : node.end]
+    return _string_part(node, src)
+
+
+def _template_string(node: _Node, src: str) -> str:
+    return "".join(part if isinstance(part, str) else _string_part(part, src) for part in node.value)
+
+
+def _string_part(node: _Node, src: str) -> str:
+    if node.kind == "lit":
+        if node.value is None:
+            raise HCLUnsupported("null interpolated into a string")
+        if isinstance(node.value, bool):
+            return "true" if node.value else "false"
+        return str(node.value)
+    if node.kind == "tmpl":
+        return _template_string(node, src)
+    if node.kind == "cond":
+        raise HCLUnsupported("conditional interpolated into a string")
+    return _wrap(node, src)
+
+
+def _sorted(value):
+    if isinstance(value, dict):
+        return {key: _sorted(value[key]) for key in sorted(value)}
+    if isinstance(value, list):
+        return [_sorted(item) for item in value]
+    return value
+
+
+def parse_hcl(src: str) -> dict:
+    """Convert HCL source text to the dict `hcl2json` would emit. Raises `HCLUnsupported`."""
+    return _sorted(_Parser(src).parse_body(closing=None))
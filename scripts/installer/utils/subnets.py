@@ -1,51 +1,123 @@
-from types import SimpleNamespace
+from functools import cache
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
 
 import boto3
-from installer.utils.extractors import get_tfvars_as_json
+from installer.utils.extractors import private_cache_dir, write_private
 from installer.utils.logger import logger
+from installer.utils.tfvars_context import TfvarsContext
+
+
+## ------------------------------------------------------------------------------------
+## Subnet inventory for the configured VPC.
+##
+## - New VPCs: the subnets come straight from tfvars; AWS is never called.
+## - Existing VPCs: one EC2 client per (profile, region) per process, paginated
+##   `describe_subnets`, and an on-disk cache keyed by (profile, region, vpc_id) so repeated
+##   `make verify` runs within SUBNET_CACHE_TTL_SECONDS don't hit the API again.
+##   Set `CX_SUBNET_CACHE_TTL=0` to force a fresh lookup. The cache decides subnet checks
+##   such as `verify_subnet_privacy`, so it follows the HCL cache's rules (0700 dir, 0600
+##   files, ignored unless owned by this user; see `extractors.private_cache_dir`).
+## ------------------------------------------------------------------------------------
+
+SUBNET_CACHE_DIR = "/tmp/cx-installer/subnet-cache"  # noqa: S108  (project-namespaced, alongside the hcl2json binary)
+SUBNET_CACHE_TTL_SECONDS = 15 * 60
+SUBNET_CACHE_TTL_ENV = "CX_SUBNET_CACHE_TTL"
 
 
 def _get_data():
-    """Lazily fetch tfvars-as-namespace. Avoids module-level Docker invocation at import time."""
-    return SimpleNamespace(**get_tfvars_as_json())
+    """Lazily parse tfvars. Only reached when a caller didn't pass its own `TfvarsContext`."""
+    return TfvarsContext.from_file()
+
+
+@cache
+def _ec2_client(profile_name: str, region_name: str):
+    """One boto3 session + EC2 client per (profile, region) for the life of the process."""
+    session = boto3.Session(profile_name=profile_name)
+    return session.client("ec2", region_name=region_name)
 
 
 def generate_aws_session(data=None):
-    """Build a boto3 EC2 client using credentials from tfvars."""
+    """Build (or reuse) a boto3 EC2 client using credentials from tfvars."""
     if data is None:
         data = _get_data()
-    session = boto3.Session(profile_name=data.aws_profile)
-    return session.client("ec2", region_name=data.aws_region)
+    return _ec2_client(data.aws_profile, data.aws_region)
 
 
-def get_all_subnets(cloud_provider="aws"):
+def get_all_subnets(cloud_provider="aws", data=None):
     """Return public/private subnet CIDRs for the configured VPC."""
     if cloud_provider.lower() == "aws":
-        return get_all_aws_subnets()
+        return get_all_aws_subnets(data)
     if cloud_provider.lower() in ("azure", "gcp"):
         return None  # Azure/GCP support not yet implemented.
     raise AssertionError("[ERROR]: Unsupported Cloud Provider specified.")
 
 
-def get_all_aws_subnets():
-    """Query AWS for the configured VPC's public/private subnet CIDRs."""
-    data = _get_data()
-
-    ec2_client = generate_aws_session(data)
-    # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/client/describe_subnets.html#
-    all_subnets = ec2_client.describe_subnets(Filters=[{"Name": "vpc-id", "Values": [data.vpc_existing_id]}])
+def get_all_aws_subnets(data=None):
+    """Public/private subnet CIDRs for the configured VPC (once per `TfvarsContext`)."""
+    if data is None:
+        data = _get_data()
     if data.flag_create_new_vpc:
-        public_subnet_cidrs = data.vpc_new_public_subnets
-        private_subnet_cidrs = data.vpc_new_private_subnets
-    else:
-        public_subnet_cidrs = [
-            subnet["CidrBlock"] for subnet in all_subnets["Subnets"] if subnet["MapPublicIpOnLaunch"]
-        ]
-        private_subnet_cidrs = [
-            subnet["CidrBlock"] for subnet in all_subnets["Subnets"] if not subnet["MapPublicIpOnLaunch"]
-        ]
+        return data.vpc_new_public_subnets, data.vpc_new_private_subnets
+    return data.cached("aws_subnets", lambda: _existing_vpc_subnets(data))
+
+
+def _existing_vpc_subnets(data):
+    all_subnets = describe_vpc_subnets(data.aws_profile, data.aws_region, data.vpc_existing_id)
+    public_subnet_cidrs = [subnet["CidrBlock"] for subnet in all_subnets if subnet["MapPublicIpOnLaunch"]]
+    private_subnet_cidrs = [subnet["CidrBlock"] for subnet in all_subnets if not subnet["MapPublicIpOnLaunch"]]
 
     logger.debug(public_subnet_cidrs)
     logger.debug(private_subnet_cidrs)
 
     return public_subnet_cidrs, private_subnet_cidrs
+
+
+## ------------------------------------------------------------------------------------
+## Lookup + disk cache
+## ------------------------------------------------------------------------------------
+def _cache_ttl() -> float:
+    return float(os.environ.get(SUBNET_CACHE_TTL_ENV, SUBNET_CACHE_TTL_SECONDS))
+
+
+def _cache_path(profile_name: str, region_name: str, vpc_id: str) -> Path | None:
+    """This lookup's cache file, or None when the cache directory isn't private to this user."""
+    cache_dir = private_cache_dir(SUBNET_CACHE_DIR)
+    if cache_dir is None:
+        return None
+    key = hashlib.sha256(f"{profile_name}|{region_name}|{vpc_id}".encode()).hexdigest()[:32]
+    return cache_dir / f"{key}.json"
+
+
+def describe_vpc_subnets(profile_name: str, region_name: str, vpc_id: str) -> list[dict]:
+    """`[{"CidrBlock", "MapPublicIpOnLaunch"}, ...]` for every subnet in `vpc_id`, all pages."""
+    path = _cache_path(profile_name, region_name, vpc_id)
+    ttl = _cache_ttl()
+    if ttl > 0 and path is not None:
+        try:
+            cached = json.loads(path.read_text())
+            if time.time() - cached["fetched_at"] < ttl:
+                logger.debug(f"Using cached subnet inventory for {vpc_id} ({path}).")
+                return cached["subnets"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    ec2_client = _ec2_client(profile_name, region_name)
+    # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/paginator/DescribeSubnets.html
+    paginator = ec2_client.get_paginator("describe_subnets")
+    subnets = [
+        {"CidrBlock": subnet["CidrBlock"], "MapPublicIpOnLaunch": subnet["MapPublicIpOnLaunch"]}
+        for page in paginator.paginate(Filters=[{"Name": "vpc-id", "Values": [vpc_id]}])
+        for subnet in page["Subnets"]
+    ]
+
+    # Best effort: an unwritable cache only costs the next run another lookup.
+    if path is not None:
+        try:
+            write_private(path, json.dumps({"fetched_at": time.time(), "subnets": subnets}))
+        except OSError:
+            pass
+    return subnets
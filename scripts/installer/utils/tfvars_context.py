@@ -0,0 +1,71 @@
+import threading
+from collections.abc import Callable
+from functools import cached_property
+from types import SimpleNamespace
+from typing import Any
+
+from installer.utils.extractors import get_tfvars_as_json
+
+## ------------------------------------------------------------------------------------
+## Flags where exactly one member of each group must be true.
+## ------------------------------------------------------------------------------------
+EXCLUSIVE_FLAG_GROUPS = {
+    "vpc": ("flag_create_new_vpc", "flag_use_existing_vpc"),
+    "database": ("flag_create_external_db", "flag_use_existing_external_db", "flag_use_container_db"),
+    "redis": ("flag_create_external_redis", "flag_use_container_redis"),
+    "ingress": ("flag_create_load_balancer", "flag_use_private_cacert", "flag_do_not_use_https"),
+    "smtp": ("flag_use_aws_ses_iam_integration", "flag_use_existing_smtp"),
+}
+
+
+class TfvarsContext:
+    """`terraform.tfvars` parsed once and shared by every validation check and subnet helper.
+
+    Unknown attributes resolve against the tfvars values, so `ctx.flag_create_new_vpc` reads
+    exactly like the `SimpleNamespace` the checks used to receive. Derived views are computed
+    on first use and memoised for the lifetime of the context.
+    """
+
+    def __init__(self, data_dictionary: dict):
+        self.data_dictionary = data_dictionary
+        self._derived: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, tfvars_path=None) -> "TfvarsContext":
+        """Parse `tfvars_path` (default `<cwd>/terraform.tfvars`) — the only parse a run should need."""
+        return cls(get_tfvars_as_json(tfvars_path))
+
+    def __getattr__(self, name: str):
+        # Only reached for names that aren't real attributes. Guard the internals so a
+        # half-initialised instance (e.g. during copy/pickle) can't recurse.
+        if name.startswith("_") or name == "data_dictionary":
+            raise AttributeError(name)
+        return getattr(self.namespace, name)
+
+    @cached_property
+    def namespace(self) -> SimpleNamespace:
+        """Dot-notation view of the tfvars values."""
+        return SimpleNamespace(**self.data_dictionary)
+
+    @cached_property
+    def keys(self) -> frozenset[str]:
+        """Every key set in the tfvars file."""
+        return frozenset(self.data_dictionary)
+
+    @cached_property
+    def flag_groups(self) -> dict[str, list]:
+        """`{group: [flag values]}` for each entry in `EXCLUSIVE_FLAG_GROUPS`."""
+        return {
+            group: [self.data_dictionary.get(flag) for flag in flags] for group, flags in EXCLUSIVE_FLAG_GROUPS.items()
+        }
+
+    def cached(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Memoise a derived view computed outside this module (e.g. an AWS subnet lookup).
+
+        Thread-safe: concurrent callers for the same key share one `factory()` call.
+        """
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = factory()
+            return self._derived[key]
@@ -3,16 +3,17 @@
 
 from pathlib import Path
 import sys
-from types import SimpleNamespace
+import time
 
 
 base_import_dir = Path(__file__).resolve().parents[2]
 if base_import_dir not in sys.path:
     sys.path.append(str(base_import_dir))
 
-from installer.utils.extractors import get_tfvars_as_json  # noqa: E402  (sys.path manipulation above)
 from installer.utils.logger import logger  # noqa: E402  (sys.path manipulation above)
 from installer.utils.subnets import get_all_subnets  # noqa: E402  (sys.path manipulation above)
+from installer.utils.tfvars_context import TfvarsContext  # noqa: E402  (sys.path manipulation above)
+from installer.validation import engine  # noqa: E402  (sys.path manipulation above)
 
 
 sys.tracebacklimit = 0
@@ -22,12 +23,31 @@ sys.tracebacklimit = 0
 #  1. See comments in utils/helpers.py for reasons why we created our own hacky tfvars parser.
 
 
+# -------------------------------------------------------------------------------
+# CHECK REGISTRY
+# -------------------------------------------------------------------------------
+# Every `verify_*` check registers against a section; sections report in this order.
+TFVARS = "Verifying TFVARS file"
+REGISTRY = "Verifying container registry credentials"
+TOWER = "Verifying Tower configurations"
+AWS = "Verifying AWS Integrations"
+SUBNET = "Verifying Subnet settings"
+STUDIO = "Verifying Data Studio settings"
+DB = "Verifying Database settings"
+WAVE = "Verifying Wave settings"
+PROD = "Verifying alignment to Production Best Practices"
+PIPE = "Verifying pipeline versioning"
+checks = engine.CheckRegistry((TFVARS, REGISTRY, TOWER, AWS, SUBNET, STUDIO, DB, WAVE, PROD, PIPE))
+
+
 # -------------------------------------------------------------------------------
 # HELPER FUNCTIONS
 # -------------------------------------------------------------------------------
 def log_error_and_exit(message: str):
-    """Log an error message and exit with status 1."""
+    """Log an error message and stop: just the current check under the engine, else exit with status 1."""
     logger.error(message)
+    if engine.in_check():
+        raise engine.CheckFailed(message)
     sys.exit(1)
 
 
@@ -57,28 +77,15 @@ def ensure_dependency_populated(flag: bool, child: str, qualifier: str) -> None:
 # -------------------------------------------------------------------------------
 # GROUPING FUNCTIONS
 # -------------------------------------------------------------------------------
-def verify_only_one_true_set(data: SimpleNamespace):
+@checks.register(TFVARS)
+def verify_only_one_true_set(data: TfvarsContext):
     """Check that related config blocks only have 1 true and * false."""
-    only_one_true_set([data.flag_create_new_vpc, data.flag_use_existing_vpc])
-    only_one_true_set(
-        [
-            data.flag_create_external_db,
-            data.flag_use_existing_external_db,
-            data.flag_use_container_db,
-        ]
-    )
-    only_one_true_set([data.flag_create_external_redis, data.flag_use_container_redis])
-    only_one_true_set(
-        [
-            data.flag_create_load_balancer,
-            data.flag_use_private_cacert,
-            data.flag_do_not_use_https,
-        ]
-    )
-    only_one_true_set([data.flag_use_aws_ses_iam_integration, data.flag_use_existing_smtp])
+    for flags in data.flag_groups.values():
+        only_one_true_set(flags)
 
 
-def verify_sensitive_keys(data: SimpleNamespace, data_dictionary: dict):
+@checks.register(TFVARS)
+def verify_sensitive_keys(data: TfvarsContext):
     """Check that sensitive keys are not defined in tfvars file."""
     sensitive_keys = [
         "db_root_user",
@@ -95,13 +102,13 @@ def verify_sensitive_keys(data: SimpleNamespace, data_dictionary: dict):
         "swell_db_password",
     ]
 
-    data_keys = data_dictionary.keys()
     for key in sensitive_keys:
-        if key in data_keys:
+        if key in data.keys:
             log_error_and_exit(f" Do not specify `{key}`. This value will be sourced from SSM.")
 
 
-def verify_tfvars_config_dependencies(data: SimpleNamespace):
+@checks.register(TFVARS)
+def verify_tfvars_config_dependencies(data: TfvarsContext):
     """Ensure dependent keys are a populated if a flag is active."""
     # VPC Dependency checks
     ensure_dependency_populated(
@@ -133,7 +140,7 @@ def verify_tfvars_config_dependencies(data: SimpleNamespace):
     )
 
 
-def verify_tower_server_url(data: SimpleNamespace):
+def verify_tower_server_url(data: TfvarsContext):
     """Verify the tower server url is correctly configured."""
     if data.tower_server_port != "8000":
         logger.warning(
@@ -141,13 +148,15 @@ def verify_tower_server_url(data: SimpleNamespace):
         )
 
 
-def verify_tower_self_signed_certs(data: SimpleNamespace):
+@checks.register(TOWER)
+def verify_tower_self_signed_certs(data: TfvarsContext):
     """Check self-signed certificate settings (if necessary)."""
     if data.flag_use_private_cacert and not data.private_cacert_bucket_prefix.startswith("s3://"):
         log_error_and_exit(" Field `private_cacert_bucket_prefix` must start with `s3://`")
 
 
-def verify_docker_daemon_loggin(data: SimpleNamespace):
+@checks.register(TOWER)
+def verify_docker_daemon_loggin(data: TfvarsContext):
     """Check Docker Daemon logging configuration."""
     logging_flags = [
         data.flag_docker_logging_local,
@@ -159,7 +168,8 @@ def verify_docker_daemon_loggin(data: SimpleNamespace):
         log_error_and_exit("Choose one and only one docker logging flag to be true.")
 
 
-def verify_email_login_disablement(data: SimpleNamespace):
+@checks.register(TOWER)
+def verify_email_login_disablement(data: TfvarsContext):
     """Check email login disablement scenarios."""
     if data.flag_disable_email_login:
         oidc_flags = [
@@ -174,19 +184,22 @@ def verify_email_login_disablement(data: SimpleNamespace):
             logger.warning("Seqerakit step cannot execute if email login is not active.")
 
 
-def verify_workflow_cleanup_enabled(data: SimpleNamespace):
+@checks.register(TOWER)
+def verify_workflow_cleanup_enabled(data: TfvarsContext):
     """Check workflow cleanup enablement scenarios."""
     if data.tower_workflow_cleanup_enabled and data.tower_container_version < "v25.1.0":
         log_error_and_exit("Workflow cleanup can only be enabled on Platform v25.1.0+")
 
 
-def verify_data_lineage_enabled(data: SimpleNamespace):
+@checks.register(TOWER)
+def verify_data_lineage_enabled(data: TfvarsContext):
     """Check data lineage enablement scenarios."""
     if data.flag_enable_data_lineage and data.tower_container_version < "v26.1.0":
         log_error_and_exit("Data lineage can only be enabled on Platform v26.1.0+")
 
 
-def verify_aws_instance_credentials_platform_version(data: SimpleNamespace):
+@checks.register(TOWER)
+def verify_aws_instance_credentials_platform_version(data: TfvarsContext):
     """Reject AWS instance credentials on Platform versions with the known bug.
 
     Platform v26.1.0 through v26.1.2 cant use new AWS credentials (assumed via instance
@@ -210,7 +223,8 @@ def verify_aws_instance_credentials_platform_version(data: SimpleNamespace):
         )
 
 
-def verify_compute_env_cleanup_platform_version(data: SimpleNamespace):
+@checks.register(TOWER)
+def verify_compute_env_cleanup_platform_version(data: TfvarsContext):
     """Warn when compute-env cleanup is enabled on pre-v26.1 Platform.
 
     `tower_compute_env_cleanup` defaults to `enabled = false`, so the env vars
@@ -228,7 +242,8 @@ def verify_compute_env_cleanup_platform_version(data: SimpleNamespace):
         )
 
 
-def verify_audit_log_v2_platform_version(data: SimpleNamespace):
+@checks.register(TOWER)
+def verify_audit_log_v2_platform_version(data: TfvarsContext):
     """Warn when Audit Log v2 settings will be emitted but ignored by Platform.
 
     The `tower_audit_log_v2` block is a Platform v26.1.0+ feature. Defaults to
@@ -245,7 +260,8 @@ def verify_audit_log_v2_platform_version(data: SimpleNamespace):
         )
 
 
-def verify_nextflow_parser_v2_advisory(data: SimpleNamespace):
+@checks.register(TOWER)
+def verify_nextflow_parser_v2_advisory(data: TfvarsContext):
     """Advisory: Platform v26.1.0+ ships with Nextflow 26.04 and the new syntax parser.
 
     Configured pipelines may need to update their Nextflow parser version setting
@@ -261,10 +277,11 @@ def verify_nextflow_parser_v2_advisory(data: SimpleNamespace):
         )
 
 
-def verify_subnet_privacy(data: SimpleNamespace):
+@checks.register(AWS, io_bound=True)
+def verify_subnet_privacy(data: TfvarsContext):
     """Check that the assigned subnets in tfvars match the intended privacy of the Tower instance."""
     logger.info("Retrieving subnet information from AWS Account.")
-    public_subnets, private_subnets = get_all_subnets("aws")
+    public_subnets, private_subnets = get_all_subnets("aws", data)
 
     # TO DO: Reduce verbosity by creating a `partial`-type function to make `data.vpc_new_ec2_subnets` DRY.
     if data.flag_create_new_vpc:
@@ -318,7 +335,8 @@ def verify_subnet_privacy(data: SimpleNamespace):
         )
 
 
-def verify_ses_integration(data: SimpleNamespace):
+@checks.register(AWS)
+def verify_ses_integration(data: TfvarsContext):
     """Check SES integration settings."""
     if data.flag_use_aws_ses_iam_integration:
         if "amazonaws.com" not in data.tower_smtp_host:
@@ -328,7 +346,8 @@ def verify_ses_integration(data: SimpleNamespace):
             log_error_and_exit("SES integration requires port 587. Please fix.")
 
 
-def verify_pre_existing_role_attachments(data: SimpleNamespace):
+@checks.register(AWS)
+def verify_pre_existing_role_attachments(data: TfvarsContext):
     """Warn when feature-attachable IAM policies can't be applied to a pre-existing role.
 
     When `flag_iam_use_prexisting_role_arn = true`, the installer doesn't manage the
@@ -352,7 +371,8 @@ def verify_pre_existing_role_attachments(data: SimpleNamespace):
         )
 
 
-def verify_route53_integration(data: SimpleNamespace):
+@checks.register(AWS)
+def verify_route53_integration(data: TfvarsContext):
     """Check DNS settings."""
     mismatch = False
     if data.flag_create_route53_private_zone and data.new_route53_private_zone_name not in data.tower_server_url:
@@ -371,7 +391,8 @@ def verify_route53_integration(data: SimpleNamespace):
         log_error_and_exit("`tower_server_url` does not match DNS zone.")
 
 
-def verify_ingress_and_egress(data: SimpleNamespace, data_dictionary: dict):
+@checks.register(AWS)
+def verify_ingress_and_egress(data: TfvarsContext):
     """Issue reminders if ingress/egress rules seem overly loose."""
     if data.sg_ingress_cidrs == "0.0.0.0/0":
         logger.warning("`sg_ingress_cidrs` is completely open (HTTPs) . Consider tightening.")
@@ -388,17 +409,19 @@ def verify_ingress_and_egress(data: SimpleNamespace, data_dictionary: dict):
         "sg_egress_interface_endpoint",
     ]
     for sg in egress_sgs:
-        if data_dictionary[sg] == ["all-all"]:
+        if data.data_dictionary[sg] == ["all-all"]:
             logger.warning(f"`{sg}` allows egress everywhere. Consider tightening.")
 
 
-def verify_flow_logs(data: SimpleNamespace):
+@checks.register(AWS)
+def verify_flow_logs(data: TfvarsContext):
     """Issue reminder about Flow logs cost."""
     if (data.flag_create_new_vpc) and (data.enable_vpc_flow_logs):
         logger.warning("You have VPC Flow Logs activated. This will generate extra costs.")
 
 
-def verify_ami_update_behaviour(data: SimpleNamespace):
+@checks.register(DB)
+def verify_ami_update_behaviour(data: TfvarsContext):
     """Check AMI update logic."""
     if data.ec2_update_ami_if_available:
         logger.info(
@@ -412,7 +435,8 @@ def verify_ami_update_behaviour(data: SimpleNamespace):
             )
 
 
-def verify_database_configuration(data: SimpleNamespace):
+@checks.register(DB)
+def verify_database_configuration(data: TfvarsContext):
     """Verify / Warn about various database configuration items."""
     if (data.db_engine == "mysql") and ("8" in data.db_engine_version):
         logger.warning("MySQL 8 may need TOWER_DB_URL connection string modifiers.")
@@ -462,7 +486,8 @@ def verify_database_configuration(data: SimpleNamespace):
         )
 
 
-def verify_data_studio(data: SimpleNamespace):
+@checks.register(STUDIO)
+def verify_data_studio(data: TfvarsContext):
     """Verify fields related to Data Studio."""
     if data.flag_enable_data_studio:
         if data.flag_use_private_cacert:
@@ -497,7 +522,8 @@ def verify_data_studio(data: SimpleNamespace):
             )
 
 
-def verify_data_studio_ssh(data: SimpleNamespace):
+@checks.register(STUDIO)
+def verify_data_studio_ssh(data: TfvarsContext):
     """Verify fields related to Data Studio SSH."""
     if data.flag_enable_data_studio_ssh:
         if not data.flag_enable_data_studio:
@@ -512,7 +538,8 @@ def verify_data_studio_ssh(data: SimpleNamespace):
             )
 
 
-def verify_alb_settings(data: SimpleNamespace):
+@checks.register(AWS)
+def verify_alb_settings(data: TfvarsContext):
     """Verify that user does not have contradictory settings in case of ALB vs. no ALB."""
     if data.flag_use_private_cacert and data.flag_make_instance_private_behind_public_alb:
         log_error_and_exit(
@@ -522,7 +549,8 @@ def verify_alb_settings(data: SimpleNamespace):
         )
 
 
-def verify_wave(data: SimpleNamespace):
+@checks.register(WAVE)
+def verify_wave(data: TfvarsContext):
     """Check Wave / Wave-Lite mutual exclusion and private-cert interaction."""
     if data.flag_use_wave and data.flag_use_wave_lite:
         log_error_and_exit("`flag_use_wave` and `flag_use_wave_lite` cannot both be set to true.")
@@ -531,7 +559,8 @@ def verify_wave(data: SimpleNamespace):
         logger.warning("Please see documentation to understand how to make private certs work with Wave-Lite.")
 
 
-def verify_ssh_access(data: SimpleNamespace):
+@checks.register(SUBNET)
+def verify_ssh_access(data: TfvarsContext):
     """Verify SSH access prerequisites when EC2 is set to be publicly reachable."""
     # VM needs to be sitting in public subnet in order to connect to it by SSH directly (instead of EICE).
     # I often try this with VM in private subnet and it takes awhile to figure out why. Adding check.
@@ -550,7 +579,8 @@ def verify_ssh_access(data: SimpleNamespace):
             )
 
 
-def verify_production_deployment(data: SimpleNamespace):
+@checks.register(PROD)
+def verify_production_deployment(data: TfvarsContext):
     """Warn when configuration deviates from production-recommended managed DB/Redis."""
     if (not data.flag_create_external_db) or (not data.flag_create_external_redis):
         logger.warning(
@@ -567,7 +597,8 @@ def verify_production_deployment(data: SimpleNamespace):
         )
 
 
-def verify_container_registry_credentials(data: SimpleNamespace):
+@checks.register(REGISTRY)
+def verify_container_registry_credentials(data: TfvarsContext):
     """Warn about Harbor registry credential requirements for Platform v26.1+."""
     if data.tower_container_version >= "v26.1":
         logger.warning(
@@ -579,7 +610,8 @@ def verify_container_registry_credentials(data: SimpleNamespace):
         )
 
 
-def verify_insecure_platform(data: SimpleNamespace):
+@checks.register(PROD)
+def verify_insecure_platform(data: TfvarsContext):
     """Block feature combinations that require HTTPS when HTTPS is disabled."""
     if data.flag_do_not_use_https:
         if data.flag_enable_data_studio:
@@ -589,7 +621,8 @@ def verify_insecure_platform(data: SimpleNamespace):
             log_error_and_exit("Wave-Lite requires a secure Seqera Platform endpoint.")
 
 
-def warn_if_entra_id_error_possible(data: SimpleNamespace):
+@checks.register(PROD)
+def warn_if_entra_id_error_possible(data: TfvarsContext):
     """Warn that Platform < 25.3 with Entra ID (Azure AD) requires an extra config snippet."""
     if (data.tower_container_version < "v25.3") and data.flag_oidc_use_generic:
         logger.warning(
@@ -598,7 +631,8 @@ def warn_if_entra_id_error_possible(data: SimpleNamespace):
         )
 
 
-def verify_pipeline_versioning(data: SimpleNamespace):
+@checks.register(PIPE)
+def verify_pipeline_versioning(data: TfvarsContext):
     """Conduct checks if pipeline versioning is active."""
     if data.tower_enable_pipeline_versioning and data.tower_container_version < "v25.3.0":
         logger.warning("Your Platform version is too old to support pipeline versioning. Must be >= v25.3.0.")
@@ -611,94 +645,21 @@ if __name__ == "__main__":
     print("\n")
     logger.info("Beginning tfvars configuration check.".upper())
 
-    # Generate dictionary from tfvars then convert to SimpleNamespace for cleaner dot-notation access.
-    # Kept the two objects different for convenience when .keys() method is required.
-    data_dictionary = get_tfvars_as_json()
-    data = SimpleNamespace(**data_dictionary)
-
-    # Verify tfvars fields
-    print("\n")
-    logger.info("Verifying TFVARS file")
-    logger.info("-" * 50)
-    verify_only_one_true_set(data)
-    verify_sensitive_keys(data, data_dictionary)
-    verify_tfvars_config_dependencies(data)
-
-    # Verify container registry credentials
-    print("\n")
-    logger.info("Verifying container registry credentials")
-    logger.info("-" * 50)
-    verify_container_registry_credentials(data)
-
-    # Verify Tower application configurations
-    print("\n")
-    logger.info("Verifying Tower configurations")
-    logger.info("-" * 50)
-    verify_tower_self_signed_certs(data)
-    verify_docker_daemon_loggin(data)
-    verify_email_login_disablement(data)
-    verify_workflow_cleanup_enabled(data)
-    verify_data_lineage_enabled(data)
-    verify_aws_instance_credentials_platform_version(data)
-    verify_compute_env_cleanup_platform_version(data)
-    verify_audit_log_v2_platform_version(data)
-    verify_nextflow_parser_v2_advisory(data)
-
-    # Verify AWS integrations
-    print("\n")
-    logger.info("Verifying AWS Integrations")
-    logger.info("-" * 50)
-    verify_subnet_privacy(data)
-    verify_ses_integration(data)
-    verify_pre_existing_role_attachments(data)
-    verify_route53_integration(data)
-    verify_ingress_and_egress(data, data_dictionary)
-    verify_flow_logs(data)
-    verify_alb_settings(data)
-
-    # Verify Public/Private Subnet settings
-    print("\n")
-    logger.info("Verifying Subnet settings")
-    logger.info("-" * 50)
-    verify_ssh_access(data)
-
-    # Verify data studio settings
-    print("\n")
-    logger.info("Verifying Data Studio settings")
-    logger.info("-" * 50)
-    verify_data_studio(data)
-    verify_data_studio_ssh(data)
-
-    # Verify database settings (last since this is the most critical component and most likely to be seen)
-    print("\n")
-    logger.info("Verifying Database settings")
-    logger.info("-" * 50)
-    verify_ami_update_behaviour(data)
-    verify_database_configuration(data)
-
-    # Verify Wave settings
-    print("\n")
-    logger.info("Verifying Wave settings")
-    logger.info("-" * 50)
-    verify_wave(data)
-
-    # Verify alignment to Production Best Practice
-    print("\n")
-    logger.info("Verifying alignment to Production Best Practices")
-    logger.info("-" * 50)
-    verify_production_deployment(data)
-    verify_insecure_platform(data=data)
+    # Parse tfvars once; every check (and the subnet lookup) reads from the same context.
+    data = TfvarsContext.from_file()
 
-    # Issue Warnings (if applicable)
-    warn_if_entra_id_error_possible(data)
+    start = time.monotonic()
+    results = checks.run(data)
 
-    # Check pipeline versioning
     print("\n")
-    logger.info("Verifying pipeline versioning")
-    logger.info("-" * 50)
-    verify_pipeline_versioning(data)
+    for line in engine.format_report(results, time.monotonic() - start):
+        logger.info(line)
 
+    failed = [r.name for r in results if r.errors]
     print("\n")
+    if failed:
+        logger.error(f"Finished tfvars configuration check: {len(failed)} check(s) failed.")
+        sys.exit(1)
     logger.info("Finished tfvars configuration check.")
 
     sys.exit()
@@ -0,0 +1,144 @@
+import contextvars
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from installer.utils.logger import logger
+
+## ------------------------------------------------------------------------------------
+## Check engine for `check_configuration.py`.
+##
+## Checks register against a section and run independently: an error stops only the
+## check that raised it, so one `make verify` reports every misconfiguration at once.
+## I/O-bound checks (AWS lookups) are submitted to a thread pool up front and overlap with
+## the in-memory checks. Warnings and errors logged while a check runs are attributed to
+## that check and collected into a single report with per-check timing.
+## ------------------------------------------------------------------------------------
+
+
+class CheckFailed(Exception):
+    """Raised by `log_error_and_exit` under the engine to end the current check (not the process)."""
+
+
+@dataclass
+class CheckResult:
+    name: str
+    section: str
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def status(self) -> str:
+        if self.errors:
+            return "ERROR"
+        return "WARN" if self.warnings else "OK"
+
+
+@dataclass
+class Check:
+    name: str
+    fn: Callable
+    section: str
+    io_bound: bool
+
+
+_current: contextvars.ContextVar[CheckResult | None] = contextvars.ContextVar("current_check", default=None)
+
+
+def in_check() -> bool:
+    """True while the calling thread is executing a check under `CheckRegistry.run`."""
+    return _current.get() is not None
+
+
+class _ResultCapture(logging.Handler):
+    """Attribute WARNING/ERROR records to whichever check is running in the emitting thread."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        result = _current.get()
+        if result is None:
+            return
+        message = record.getMessage().strip()
+        if record.levelno >= logging.ERROR:
+            result.errors.append(message)
+        elif record.levelno >= logging.WARNING:
+            result.warnings.append(message)
+
+
+class CheckRegistry:
+    def __init__(self, sections: tuple[str, ...]):
+        self.sections = sections
+        self.checks: list[Check] = []
+
+    def register(self, section: str, io_bound: bool = False):
+        """Decorator: add the function to `section`. Sections run in the order given to the registry."""
+        if section not in self.sections:
+            raise ValueError(f"Unknown check section: {section!r}.")
+
+        def decorator(fn: Callable) -> Callable:
+            self.checks.append(Check(fn.__name__, fn, section, io_bound))
+            return fn
+
+        return decorator
+
+    def run(self, data, max_workers: int = 4) -> list[CheckResult]:
+        """Run every registered check against `data`; results come back in section order."""
+        ordered = sorted(self.checks, key=lambda c: self.sections.index(c.section))
+        results: dict[str, CheckResult] = {}
+        capture = _ResultCapture(level=logging.WARNING)
+        logger.addHandler(capture)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                pending = {c.name: pool.submit(_run_one, c, data) for c in ordered if c.io_bound}
+
+                for section in self.sections:
+                    section_checks = [c for c in ordered if c.section == section and not c.io_bound]
+                    if not section_checks:
+                        continue
+                    print("\n")
+                    logger.info(section)
+                    logger.info("-" * 50)
+                    for check in section_checks:
+                        results[check.name] = _run_one(check, data)
+
+                for name, future in pending.items():
+                    results[name] = future.result()
+        finally:
+            logger.removeHandler(capture)
+        return [results[c.name] for c in ordered]
+
+
+def _run_one(check: Check, data) -> CheckResult:
+    result = CheckResult(check.name, check.section)
+    token = _current.set(result)
+    start = time.monotonic()
+    try:
+        check.fn(data)
+    except CheckFailed:
+        pass
+    except Exception as e:  # noqa: BLE001  (a crashing check is reported, not allowed to hide the others)
+        logger.error(f"{check.name} crashed: {type(e).__name__}: {e}")
+    finally:
+        result.seconds = time.monotonic() - start
+        _current.reset(token)
+    return result
+
+
+def format_report(results: list[CheckResult], elapsed: float) -> list[str]:
+    """One line per check (status, name, timing), followed by its errors and warnings."""
+    width = max((len(r.name) for r in results), default=0)
+    lines = ["CONFIGURATION CHECK REPORT"]
+    section = None
+    for r in results:
+        if r.section != section:
+            section = r.section
+            lines.append(f"{section}:")
+        lines.append(f"  [{r.status:<5}] {r.name:<{width}}  {r.seconds:.3f}s")
+        lines.extend(f"      - ERROR: {message}" for message in r.errors)
+        lines.extend(f"      - WARNING: {message}" for message in r.warnings)
+    errors = sum(len(r.errors) for r in results)
+    warnings = sum(len(r.warnings) for r in results)
+    lines.append(f"{len(results)} checks, {errors} errors, {warnings} warnings in {elapsed:.2f}s.")
+    return lines
@@ -0,0 +1,86 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from installer.utils.logger import logger
+from installer.validation import engine
+from installer.validation.check_configuration import log_error_and_exit
+
+FIRST, SECOND = "First section", "Second section"
+
+
+@pytest.fixture
+def checks():
+    return engine.CheckRegistry((FIRST, SECOND))
+
+
+def test_every_failing_check_is_reported(checks):
+    """An error ends only its own check; later checks still run."""
+
+    @checks.register(FIRST)
+    def verify_a(data):
+        log_error_and_exit("a is wrong")
+        raise AssertionError("unreachable: the check should stop at its first error")
+
+    @checks.register(SECOND)
+    def verify_b(data):
+        logger.warning("b looks odd")
+        log_error_and_exit("b is wrong")
+
+    @checks.register(FIRST)
+    def verify_c(data):
+        return data.value
+
+    ordered = checks.run(SimpleNamespace(value=1))
+    assert [r.name for r in ordered] == ["verify_a", "verify_c", "verify_b"]
+    results = {r.name: r for r in ordered}
+    assert results["verify_a"].errors == ["a is wrong"]
+    assert results["verify_b"].errors == ["b is wrong"]
+    assert results["verify_b"].warnings == ["b looks odd"]
+    assert results["verify_c"].status == "OK"
+
+
+def test_crashing_check_is_an_error_not_an_abort(checks):
+    @checks.register(FIRST)
+    def verify_missing_key(data):
+        return data.not_there
+
+    @checks.register(FIRST)
+    def verify_fine(data):
+        pass
+
+    results = checks.run(SimpleNamespace())
+    assert "AttributeError" in results[0].errors[0]
+    assert results[1].status == "OK"
+
+
+def test_io_bound_checks_overlap(checks):
+    for i in range(3):
+
+        def verify_slow(data):
+            time.sleep(0.2)
+            logger.warning("slow lookup")
+
+        verify_slow.__name__ = f"verify_slow_{i}"
+        checks.register(SECOND, io_bound=True)(verify_slow)
+
+    start = time.monotonic()
+    results = checks.run(SimpleNamespace())
+    assert time.monotonic() - start < 0.5
+    # Warnings from pool threads land on the right check.
+    assert all(r.warnings == ["slow lookup"] and r.seconds >= 0.2 for r in results)
+
+
+def test_log_error_and_exit_outside_engine_still_exits():
+    with pytest.raises(SystemExit):
+        log_error_and_exit("standalone caller")
+
+
+def test_report_summarises_counts(checks):
+    results = [
+        engine.CheckResult("verify_a", FIRST, errors=["x"], seconds=0.01),
+        engine.CheckResult("verify_b", FIRST, warnings=["y", "z"]),
+    ]
+    report = engine.format_report(results, elapsed=0.5)
+    assert "[ERROR] verify_a" in report[2]
+    assert report[-1] == "2 checks, 1 errors, 2 warnings in 0.50s."
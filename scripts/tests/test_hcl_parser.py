@@ -0,0 +1,150 @@
+import os
+from pathlib import Path
+
+import pytest
+from installer.utils import extractors
+from installer.utils.extractors import HCL2JSON_BIN, _can_use_binary, hcl_to_json
+from installer.utils.hcl_parser import HCLUnsupported, parse_hcl
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def hcl_cache(tmp_path, monkeypatch):
+    """Isolate the on-disk + in-memory parse caches from the real ones."""
+    monkeypatch.setattr(extractors, "HCL_CACHE_DIR", str(tmp_path / "hcl-cache"))
+    monkeypatch.setattr(extractors, "_parsed_memo", {})
+    monkeypatch.delenv(extractors.HCL_PARSER_ENV, raising=False)
+    return tmp_path / "hcl-cache"
+
+
+## ------------------------------------------------------------------------------------
+## hcl2json output shape
+## ------------------------------------------------------------------------------------
+def test_literals_become_json():
+    src = 'a = "x"\nb = 3\nc = 1.5\nd = true\ne = null\nf = -2\ng = ["p", 1]\nh = { k = "v", "q-r" = false }\n'
+    assert parse_hcl(src) == {
+        "a": "x",
+        "b": 3,
+        "c": 1.5,
+        "d": True,
+        "e": None,
+        "f": -2,
+        "g": ["p", 1],
+        "h": {"k": "v", "q-r": False},
+    }
+
+
+def test_non_literals_keep_exact_source():
+    """Comments and line breaks inside an expression survive — precompute replays this text in console."""
+    src = 'x = upper(\n  var.a, # note\n  "b"\n)\ny = "pre-${var.name}-post"\nz = "${local.v}"\n'
+    assert parse_hcl(src) == {
+        "x": '${upper(\n  var.a, # note\n  "b"\n)}',
+        "y": "pre-${var.name}-post",
+        "z": "${local.v}",
+    }
+
+
+def test_blocks_become_lists_keyed_by_labels():
+    src = 'locals {\n  a = 1\n}\nlocals {\n  b = 2\n}\noutput "o" {\n  value = local.a\n}\n'
+    assert parse_hcl(src) == {
+        "locals": [{"a": 1}, {"b": 2}],
+        "output": {"o": [{"value": "${local.a}"}]},
+    }
+
+
+def test_escapes_and_comments():
+    src = '/* block\ncomment */\na = "q\\"t\\n$${raw}" // trailing\n'
+    assert parse_hcl(src) == {"a": 'q"t\n${raw}'}
+
+
+@pytest.mark.parametrize(
+    "src",
+    [
+        'a = "%{ if true }x%{ endif }"',  # template directive
+        'a = "p-${var.x ? "y" : "n"}"',  # conditional folded into a string
+        "a = 1\na = 2",  # duplicate attribute (hcl2json reports the error)
+        "a = [1,",  # malformed
+    ],
+)
+def test_unsupported_syntax_is_declined(src):
+    with pytest.raises(HCLUnsupported):
+        parse_hcl(src)
+
+
+## ------------------------------------------------------------------------------------
+## Dispatch + caching
+## ------------------------------------------------------------------------------------
+def test_parse_is_memoized_and_cached_on_disk(hcl_cache, tmp_path, monkeypatch):
+    tfvars = tmp_path / "terraform.tfvars"
+    tfvars.write_text('app_name = "tower"\n')
+    calls = []
+    monkeypatch.setattr(extractors, "parse_hcl", lambda src: calls.append(src) or parse_hcl(src))
+
+    first = hcl_to_json(str(tfvars))
+    first["app_name"] = "mutated"
+    assert hcl_to_json(str(tfvars)) == {"app_name": "tower"}
+    assert len(calls) == 1
+
+    # New process (empty memo), same content → served from disk.
+    monkeypatch.setattr(extractors, "_parsed_memo", {})
+    assert hcl_to_json(str(tfvars)) == {"app_name": "tower"}
+    assert len(calls) == 1
+    assert len(list(hcl_cache.glob("*.json"))) == 1
+
+    tfvars.write_text('app_name = "tower-edited"\n')
+    assert hcl_to_json(str(tfvars)) == {"app_name": "tower-edited"}
+    assert len(calls) == 2
+
+
+def test_disk_cache_is_private(hcl_cache, tmp_path):
+    tfvars = tmp_path / "terraform.tfvars"
+    tfvars.write_text('db_password = "secret"\n')
+
+    hcl_to_json(str(tfvars))
+    (entry,) = hcl_cache.glob("*.json")
+    assert hcl_cache.stat().st_mode & 0o777 == 0o700
+    assert entry.stat().st_mode & 0o777 == 0o600
+
+
+def test_shared_cache_dir_is_ignored(hcl_cache, tmp_path, monkeypatch):
+    """A group/world-accessible (or foreign-owned) directory is neither read nor written."""
+    tfvars = tmp_path / "terraform.tfvars"
+    tfvars.write_text('app_name = "tower"\n')
+    hcl_cache.mkdir(mode=0o755)
+    hcl_cache.chmod(0o755)
+    planted = (
+        hcl_cache / f"{extractors.hashlib.sha256(extractors._PARSER_VERSION + tfvars.read_bytes()).hexdigest()}.json"
+    )
+    planted.write_text('{"app_name": "planted"}')
+
+    assert hcl_to_json(str(tfvars)) == {"app_name": "tower"}
+    assert list(hcl_cache.glob("*.json")) == [planted]
+
+    hcl_cache.chmod(0o700)
+    other_uid = os.getuid() + 1
+    monkeypatch.setattr(extractors.os, "getuid", lambda: other_uid)
+    monkeypatch.setattr(extractors, "_parsed_memo", {})
+    assert hcl_to_json(str(tfvars)) == {"app_name": "tower"}
+
+
+def test_unsupported_syntax_falls_back_to_hcl2json(hcl_cache, tmp_path, monkeypatch):
+    tfvars = tmp_path / "terraform.tfvars"
+    tfvars.write_text('a = "%{ if true }x%{ endif }"\n')
+    monkeypatch.setattr(extractors, "_can_use_binary", lambda: False)
+    monkeypatch.setattr(extractors, "_is_supported_extraction_platform", lambda: False)
+    monkeypatch.setattr(extractors, "_docker_run_hcl2json", lambda path: {"a": "from-hcl2json"})
+
+    assert hcl_to_json(str(tfvars)) == {"a": "from-hcl2json"}
+
+
+@pytest.mark.skipif(not _can_use_binary(), reason=f"Parity check needs the extracted binary at {HCL2JSON_BIN}.")
+@pytest.mark.parametrize(
+    "relpath", ["templates/TEMPLATE_terraform.tfvars", "009_define_file_templates.tf", "012_outputs.tf"]
+)
+def test_parity_with_hcl2json_binary(hcl_cache, monkeypatch, relpath):
+    """The in-process parser must agree with hcl2json on every file the repo feeds it."""
+    path = str(REPO_ROOT / relpath)
+    in_process = hcl_to_json(path)
+    monkeypatch.setenv(extractors.HCL_PARSER_ENV, "binary")
+    assert in_process == hcl_to_json(path)
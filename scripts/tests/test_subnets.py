@@ -0,0 +1,106 @@
+import json
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+from installer.utils import subnets
+from installer.utils.tfvars_context import TfvarsContext
+
+VPC_FILTER = {"Filters": [{"Name": "vpc-id", "Values": ["vpc-123"]}]}
+
+
+def _subnet(cidr: str, public: bool) -> dict:
+    return {"CidrBlock": cidr, "MapPublicIpOnLaunch": public, "SubnetId": f"subnet-{cidr[5]}", "VpcId": "vpc-123"}
+
+
+def _ctx(**overrides) -> TfvarsContext:
+    tfvars = {
+        "aws_profile": "test",
+        "aws_region": "us-east-1",
+        "vpc_existing_id": "vpc-123",
+        "flag_create_new_vpc": False,
+        "vpc_new_public_subnets": ["10.9.1.0/24"],
+        "vpc_new_private_subnets": ["10.9.2.0/24"],
+    }
+    return TfvarsContext({**tfvars, **overrides})
+
+
+@pytest.fixture
+def ec2(tmp_path, monkeypatch):
+    """Stubbed EC2 client (no network) and a throwaway subnet cache."""
+    client = boto3.client("ec2", region_name="us-east-1", aws_access_key_id="x", aws_secret_access_key="x")
+    monkeypatch.setattr(subnets, "_ec2_client", lambda profile, region: client)
+    monkeypatch.setattr(subnets, "SUBNET_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv(subnets.SUBNET_CACHE_TTL_ENV, raising=False)
+    with Stubber(client) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+
+def _stub_two_pages(stubber):
+    stubber.add_response(
+        "describe_subnets",
+        {"Subnets": [_subnet("10.0.1.0/24", True)], "NextToken": "page-2"},
+        VPC_FILTER,
+    )
+    stubber.add_response(
+        "describe_subnets",
+        {"Subnets": [_subnet("10.0.2.0/24", False), _subnet("10.0.3.0/24", False)]},
+        {**VPC_FILTER, "NextToken": "page-2"},
+    )
+
+
+def test_new_vpc_never_calls_aws(ec2):
+    # No stubbed responses: any API call would raise.
+    assert subnets.get_all_aws_subnets(_ctx(flag_create_new_vpc=True)) == (["10.9.1.0/24"], ["10.9.2.0/24"])
+
+
+def test_existing_vpc_lookup_is_paginated(ec2):
+    _stub_two_pages(ec2)
+    assert subnets.get_all_aws_subnets(_ctx()) == (["10.0.1.0/24"], ["10.0.2.0/24", "10.0.3.0/24"])
+
+
+def test_disk_cache_is_reused_within_ttl(ec2, tmp_path):
+    _stub_two_pages(ec2)
+    first = subnets.get_all_aws_subnets(_ctx())
+
+    # Fresh context (new process, same VPC): served from disk, no further API calls stubbed.
+    assert subnets.get_all_aws_subnets(_ctx()) == first
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_expired_cache_is_refreshed(ec2, tmp_path):
+    _stub_two_pages(ec2)
+    subnets.get_all_aws_subnets(_ctx())
+
+    (cached,) = tmp_path.glob("*.json")
+    payload = json.loads(cached.read_text())
+    payload["fetched_at"] -= subnets.SUBNET_CACHE_TTL_SECONDS + 1
+    cached.write_text(json.dumps(payload))
+
+    ec2.add_response("describe_subnets", {"Subnets": [_subnet("10.0.7.0/24", True)]}, VPC_FILTER)
+    assert subnets.get_all_aws_subnets(_ctx()) == (["10.0.7.0/24"], [])
+
+
+def test_ttl_zero_bypasses_cache(ec2, monkeypatch):
+    monkeypatch.setenv(subnets.SUBNET_CACHE_TTL_ENV, "0")
+    _stub_two_pages(ec2)
+    subnets.get_all_aws_subnets(_ctx())
+    _stub_two_pages(ec2)
+    subnets.get_all_aws_subnets(_ctx())
+
+
+def test_cache_is_private_and_planted_entries_are_ignored(ec2, tmp_path):
+    _stub_two_pages(ec2)
+    first = subnets.get_all_aws_subnets(_ctx())
+    (cached,) = tmp_path.glob("*.json")
+    assert tmp_path.stat().st_mode & 0o777 == 0o700
+    assert cached.stat().st_mode & 0o777 == 0o600
+
+    # A directory others can write to may hold planted data: look the subnets up again instead.
+    payload = json.loads(cached.read_text())
+    payload["subnets"] = [_subnet("10.6.6.0/24", True)]
+    cached.write_text(json.dumps(payload))
+    tmp_path.chmod(0o777)
+    _stub_two_pages(ec2)
+    assert subnets.get_all_aws_subnets(_ctx()) == first
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+from installer.utils import tfvars_context
+from installer.utils.tfvars_context import TfvarsContext
+
+TEMPLATE_TFVARS = str(Path(__file__).resolve().parents[2] / "templates" / "TEMPLATE_terraform.tfvars")
+
+
+@pytest.fixture(scope="module")
+def ctx():
+    return TfvarsContext.from_file(TEMPLATE_TFVARS)
+
+
+def test_attribute_access_reads_tfvars(ctx):
+    assert ctx.app_name == "tower-template"
+    assert "app_name" in ctx.keys
+    with pytest.raises(AttributeError):
+        _ = ctx.not_a_tfvars_key
+
+
+def test_flag_groups_cover_every_exclusive_flag(ctx):
+    assert set(ctx.flag_groups) == set(tfvars_context.EXCLUSIVE_FLAG_GROUPS)
+    assert ctx.flag_groups["vpc"] == [ctx.flag_create_new_vpc, ctx.flag_use_existing_vpc]
+
+
+def test_views_are_memoised(ctx):
+    assert ctx.namespace is ctx.namespace
+    calls = []
+    first = ctx.cached("subnets", lambda: calls.append(1) or (["10.0.1.0/24"], []))
+    assert ctx.cached("subnets", lambda: calls.append(1) or None) is first
+    assert len(calls) == 1
+
+
+def test_parses_tfvars_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(tfvars_context, "get_tfvars_as_json", lambda path=None: calls.append(path) or {"a": 1})
+    ctx = TfvarsContext.from_file("terraform.tfvars")
+    assert (ctx.a, ctx.keys, ctx.namespace.a) == (1, frozenset({"a"}), 1)
+    assert len(calls) == 1
@@ -0,0 +1,103 @@
+"""Shared fixtures for the framework benchmarks (`tests/benchmarks/`).
+
+Everything is synthetic and offline: catalogues of `@pytest.mark.tfvars`-shaped scenarios
+and a warm scenario cache under `tmp_path`. No workspace, terraform or docker involved.
+"""
+
+import random
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from tests.utils.cache import blobstore, cache
+from tests.utils.config import FP, all_template_files
+from tests.utils.terraform import console_standin, precompute, template_generator
+
+CATALOGUE_SIZES = (10, 100, 1000)
+TESTS_PER_SCENARIO = 3
+
+# Shaped like `BASELINE` in tests/unit/config_files: simple assignments, uneven whitespace.
+_BASELINE = "\n".join(
+    [f"flag_{i:02d}  =   {str(i % 3 == 0).lower()}" for i in range(30)]
+    + [f'setting_{i:02d} = "value-{i}"' for i in range(30)]
+    + ["# baseline ends here"]
+)
+
+
+def synthetic_catalogue(size: int) -> list[str]:
+    """`size` distinct `BASELINE + <feature delta>` tfvars blocks, deterministic per size."""
+    rng = random.Random(size)
+    catalogue = []
+    for n in range(size):
+        # Each delta re-declares a few baseline keys (exercises the last-wins dedup).
+        overrides = [f"flag_{rng.randrange(30):02d} = true" for _ in range(rng.randint(2, 6))]
+        delta = "\n".join([f"# scenario {n}", *overrides, f'scenario_id    = "s{n}"'])
+        catalogue.append(f"{_BASELINE}\n\n{delta}\n")
+    return catalogue
+
+
+@pytest.fixture(params=CATALOGUE_SIZES, ids=lambda size: f"{size}-scenarios")
+def catalogue(request) -> list[str]:
+    return synthetic_catalogue(request.param)
+
+
+@pytest.fixture
+def collected_items(catalogue) -> list[SimpleNamespace]:
+    """Collected-item stand-ins: `TESTS_PER_SCENARIO` tests per scenario, plus one without a marker."""
+    items = [
+        SimpleNamespace(get_closest_marker=lambda name, tfvars=tfvars: SimpleNamespace(args=[tfvars]))
+        for tfvars in catalogue
+        for _ in range(TESTS_PER_SCENARIO)
+    ]
+    return [*items, SimpleNamespace(get_closest_marker=lambda name: None)]
+
+
+@pytest.fixture
+def static_hash(monkeypatch):
+    """Pin the disk-state half of the cache key (normally hashed from the session workspace)."""
+    monkeypatch.setattr(cache, "_compute_static_hash_part", lambda: "0" * 64)
+
+
+@pytest.fixture
+def warm_cache(tmp_path, monkeypatch, catalogue, static_hash):
+    """A fully rendered, fresh scenario cache for every scenario in `catalogue`.
+
+    Blobs are content-addressed, so like a real cache most scenarios share the same few
+    rendered files; each scenario still has its own directory and manifest.
+    """
+    monkeypatch.setattr(FP, "CACHE_SCENARIO_DIR", str(tmp_path / "scenarios"))
+    monkeypatch.setattr(FP, "CACHE_BLOB_DIR", str(tmp_path / "scenarios" / blobstore.BLOB_DIRNAME))
+    monkeypatch.setattr(FP, "TFVARS_AUTO_OVERRIDE_DST", str(tmp_path / "override.auto.tfvars"))
+    monkeypatch.setattr(FP, "PRECOMPUTE_PROFILE", str(tmp_path / "precompute_profile.jsonl"))
+    inputs = dict.fromkeys([*all_template_files, "locals.json", "outputs.json"], "inputs")
+    monkeypatch.setattr(precompute, "_input_hashes", lambda: inputs)
+
+    entries = {
+        key: {
+            "blob": blobstore.put_blob(f"{key}\n", meta["extension"]),
+            "extension": meta["extension"],
+            "inputs": "inputs",
+        }
+        for key, meta in all_template_files.items()
+    }
+    manifest = {"templates": entries, "files": {"locals.json": "inputs", "outputs.json": "inputs"}}
+    for tfvars in catalogue:
+        scenario_dir = tmp_path / "scenarios" / cache.hash_templatefile_cache_key(tfvars)
+        scenario_dir.mkdir(parents=True)
+        for name in ("locals.json", "outputs.json"):
+            (scenario_dir / name).write_text("{}")
+        blobstore.write_manifest(scenario_dir, manifest)
+
+    template_generator.clear_memo()
+    yield catalogue
+    template_generator.clear_memo()
+
+
+@pytest.fixture
+def standin_console(tmp_path, monkeypatch):
+    """Route `ConsoleSession` to the offline stand-in, synthesising answers with no added latency."""
+    monkeypatch.setattr(FP, "WORKSPACE", str(tmp_path))
+    # -S: the stand-in is stdlib-only, so skip `site` to keep interpreter startup small.
+    monkeypatch.setenv("PRECOMPUTE_CONSOLE_BIN", f"{sys.executable} -S {console_standin.__file__}")
+    monkeypatch.setenv("PRECOMPUTE_STANDIN_MODE", "synthesize")
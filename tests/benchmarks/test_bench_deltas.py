@@ -0,0 +1,100 @@
+"""Benchmarks for the delta assertion helpers that run at the top and bottom of every config test.
+
+Parametrised over 10 / 100 / 1000 asserted keys per template, against rendered files
+written under `tmp_path`.
+"""
+
+import copy
+
+import pytest
+
+from tests.utils.assertions import delta
+from tests.utils.assertions.delta import assert_all_deltas, assert_yaml_delta, merge_deltas
+
+# File-level marker: opts every test in this file into the `benchmark` slice, which is
+# skipped unless selected. Run via `make run_benchmarks` or `pytest -m benchmark`.
+pytestmark = pytest.mark.benchmark
+
+KEY_COUNTS = (10, 100, 1000)
+
+
+def _baseline(keys: int) -> dict[str, dict]:
+    """`BASELINE_ASSERTIONS`-shaped: one kv, one yml and one text template, `keys` entries each."""
+    return {
+        "tower_env": {"present": {f"TOWER_KEY_{i}": f"v{i}" for i in range(keys)}, "omitted": {"TOWER_UNSET"}},
+        "docker_compose": {
+            "present": {f"services.svc-{i}.image": f"img:{i}" for i in range(keys)},
+            "omitted": {f"services.svc-{i}.labels" for i in range(keys)},
+        },
+        "tower_sql": {"present": {f"GRANT ALL ON db_{i}" for i in range(keys)}, "omitted": {"DROP DATABASE"}},
+    }
+
+
+def _feature(keys: int) -> dict[str, dict]:
+    """A feature delta overriding a tenth of the baseline and flipping omitted parents to present."""
+    span = range(0, keys, 10)
+    return {
+        "tower_env": {"present": {f"TOWER_KEY_{i}": "feature" for i in span}, "omitted": set()},
+        "docker_compose": {
+            "present": {f"services.svc-{i}.labels.feature": "enabled" for i in span},
+            "omitted": set(),
+        },
+        "tower_sql": {"present": {"CREATE USER feature"}, "omitted": set()},
+    }
+
+
+@pytest.fixture(params=KEY_COUNTS, ids=lambda keys: f"{keys}-keys")
+def keys(request) -> int:
+    return request.param
+
+
+@pytest.fixture
+def rendered(tmp_path, keys):
+    """Rendered files satisfying `merge_deltas(_baseline(keys), _feature(keys))`, as a bundle."""
+    env = [f"TOWER_KEY_{i}={'feature' if i % 10 == 0 else f'v{i}'}" for i in range(keys)]
+    compose = ["services:"]
+    for i in range(keys):
+        compose += [f"  svc-{i}:", f"    image: img:{i}"]
+        compose += ["    labels:", "      feature: enabled"] if i % 10 == 0 else []
+    sql = [f"GRANT ALL ON db_{i} TO tower;" for i in range(keys)] + ["CREATE USER feature;"]
+
+    files = {"tower_env": ("tower.env", env), "docker_compose": ("docker-compose.yml", compose)}
+    files["tower_sql"] = ("tower.sql", sql)
+    bundle = {}
+    for template, (name, lines) in files.items():
+        (tmp_path / name).write_text("\n".join(lines) + "\n")
+        bundle[template] = {"filepath": str(tmp_path / name)}
+    delta._yaml_documents.clear()
+    yield bundle
+    delta._yaml_documents.clear()
+
+
+def test_merge_deltas_cold(benchmark, keys):
+    """First merge of a constant pair: compiles both deltas (memoised on identity afterwards)."""
+    baseline, feature = _baseline(keys), _feature(keys)
+    merged = benchmark.pedantic(
+        merge_deltas, setup=lambda: ((copy.deepcopy(baseline), copy.deepcopy(feature)), {}), rounds=20
+    )
+    assert merged["tower_env"]["present"]["TOWER_KEY_0"] == "feature"
+
+
+def test_merge_deltas_warm(benchmark, keys):
+    baseline, feature = _baseline(keys), _feature(keys)
+    merged = benchmark(merge_deltas, baseline, feature)
+    assert "services.svc-0.labels" not in merged["docker_compose"]["omitted"]
+
+
+def test_assert_all_deltas(benchmark, rendered, keys):
+    """Steady state: each YAML document is parsed on first use and reused per file version."""
+    expected = merge_deltas(_baseline(keys), _feature(keys))
+    benchmark(assert_all_deltas, rendered, expected)
+
+
+def test_assert_yaml_delta_cold_parse(benchmark, rendered, keys):
+    present = {f"services.svc-{i}.image": f"img:{i}" for i in range(keys)}
+    benchmark.pedantic(
+        assert_yaml_delta,
+        kwargs={"test_file_path": rendered["docker_compose"]["filepath"], "present": present},
+        setup=delta._yaml_documents.clear,
+        rounds=20,
+    )
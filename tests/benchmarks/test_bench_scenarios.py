@@ -0,0 +1,70 @@
+"""Benchmarks for the per-scenario paths every session runs: keying, collection, bundle lookup, precompute, console pool.
+
+Each is parametrised over synthetic catalogues of 10 / 100 / 1000 scenarios (see `conftest.py`).
+"""
+
+import json
+
+import pytest
+
+from tests.utils.cache.cache import hash_templatefile_cache_key, normalize_whitespace
+from tests.utils.config import all_template_files
+from tests.utils.terraform import template_generator
+from tests.utils.terraform.console import ConsolePool
+from tests.utils.terraform.precompute import collect_scenarios_from_items, precompute_in_parallel
+
+# File-level marker: opts every test in this file into the `benchmark` slice, which is
+# skipped unless selected. Run via `make run_benchmarks` or `pytest -m benchmark`.
+pytestmark = pytest.mark.benchmark
+
+
+def test_normalize_whitespace(benchmark, catalogue):
+    normalized = benchmark(lambda: [normalize_whitespace(tfvars) for tfvars in catalogue])
+    assert len(set(normalized)) == len(catalogue)
+
+
+def test_hash_templatefile_cache_key(benchmark, catalogue, static_hash):
+    keys = benchmark(lambda: [hash_templatefile_cache_key(tfvars) for tfvars in catalogue])
+    assert len(set(keys)) == len(catalogue)
+
+
+def test_collect_scenarios_from_items(benchmark, catalogue, collected_items):
+    scenarios = benchmark(collect_scenarios_from_items, collected_items)
+    assert len(scenarios) == len(catalogue) + 1  # plus `#NONE`
+
+
+def test_generate_tc_files_cold(benchmark, warm_cache):
+    """Every scenario's bundle resolved once, as the first test of each scenario does."""
+
+    def resolve_all():
+        template_generator.clear_memo()
+        return [template_generator.generate_tc_files(tfvars) for tfvars in warm_cache]
+
+    bundles = benchmark(resolve_all)
+    assert all(bundle["tower_env"]["filepath"] for bundle in bundles)
+
+
+def test_precompute_in_parallel_all_hits(benchmark, warm_cache):
+    """The warm-cache session start: freshness checks only, no console launched."""
+    scenarios = {str(n): tfvars for n, tfvars in enumerate(warm_cache)}
+    statuses = benchmark(precompute_in_parallel, scenarios)
+    assert set(statuses.values()) == {"hit"}
+
+
+def test_console_pool_with_standin(benchmark, catalogue, standin_console):
+    """Pool orchestration at scale: one stand-in console per scenario, warm-launched ahead of its turn.
+
+    Each round spawns a process per scenario, so this runs a single round.
+    """
+    templates = ", ".join(f'{key} = templatefile("{key}.tpl", {{}})' for key in all_template_files)
+    expression = f"jsonencode({{ locals = {{}}, outputs = {{}}, templates = {{ {templates} }} }})"
+    scenarios = {str(n): tfvars for n, tfvars in enumerate(catalogue)}
+    pool = ConsolePool(max_workers=4)
+
+    results = benchmark.pedantic(
+        pool.run, (scenarios, lambda h, tfvars, session: json.loads(json.loads(session.evaluate(expression)))), rounds=1
+    )
+
+    assert all(len(parsed["templates"]) == len(all_template_files) for parsed in results.values())
+    benchmark.extra_info["max_queued_s"] = max(q for q, _ in pool.timings.values())
+    benchmark.extra_info["mean_execution_s"] = sum(e for _, e in pool.timings.values()) / len(pool.timings)
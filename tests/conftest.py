@@ -1,3 +1,4 @@
+import contextlib
 import json
 import os
 from pathlib import Path
@@ -15,18 +16,24 @@ import pytest
 from scripts.installer.utils.extractors import hcl_to_json
 from scripts.installer.utils.purge_folders import delete_pycache_folders
 
-from tests.utils.config import FP
+from tests.utils.cache.bundle import ARTIFACT_DIR_ENV, bundle_path, export_bundle, import_bundle
+from tests.utils.cache.cache import _compute_static_hash_part, hash_templatefile_cache_key
+from tests.utils.cache.housekeeping import collect_garbage
+from tests.utils.config import FP, WORKSPACE_ENV
 from tests.utils.filehandling.filehandling import FileHelper
 from tests.utils.logger.pytest_logger import get_logger
 from tests.utils.preflight.preflight import check_aws_sso_token
+from tests.utils.terraform import profiling
 from tests.utils.terraform.executor import TF
 from tests.utils.terraform.precompute import (
+    collect_required_templates,
     collect_scenarios_from_items,
     precompute_in_parallel,
     read_scenario_outputs,
     write_scenario_index,
 )
 from tests.utils.terraform.template_generator import generate_tc_files
+from tests.utils.terraform.workspace import build_workspace, datafiles_lock, remove_workspace, stage_secrets
 
 
 # Populated by `pytest_collection_modifyitems` from each test's `@pytest.mark.tfvars(...)` marker;
@@ -41,18 +48,17 @@ EXPLANATION
 Originally tried using [tftest](https://pypi.org/project/tftest/) package to test but this became
 complicated and unwieldy. Instead, simplified testing loop to:
 
-1. Test in the project directory.
-2. Take a backup of the existing `terraform.tfvars` file.
+1. Test in a per-session overlay of the project directory (`FP.WORKSPACE`; the project root is never modified).
+2. Leave the deployer's own `terraform.tfvars` alone; it is not linked into the workspace.
 3. Create a new `terraform.tfvars` file for testing purposes (_sourced from `tests/datafiles/generate_core_data.sh`).
-4. Provide override values to test fixtures (which will generate a new `override.auto.tfvars` file in the project root).
+4. Provide override values to test fixtures (which will generate a new `override.auto.tfvars` file in the workspace).
     This file supercedes the same keys defined in the `terraform.tfvars` file.
 5. Run the tests:
     1. For each fixture, run `terraform plan` based on the test tvars and override file.
        Results as cached to speed up n+1 test runs.
     2. Execute tests tied to that fixture.
     3. Repeat.
-6. Purge the test tfvars and override file.
-7.Restore the original `terraform.tfvars` file when testing is complete.
+6. Delete the workspace (and with it the test tfvars and override file) when testing is complete.
 """
 
 
@@ -80,49 +86,30 @@ def aws_preflight():
 def session_setup():
     """Stage the test fixtures (tfvars, override tfvars, testing outputs, plan cache, 009 JSON).
 
-    Backs up the project's `terraform.tfvars`, copies in test-specific replacements, JSONifies
+    Builds this session's overlay workspace at `FP.WORKSPACE` (symlinks back to the project
+    root; see `tests/utils/terraform/workspace.py`), copies the test tfvars into it, JSONifies
     `009_define_file_templates.tf` via the shared `hcl_to_json` helper (extracted binary on
     supported hosts, docker fallback elsewhere — see `scripts/installer/utils/extractors.py`),
-    and yields for the test session. Cleanup restores the original `terraform.tfvars` on teardown.
+    and yields for the test session. The project root is never written to, so concurrent
+    sessions and xdist workers on one checkout don't collide: the shared `tests/datafiles/`
+    is only touched under `datafiles_lock`, and the tfvars and secrets read later are copies.
+    Teardown deletes the workspace unless `CX_TEST_WORKSPACE` pinned it.
 
     AWS preflight is deliberately NOT part of this fixture — tests that need real AWS
     consume the separate `aws_preflight` fixture instead. See issue #351.
     """
-    # Preflight: terraform.tfvars must exist in project root before we start.
-    # session_setup backs up the deployer's real tfvars at session start and restores it
-    # on teardown — without that file as the starting point, `FileHelper.move_file` raises,
-    # session_setup partially completes, and downstream tests that depend on project-root
-    # state files (e.g. `prepare_plan`-based variable_validation tests) fail with confusing
-    # FileNotFoundError chains on entirely different files. Fail fast with an actionable
-    # error instead.
-    if not os.path.exists(FP.TFVARS_BASE):
-        backup_exists = os.path.exists(FP.TFVARS_BACKUP)
-        recovery_hint = (
-            f"A backup exists at `{FP.TFVARS_BACKUP}` (likely from a previous test run that crashed "
-            f"mid-teardown). Restore it manually: `mv {FP.TFVARS_BACKUP} {FP.TFVARS_BASE}`."
-            if backup_exists
-            else (
-                f"Copy `templates/TEMPLATE_terraform.tfvars` to `{FP.TFVARS_BASE}` "
-                f"and configure it for your deployment."
-            )
-        )
-        pytest.exit(
-            f"Precondition failed: `terraform.tfvars` not found at `{FP.TFVARS_BASE}`. "
-            f"The testing framework backs up this file at session start and restores it on teardown; "
-            f"without it, test execution cannot proceed.\n\nTo fix: {recovery_hint}",
-            returncode=2,
-        )
-
-    # Create a fresh copy of the base testing terraform.tfvars file.
-    subprocess.run("make generate_test_data", shell=True, check=True)  # noqa: S602, S607  (intentional shell command; relies on PATH; standard for test env)
+    print(f"\nBuilding test workspace at {FP.WORKSPACE}.")
+    build_workspace()
 
-    print("\nBacking up terraform.tfvars.")
-    FileHelper.move_file(FP.TFVARS_BASE, FP.TFVARS_BACKUP)
-
-    # Swap in test tfvars (base and base-override).
+    # Create a fresh copy of the base testing tfvars + secrets and stage them into the workspace.
+    # Regeneration rewrites `tests/datafiles/` in place, so it's serialised across sessions, and
+    # everything the session reads later is copied out before the lock is released.
     print("\nLoading test tfvars.")
-    FileHelper.copy_file(FP.TFVARS_TEST_SRC, FP.TFVARS_TEST_DST)
-    FileHelper.copy_file(FP.TFVARS_BASE_OVERRIDE_SRC, FP.TFVARS_BASE_OVERRIDE_DST)
+    with datafiles_lock():
+        subprocess.run("make generate_test_data", shell=True, check=True, cwd=FP.ROOT)  # noqa: S602, S607  (intentional shell command; relies on PATH; standard for test env)
+        FileHelper.copy_file(FP.TFVARS_TEST_SRC, FP.TFVARS_TEST_DST)
+        FileHelper.copy_file(FP.TFVARS_BASE_OVERRIDE_SRC, FP.TFVARS_BASE_OVERRIDE_DST)
+        stage_secrets()
 
     # Prepare plan cache directory
     os.makedirs(FP.CACHE_PLAN_DIR, exist_ok=True)
@@ -133,56 +120,79 @@ def session_setup():
     # 009 supplies the templatefile() expression source; 012 supplies the output-name →
     # value-expression map that the parallel precompute resolves per scenario.
     data_009 = hcl_to_json(f"{FP.ROOT}/009_define_file_templates.tf")
-    Path(f"{FP.ROOT}/009_define_file_templates.json").write_text(json.dumps(data_009))
+    Path(f"{FP.WORKSPACE}/009_define_file_templates.json").write_text(json.dumps(data_009))
     data_012 = hcl_to_json(f"{FP.ROOT}/012_outputs.tf")
-    Path(f"{FP.ROOT}/012_outputs.json").write_text(json.dumps(data_012))
+    Path(f"{FP.WORKSPACE}/012_outputs.json").write_text(json.dumps(data_012))
 
     # Parallel precompute of resolved locals + rendered templatefiles for every collected
-    # scenario. Each worker spawns one `terraform console` call per scenario and writes
-    # locals.json + every template into tests/.scenario_cache/{hash}/. Tests then read
-    # purely from disk — no console calls happen at test runtime.
+    # scenario. Each pool worker evaluates one `terraform console` call per scenario (with
+    # the next scenario's console already warming up) and writes locals.json + the templates
+    # its tests read into tests/.scenario_cache/{hash}/. Tests then read purely from disk —
+    # no console calls happen at test runtime.
     if _collected_scenarios:
+        # CI runners share a warm cache through an artifact dir: pull in the scenarios another
+        # job already rendered for this disk state (see `tests/utils/cache/bundle.py`).
+        artifact_dir = os.environ.get(ARTIFACT_DIR_ENV)
+        archive = bundle_path(artifact_dir, _compute_static_hash_part()) if artifact_dir else None
+        if archive and archive.exists():
+            print(import_bundle(archive, _compute_static_hash_part()).summary())
+
         precompute_start = time.time()
-        statuses = precompute_in_parallel(_collected_scenarios)
+        schedule: dict = {}
+        required = collect_required_templates(_collected_items)
+        statuses = precompute_in_parallel(_collected_scenarios, stats=schedule, required=required)
         elapsed = time.time() - precompute_start
         hits = sum(1 for s in statuses.values() if s == "hit")
         ok = sum(1 for s in statuses.values() if s == "miss-ok")
+        partial = sum(1 for s in statuses.values() if s == "partial-ok")
         errs = sum(1 for s in statuses.values() if s.startswith("miss-err"))
-        print(f"\nPrecompute: {len(statuses)} scenarios ({hits} hit, {ok} miss-ok, {errs} miss-err) in {elapsed:.2f}s")
+        print(
+            f"\nPrecompute: {len(statuses)} scenarios "
+            f"({hits} hit, {partial} partial-ok, {ok} miss-ok, {errs} miss-err) in {elapsed:.2f}s"
+        )
+        if schedule.get("dispatched"):
+            print(
+                f"Precompute schedule: {schedule['workers']} workers, {schedule['dispatched']} console runs; "
+                f"queued {schedule['queued_s']:.1f}s total (max {schedule['max_queued_s']:.1f}s), "
+                f"executing {schedule['execution_s']:.1f}s total"
+            )
+        print(profiling.format_summary(profiling.collected()))
+        history = get_logger().history
+        if history is not None:
+            history.record_precompute(profiling.collected())
+        print(f"Precompute profile (JSONL): {FP.PRECOMPUTE_PROFILE} (deleted at teardown unless CX_TEST_WORKSPACE)")
         if errs:
             for h, s in list(statuses.items())[:3]:
                 if s.startswith("miss-err"):
                     print(f"  [{h[:8]}] {s[:300]}")
 
+        if archive and (not archive.exists() or any(s != "hit" for s in statuses.values())):
+            print(f"Scenario bundle: exported {export_bundle(artifact_dir, _compute_static_hash_part())}")
+
         # Regenerate the human-readable scenario→folder mapping.
         index_path = write_scenario_index(_collected_items)
         print(f"Scenario index: {index_path}")
 
     yield
 
-    print("\nRestoring original environment.")
+    print("\nCleaning up test workspace.")
 
     # Single-source destroy at end of testing cycle to save time
     # Not actually running Terraform apply anymore, do I don't need to do a destroy
     # run_terraform_destroy()
 
-    # Remove testing files, delete __pycache__ folders, restore origin tfvars.
-    files_to_purge = [
-        FP.TFVARS_AUTO_OVERRIDE_DST,
-        FP.TFVARS_BASE,
-        FP.TFVARS_BASE_OVERRIDE_DST,
-        "009_define_file_templates.json",
-        "012_outputs.json",
-    ]
+    # Keep the scenario cache bounded: evict least-recently-used scenarios (never this
+    # session's) and unreferenced blobs. Budgets: SCENARIO_CACHE_MAX_MB / _MAX_ENTRIES.
+    if _collected_scenarios:
+        keep = {hash_templatefile_cache_key(tfvars) for tfvars in _collected_scenarios.values()}
+        print(collect_garbage(keep=keep).summary())
 
-    for file in files_to_purge:
-        Path(file).unlink(missing_ok=True)
+    # Every per-session file lives in the workspace; a pinned workspace is kept for inspection.
+    if not os.environ.get(WORKSPACE_ENV):
+        remove_workspace()
 
     delete_pycache_folders(FP.ROOT)
 
-    # Restore original tfvars
-    FileHelper.move_file(FP.TFVARS_BACKUP, FP.TFVARS_BASE)
-
 
 @pytest.fixture
 def generated_test_files(request, session_setup):
@@ -388,6 +398,14 @@ def _apply_auto_skips(config, items):
             if "testcontainer" in item.keywords:
                 item.add_marker(skip_no_docker)
 
+    if not _user_explicitly_includes_marker("benchmark", marker_expr):
+        skip_benchmark = pytest.mark.skip(
+            reason="Benchmarks run only via `-m benchmark`; skipped by tests/conftest.py auto-skip."
+        )
+        for item in items:
+            if item.get_closest_marker("benchmark"):
+                item.add_marker(skip_benchmark)
+
     if not _user_explicitly_includes_marker("variable_validation", marker_expr):
         changed = _files_changed_on_branch()
         if changed is not None and "variables.tf" not in changed:
@@ -452,6 +470,13 @@ def pytest_sessionfinish(session, exitstatus):
 
     logger.log_session_end(passed=passed, failed=failed, skipped=skipped, errors=errors, duration=duration)
 
+    # Aggregated live from `pytest_runtest_logreport` as results were logged; no re-read of the log.
+    # Best effort: logger unit tests may leave the singleton pointing into a deleted temp dir.
+    if logger.enabled:
+        with contextlib.suppress(OSError):
+            insights_path = logger.log_file.with_name("pytest_insights.json")
+            insights_path.write_text(json.dumps(logger.insights.insights(), indent=2))
+
 
 def pytest_runtest_setup(item):
     """Log test setup/start."""
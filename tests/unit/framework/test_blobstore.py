@@ -0,0 +1,78 @@
+"""Tests for the content-addressed scenario-cache blob store (`tests/utils/cache/blobstore.py`).
+
+Pure filesystem tests: no terraform, no precompute. `FP.CACHE_SCENARIO_DIR` / `FP.CACHE_BLOB_DIR`
+are redirected into `tmp_path` so the real cache is never touched.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from tests.utils.cache import blobstore
+from tests.utils.config import FP
+
+
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    """Point the scenario cache + blob store at a throwaway directory."""
+    monkeypatch.setattr(FP, "CACHE_SCENARIO_DIR", str(tmp_path))
+    monkeypatch.setattr(FP, "CACHE_BLOB_DIR", str(tmp_path / blobstore.BLOB_DIRNAME))
+    return tmp_path
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_identical_content_shares_one_blob(cache_root):
+    """Two scenarios rendering the same bytes resolve to the same blob file."""
+    first = blobstore.put_blob("CREATE DATABASE tower;\n", ".sql")
+    second = blobstore.put_blob(b"CREATE DATABASE tower;\n", ".sql")
+
+    assert first == second
+    assert blobstore.blob_path(first, ".sql").read_text() == "CREATE DATABASE tower;\n"
+    assert len(list((cache_root / blobstore.BLOB_DIRNAME).rglob("*.sql"))) == 1
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_blob_keeps_template_extension(cache_root):
+    """Consumers that sniff by suffix (docker mounts, yamlpath) still see the right extension."""
+    digest = blobstore.put_blob("a: 1\n", ".yml")
+    assert blobstore.blob_path(digest, ".yml").suffix == ".yml"
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_manifest_roundtrip_and_resolution(cache_root):
+    """A written manifest reads back identically and each entry resolves to its blob."""
+    scenario_dir = cache_root / "abc123"
+    scenario_dir.mkdir()
+    entry = {"blob": blobstore.put_blob("A=1\n", ".env"), "extension": ".env", "inputs": "abc"}
+    written = {"templates": {"tower_env": entry}, "files": {"locals.json": "def"}}
+    blobstore.write_manifest(scenario_dir, written)
+
+    manifest = blobstore.read_manifest(scenario_dir)
+    assert manifest == written
+    assert blobstore.resolve_entry(manifest["templates"]["tower_env"]).read_text() == "A=1\n"
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_missing_or_partial_manifest_reads_as_none(cache_root):
+    """No manifest (or a truncated one) means the scenario is incomplete."""
+    scenario_dir = cache_root / "abc123"
+    scenario_dir.mkdir()
+    assert blobstore.read_manifest(scenario_dir) is None
+
+    (scenario_dir / blobstore.MANIFEST_FILENAME).write_text('{"tower_env": ')
+    assert blobstore.read_manifest(scenario_dir) is None
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_iter_scenario_dirs_skips_blob_store(cache_root):
+    """The blob store directory is not a scenario directory."""
+    blobstore.put_blob("x", ".txt")
+    (cache_root / "abc123").mkdir()
+    (cache_root / "INDEX.md").write_text("")
+
+    assert [Path(d).name for d in blobstore.iter_scenario_dirs()] == ["abc123"]
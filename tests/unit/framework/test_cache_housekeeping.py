@@ -0,0 +1,119 @@
+"""Tests for scenario-cache LRU garbage collection (`tests/utils/cache/housekeeping.py`).
+
+Scenario directories and blobs are built under `tmp_path` with back-dated mtimes; no
+precompute or terraform involved.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from tests.utils.cache import blobstore, housekeeping
+from tests.utils.config import FP
+
+NOW = time.time()
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(FP, "CACHE_SCENARIO_DIR", str(tmp_path))
+    monkeypatch.setattr(FP, "CACHE_BLOB_DIR", str(tmp_path / blobstore.BLOB_DIRNAME))
+    return tmp_path
+
+
+def _age(path, days: float) -> None:
+    stamp = NOW - days * DAY
+    os.utime(path, (stamp, stamp))
+
+
+def _scenario(root, key: str, contents: list[str], used_days_ago: float) -> None:
+    """A scenario dir whose manifest references one blob per content string."""
+    entries = {}
+    for i, content in enumerate(contents):
+        digest = blobstore.put_blob(content, ".txt")
+        _age(blobstore.blob_path(digest, ".txt"), 30)
+        entries[f"t{i}"] = {"blob": digest, "extension": ".txt", "inputs": ""}
+    blobstore.write_manifest(root / key, {"templates": entries, "files": {}})
+    housekeeping.touch_scenario(root / key)
+    _age(root / key / housekeeping.LAST_USED_FILENAME, used_days_ago)
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_evicts_least_recently_used_beyond_entry_budget(cache_root):
+    _scenario(cache_root, "old", ["shared", "only-old"], used_days_ago=10)
+    _scenario(cache_root, "mid", ["shared"], used_days_ago=5)
+    _scenario(cache_root, "new", ["shared", "only-new"], used_days_ago=1)
+
+    report = housekeeping.collect_garbage(max_bytes=10**9, max_entries=2, now=NOW)
+
+    assert report.evicted == ["old"]
+    assert sorted(d.name for d in blobstore.iter_scenario_dirs()) == ["mid", "new"]
+    # Only the blob no surviving manifest references goes; shared content stays.
+    assert report.blobs_removed == 1
+    assert len(list((cache_root / blobstore.BLOB_DIRNAME).rglob("*.txt"))) == 2
+    assert report.reclaimed_bytes > 0 and report.remaining == 2
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_byte_budget_counts_blobs_freed_by_eviction(cache_root):
+    _scenario(cache_root, "old", ["x" * 5000], used_days_ago=10)
+    _scenario(cache_root, "new", ["y" * 100], used_days_ago=1)
+
+    report = housekeeping.collect_garbage(max_bytes=2000, max_entries=100, now=NOW)
+
+    assert report.evicted == ["old"]
+    assert report.remaining_bytes <= 2000
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_keep_and_grace_period_protect_scenarios_and_fresh_blobs(cache_root):
+    _scenario(cache_root, "this-session", ["a"], used_days_ago=10)
+    _scenario(cache_root, "other-session", ["b"], used_days_ago=0)
+    fresh_orphan = blobstore.put_blob("written ahead of its manifest", ".txt")
+
+    report = housekeeping.collect_garbage(max_bytes=0, max_entries=0, keep={"this-session"}, now=NOW)
+
+    assert report.evicted == []
+    assert blobstore.blob_path(fresh_orphan, ".txt").exists()
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_files_deleted_mid_walk_are_skipped(cache_root, monkeypatch):
+    """A concurrent session evicting or rewriting entries while GC walks the tree must not crash it."""
+    _scenario(cache_root, "old", ["a"], used_days_ago=10)
+    _scenario(cache_root, "racing", ["b"], used_days_ago=10)
+    (cache_root / "racing" / "vanished.json").write_text("{}")
+    real_stat = Path.stat
+
+    def stat(path, *args, **kwargs):
+        if path.name == "vanished.json":  # removed between `rglob` and `stat`
+            raise FileNotFoundError(path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", stat)
+    assert housekeeping._tree_size(cache_root / "no-such-dir") == 0
+
+    report = housekeeping.collect_garbage(max_bytes=10**9, max_entries=1, now=NOW)
+
+    assert len(report.evicted) == 1
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_cli_help_does_not_evict(cache_root, monkeypatch, capsys):
+    _scenario(cache_root, "old", ["a"], used_days_ago=10)
+    monkeypatch.setattr("sys.argv", ["housekeeping", "--help"])
+    with pytest.raises(SystemExit):
+        housekeeping.main()
+    assert "--max-entries" in capsys.readouterr().out
+
+    monkeypatch.setattr("sys.argv", ["housekeeping", "--max-entries", "0"])
+    housekeeping.main()
+    assert list(blobstore.iter_scenario_dirs()) == []
@@ -32,6 +32,7 @@ from pathlib import Path
 import re
 
 import pytest
+from tests.utils.cache.blobstore import iter_scenario_dirs
 from tests.utils.config import FP
 from tests.utils.filehandling.filehandling import FileHelper
 
@@ -75,7 +76,7 @@ def _locals_to_check() -> set[str]:
 def test_local_resolves_via_console(session_setup, local_name):
     """Every non-allowlisted local from 009 must resolve to a non-null value in every scenario's `locals.json`."""
     cache_root = Path(FP.CACHE_SCENARIO_DIR)
-    scenario_dirs = sorted(d for d in cache_root.iterdir() if d.is_dir())
+    scenario_dirs = iter_scenario_dirs(cache_root)
     assert scenario_dirs, (
         f"No scenario cache folders found under {cache_root}. Precompute may not have run — check session_setup output."
     )
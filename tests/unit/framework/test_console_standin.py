@@ -0,0 +1,129 @@
+"""Tests for the offline `terraform console` stand-in (`tests/utils/terraform/console_standin.py`).
+
+Sessions are real `ConsoleSession` subprocesses running the stand-in; no terraform involved.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from tests.utils.config import FP
+from tests.utils.terraform import console_standin
+from tests.utils.terraform.console import ConsoleError, ConsolePool, ConsoleSession
+
+STANDIN = Path(console_standin.__file__)
+
+# Shaped like `_evaluate_parts`' mega-expression: templatefile calls, nested objects, quoted
+# strings whose interpolations hold more quotes and commas.
+EXPRESSION = (
+    "jsonencode({ "
+    "locals = { tower_db_url = try(local.tower_db_url, null), wave_enabled = try(local.wave_enabled, null) }, "
+    'outputs = { tower_url = "https://${var.tower_server_url == "a,b" ? "x" : "y"}/api" }, '
+    "templates = { "
+    'tower_env = templatefile("assets/tower.env.tpl", { db = { user = "tower", pass = "p{,}" }, flags = [1, 2] }), '
+    'docker_compose = templatefile("assets/docker-compose.yml.tpl", { images = ["a", "b"] }) '
+    "} })"
+)
+
+
+@pytest.fixture
+def standin(tmp_path, monkeypatch):
+    monkeypatch.setattr(FP, "WORKSPACE", str(tmp_path))
+    (tmp_path / "terraform.tfvars").write_text('tower_server_url = "a"\n')
+    monkeypatch.setenv("PRECOMPUTE_CONSOLE_BIN", f"{sys.executable} {STANDIN}")
+    for name in ("MODE", "FIXTURES", "TERRAFORM", "STARTUP_S", "EVAL_S", "JITTER", "FAIL_RATE", "SEED"):
+        monkeypatch.delenv(f"PRECOMPUTE_STANDIN_{name}", raising=False)
+    return monkeypatch
+
+
+def _evaluate(tf_modifiers: str = "flag = true") -> dict:
+    with ConsoleSession(tf_modifiers) as session:
+        return json.loads(json.loads(session.evaluate(EXPRESSION).strip()))
+
+
+def _outcome(tf_modifiers: str) -> str:
+    try:
+        _evaluate(tf_modifiers)
+    except ConsoleError as e:
+        assert "injected failure" in e.stderr
+        return "err"
+    return "ok"
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_section_keys_skip_nested_values():
+    assert console_standin.section_keys(EXPRESSION) == {
+        "locals": ["tower_db_url", "wave_enabled"],
+        "outputs": ["tower_url"],
+        "templates": ["tower_env", "docker_compose"],
+    }
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_synthesized_result_has_the_requested_shape(standin):
+    parsed = _evaluate()
+
+    assert parsed["locals"] == {"tower_db_url": None, "wave_enabled": None}
+    assert parsed["outputs"] == {"tower_url": None}
+    assert sorted(parsed["templates"]) == ["docker_compose", "tower_env"]
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_record_then_replay(standin, tmp_path):
+    fake_terraform = tmp_path / "fake_terraform.py"
+    fake_terraform.write_text('import sys\nsys.stdin.read()\nprint(\'"{\\\\"recorded\\\\": true}"\')\n')
+    standin.setenv("PRECOMPUTE_STANDIN_FIXTURES", str(tmp_path / "recordings"))
+    standin.setenv("PRECOMPUTE_STANDIN_MODE", "record")
+    standin.setenv("PRECOMPUTE_STANDIN_TERRAFORM", f"{sys.executable} {fake_terraform}")
+    assert _evaluate() == {"recorded": True}
+
+    standin.setenv("PRECOMPUTE_STANDIN_MODE", "replay")
+    fake_terraform.unlink()
+    assert _evaluate() == {"recorded": True}
+    # Any input the real answer depends on changes the key.
+    with pytest.raises(ConsoleError, match="no recording"):
+        _evaluate("flag = false")
+    (tmp_path / "base-overrides.auto.tfvars").write_text("x = 1\n")
+    with pytest.raises(ConsoleError, match="no recording"):
+        _evaluate()
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_injected_latency_and_failures(standin):
+    standin.setenv("PRECOMPUTE_STANDIN_STARTUP_S", "0.2")
+    standin.setenv("PRECOMPUTE_STANDIN_EVAL_S", "0.1")
+    with ConsoleSession("flag = true") as session:
+        session.evaluate(EXPRESSION)
+    assert session.phase_timings["console_warm_lead"] + session.phase_timings["console_evaluate"] >= 0.3
+
+    standin.setenv("PRECOMPUTE_STANDIN_STARTUP_S", "0")
+    standin.setenv("PRECOMPUTE_STANDIN_EVAL_S", "0")
+    standin.setenv("PRECOMPUTE_STANDIN_FAIL_RATE", "0.5")
+    outcomes = [_outcome(f"n = {n}") for n in range(12)]
+    assert set(outcomes) == {"ok", "err"}
+    # Failures are drawn from the inputs, so a rerun fails the same calls.
+    assert [_outcome(f"n = {n}") for n in range(12)] == outcomes
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_pool_reports_console_launch_failures(standin, tmp_path):
+    standin.setenv("PRECOMPUTE_CONSOLE_BIN", str(tmp_path / "no-such-console"))
+    standin.setattr(tempfile, "tempdir", str(tmp_path))
+    scenarios = {f"s{n}": f"n = {n}" for n in range(5)}
+
+    results = ConsolePool(max_workers=2).run(
+        scenarios, lambda h, tfvars, session: "ok", on_error=lambda h, e: f"miss-err: {type(e).__name__}"
+    )
+    assert results == dict.fromkeys(scenarios, "miss-err: FileNotFoundError")
+    assert not list(tmp_path.glob("precompute-*.tfvars"))  # var-files are removed when the launch fails
+
+    with pytest.raises(FileNotFoundError):
+        ConsolePool(max_workers=2).run(scenarios, lambda h, tfvars, session: "ok")
@@ -0,0 +1,160 @@
+"""Tests for the delta assertion helpers (`tests/utils/assertions/delta.py`).
+
+Pure in-process checks against small hand-written documents; no precompute or terraform.
+"""
+
+import pytest
+
+from tests.utils.assertions import delta
+from tests.utils.assertions.delta import assert_text_delta, assert_yaml_delta, merge_deltas
+
+COMPOSE = """\
+services:
+  tower-db:
+    image: mysql:8
+    environment: null
+    ports: [3306, 33060]
+    healthcheck:
+      disable: true
+  8000: numeric-key
+x-defaults: &defaults
+  restart: always
+x-merged:
+  <<: *defaults
+"""
+
+
+@pytest.fixture
+def compose_file(tmp_path):
+    path = tmp_path / "docker-compose.yml"
+    path.write_text(COMPOSE)
+    delta._yaml_documents.clear()
+    yield path
+    delta._yaml_documents.clear()
+
+
+@pytest.mark.local
+@pytest.mark.framework
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("services.tower-db.image", "mysql:8"),  # native walk
+        ("services.tower-db.environment", None),  # null is present, not absent
+        ("services.tower-db.healthcheck.disable", True),
+        ("x-merged.restart", "always"),  # merge key
+        ("services.tower-db.ports[1]", 33060),  # yamlpath fallback: index
+        ("services.tower-db.ports.0", 3306),  # yamlpath fallback: sequence under a plain path
+        ("services.8000", "numeric-key"),  # yamlpath fallback: non-string keys
+    ],
+)
+def test_present_paths_resolve_like_yamlpath(compose_file, path, expected):
+    assert_yaml_delta(test_file_path=compose_file, present={path: expected})
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_omitted_paths(compose_file):
+    assert_yaml_delta(
+        test_file_path=compose_file,
+        omitted={"services.wave-lite", "services.tower-db.image.tag", "services.tower-db.environment.X"},
+    )
+    with pytest.raises(AssertionError, match="should be absent"):
+        assert_yaml_delta(test_file_path=compose_file, omitted={"services.tower-db.environment"})
+    with pytest.raises(AssertionError, match="not found"):
+        assert_yaml_delta(test_file_path=compose_file, present={"services.wave-lite.image": "x"})
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_document_parsed_once_per_file_version(compose_file, monkeypatch):
+    calls = []
+    real = delta.Parsers.get_yaml_data
+    monkeypatch.setattr(delta.Parsers, "get_yaml_data", lambda *a: calls.append(a) or real(*a))
+
+    for _ in range(3):
+        assert_yaml_delta(test_file_path=compose_file, present={"services.tower-db.image": "mysql:8"})
+    assert len(calls) == 1
+
+    compose_file.write_text(COMPOSE.replace("mysql:8", "mysql:8.4"))
+    assert_yaml_delta(test_file_path=compose_file, present={"services.tower-db.image": "mysql:8.4"})
+    assert len(calls) == 2
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_dict_input_needs_no_tempfile(monkeypatch):
+    monkeypatch.setattr(delta, "Processor", lambda *a: pytest.fail("plain paths must not reach yamlpath"))
+    content = {"wave": {"server": {"url": "https://wave.example"}}}
+    assert_yaml_delta(test_file_content=content, present={"wave.server.url": "https://wave.example"})
+    assert_yaml_delta(test_file_content=content, omitted={"wave.db"})
+
+
+## ------------------------------------------------------------------------------------
+## merge_deltas
+## ------------------------------------------------------------------------------------
+BASE = {
+    "docker_compose": {"present": {"services.tower.image": "t:1"}, "omitted": {"services.wave-lite"}},
+    "tower_sql": {"present": {"CREATE DATABASE tower"}, "omitted": {"wave"}},
+}
+WAVE = {
+    "docker_compose": {
+        "present": {"services.wave-lite.image": "w:1", "services.wave-lite.labels.seqera": "yes"},
+        "omitted": set(),
+    },
+    "tower_sql": {"present": {"wave"}, "omitted": set()},
+}
+NO_WAVE_LABELS = {"docker_compose": {"present": {}, "omitted": {"services.wave-lite.labels"}}}
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_present_clears_omitted_ancestors_and_omitted_clears_present_descendants():
+    merged = merge_deltas(BASE, WAVE, NO_WAVE_LABELS)
+    assert merged["docker_compose"] == {
+        "present": {"services.tower.image": "t:1", "services.wave-lite.image": "w:1"},
+        "omitted": {"services.wave-lite.labels"},
+    }
+    # Text templates: exact matches only.
+    assert merged["tower_sql"] == {"present": {"CREATE DATABASE tower", "wave"}, "omitted": set()}
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_merge_is_memoised_but_returns_fresh_copies():
+    first = merge_deltas(BASE, WAVE)
+    first["docker_compose"]["present"]["mutated"] = True
+    first["tower_sql"]["omitted"].add("mutated")
+
+    second = merge_deltas(BASE, WAVE)
+    assert "mutated" not in second["docker_compose"]["present"]
+    assert "mutated" not in second["tower_sql"]["omitted"]
+    assert "services.wave-lite" in BASE["docker_compose"]["omitted"]  # inputs untouched
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_inline_deltas_with_recycled_ids_are_not_confused():
+    """Identity memo keys must never serve one inline dict's merge for another."""
+    for value in ("a", "b", "c"):
+        merged = merge_deltas(BASE, {"docker_compose": {"present": {"services.tower.image": value}}})
+        assert merged["docker_compose"]["present"]["services.tower.image"] == value
+
+
+## ------------------------------------------------------------------------------------
+## assert_text_delta
+## ------------------------------------------------------------------------------------
+@pytest.mark.local
+@pytest.mark.framework
+def test_text_delta_reports_every_failure_with_line_numbers():
+    content = "#!/bin/bash\nexport A=1\nexport WAVE=on\n"
+    with pytest.raises(AssertionError) as excinfo:
+        assert_text_delta(
+            test_file_content=content,
+            present={"export A=1", "export B=2", "export C=3"},
+            omitted={"WAVE=on", "#!/bin/bash", "absent"},
+        )
+    message = str(excinfo.value)
+    assert "'export B=2'" in message and "'export C=3'" in message
+    assert "(line 1):\n  '#!/bin/bash'" in message
+    assert "(line 3):\n  'WAVE=on'" in message
+    assert "'absent'" not in message and "'export A=1'" not in message
@@ -0,0 +1,81 @@
+"""Tests for the concurrent plan runner and bounded plan cache (`tests/utils/terraform/executor.py`).
+
+`terraform` is replaced by a fake `execute_subprocess` that writes the plan files the real
+command would; the plan cache lives under `tmp_path`.
+"""
+
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from tests.utils.config import FP
+from tests.utils.terraform import executor
+
+
+@pytest.fixture
+def fake_terraform(tmp_path, monkeypatch):
+    """Record concurrent plan runs; plans whose tfvars contain `bad` fail like a validation error."""
+    monkeypatch.setattr(FP, "CACHE_PLAN_DIR", str(tmp_path / ".plan_cache"))
+    monkeypatch.setattr(
+        executor, "hash_cache_key", lambda tf_modifiers, qualifier="": tf_modifiers.split("=")[0].strip()
+    )
+    calls = {"runs": 0, "active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def execute_subprocess(command, cwd=None):
+        run_dir = re.search(r"-out=(\S+)/tfplan", command).group(1)
+        tfvars = Path(run_dir, "override.tfvars").read_text()
+        with lock:
+            calls["runs"] += 1
+            calls["active"] += 1
+            calls["peak"] = max(calls["peak"], calls["active"])
+        time.sleep(0.05)
+        with lock:
+            calls["active"] -= 1
+        if "bad" in tfvars:
+            raise RuntimeError(f"Invalid value for variable: {tfvars}")
+        Path(run_dir, "tfplan").write_text("x" * 1000)
+        Path(run_dir, "tfplan.json").write_text(f'{{"tfvars": "{tfvars}"}}')
+        return ""
+
+    monkeypatch.setattr(executor, "execute_subprocess", execute_subprocess)
+    return calls
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_plans_run_concurrently_and_failures_are_returned(fake_terraform):
+    results = executor.prepare_plans({"a": "a = 1", "b": "b = 2", "bad": "bad = 3"}, max_workers=3)
+    assert results["a"] == {"tfvars": "a = 1"}
+    assert isinstance(results["bad"], RuntimeError) and "bad = 3" in str(results["bad"])
+    assert fake_terraform["peak"] > 1
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_cached_plan_is_read_in_place(fake_terraform, tmp_path):
+    executor.prepare_plan("a = 1")
+    assert executor.prepare_plan("a = 1") == {"tfvars": "a = 1"}
+    assert fake_terraform["runs"] == 1
+    assert sorted(p.name for p in (tmp_path / ".plan_cache").iterdir()) == ["plan_a", "plan_a.json"]
+    assert not (tmp_path / "tfplan.json").exists()
+    assert executor.cached_plan_path("a  =  1").is_file()  # what `TF.apply` should be given
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_cache_evicts_least_recently_used_under_budget(fake_terraform, tmp_path, monkeypatch):
+    # Each entry is ~1 KiB; room for two.
+    monkeypatch.setenv("PLAN_CACHE_MAX_MB", str(2.5 / 1024))
+    executor.prepare_plan("a = 1")
+    executor.prepare_plan("b = 1")
+    old = time.time() - 60
+    os.utime(tmp_path / ".plan_cache" / "plan_b.json", (old, old))
+    executor.prepare_plan("a = 1")  # hit: `a` is now the most recently used
+    executor.prepare_plan("c = 1")
+
+    assert sorted(p.name for p in (tmp_path / ".plan_cache").glob("*.json")) == ["plan_a.json", "plan_c.json"]
@@ -0,0 +1,54 @@
+"""Tests for the precompute phase profile (`tests/utils/terraform/profiling.py`)."""
+
+import json
+
+import pytest
+
+from tests.utils.terraform import profiling
+from tests.utils.terraform.profiling import PhaseProfile
+
+
+@pytest.fixture(autouse=True)
+def fresh_collector():
+    """Each test starts (and leaves) an empty session collector."""
+    profiling.reset()
+    yield
+    profiling.reset()
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_phases_accumulate_and_finish_collects():
+    """Re-entering a phase adds to it; `finish` hands a JSON-ready record to the collector."""
+    profile = PhaseProfile("abc", ["abc", "def"])
+    profile.add("template_writes", 0.25)
+    profile.add("template_writes", 0.5)
+    with profile.phase("json_parse"):
+        pass
+    profile.finish("miss-ok")
+
+    (record,) = profiling.collected()
+    assert record["scenarios"] == ["abc", "def"]
+    assert record["status"] == "miss-ok"
+    assert record["phases"]["template_writes"] == pytest.approx(0.75)
+    assert "json_parse" in record["phases"]
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_summary_percentiles_and_jsonl(tmp_path):
+    """p50/p95/max are nearest-rank over runs that recorded the phase; JSONL has one line per run."""
+    for seconds in (1.0, 2.0, 3.0, 4.0, 10.0):
+        profile = PhaseProfile("s", ["s"])
+        profile.add("console_evaluate", seconds)
+        profile.finish("miss-ok")
+
+    summary = profiling.summarize(profiling.collected())
+    assert summary["console_evaluate"] == {"p50": 3.0, "p95": 10.0, "max": 10.0, "total": 20.0}
+    assert "payload_build" not in summary
+
+    path = profiling.write_jsonl(tmp_path / "logs" / "profile.jsonl")
+    lines = path.read_text().splitlines()
+    assert len(lines) == 5
+    assert json.loads(lines[0])["phases"] == {"console_evaluate": 1.0}
+    assert "console_evaluate" in profiling.format_summary(profiling.collected())
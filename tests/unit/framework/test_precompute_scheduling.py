@@ -0,0 +1,71 @@
+"""Tests for precompute pool sizing and ordering (`tests/utils/terraform/precompute.py`).
+
+No terraform involved: core/memory probes are monkeypatched and the timing history lives
+in a throwaway scenario-cache directory.
+"""
+
+import pytest
+
+from tests.utils.config import FP
+from tests.utils.terraform import precompute
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    """Keep `timings.json` out of the real scenario cache."""
+    monkeypatch.setattr(FP, "CACHE_SCENARIO_DIR", str(tmp_path))
+    monkeypatch.delenv("PRECOMPUTE_MAX_WORKERS", raising=False)
+    monkeypatch.delenv("PRECOMPUTE_CONSOLE_MEMORY_MB", raising=False)
+    return tmp_path
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_worker_count_capped_by_memory(monkeypatch):
+    """32 cores but room for only three console pairs → three workers."""
+    monkeypatch.setattr(precompute, "_available_cores", lambda: 32)
+    monkeypatch.setattr(precompute, "_available_memory_mb", lambda: 3 * 2 * precompute._DEFAULT_CONSOLE_MEMORY_MB + 1)
+    assert precompute.recommended_worker_count() == 3
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_worker_count_capped_by_cores(monkeypatch):
+    """Plenty of memory on a 4-core runner → two workers (two consoles each), not the old hard-coded eight."""
+    monkeypatch.setattr(precompute, "_available_cores", lambda: 4)
+    monkeypatch.setattr(precompute, "_available_memory_mb", lambda: 256_000)
+    assert precompute.recommended_worker_count() == 2
+
+    monkeypatch.setattr(precompute, "_available_cores", lambda: 1)
+    assert precompute.recommended_worker_count() == 1
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_worker_count_env_override_and_floor(monkeypatch):
+    """`PRECOMPUTE_MAX_WORKERS` pins the count; a starved box still gets one worker."""
+    monkeypatch.setattr(precompute, "_available_cores", lambda: 4)
+    monkeypatch.setattr(precompute, "_available_memory_mb", lambda: 100)
+    assert precompute.recommended_worker_count() == 1
+
+    monkeypatch.setenv("PRECOMPUTE_MAX_WORKERS", "6")
+    assert precompute.recommended_worker_count() == 6
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_longest_expected_first_with_unknowns_leading():
+    """Unseen scenarios first, then by historical duration descending."""
+    precompute._record_timings({"fast": 1.0, "slow": 9.0, "mid": 5.0})
+    scenarios = dict.fromkeys(["fast", "mid", "never_seen", "slow"], "")
+    ordered = precompute._order_longest_first(scenarios, precompute._load_timings())
+    assert list(ordered) == ["never_seen", "slow", "mid", "fast"]
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_timing_history_is_averaged():
+    """Repeated observations smooth rather than overwrite."""
+    precompute._record_timings({"s": 4.0})
+    precompute._record_timings({"s": 2.0})
+    assert precompute._load_timings()["s"] == pytest.approx(3.0)
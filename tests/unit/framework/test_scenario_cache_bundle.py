@@ -0,0 +1,104 @@
+"""Tests for exporting / importing scenario-cache bundles (`tests/utils/cache/bundle.py`).
+
+Two cache roots under `tmp_path` stand in for the warming and the consuming CI runner; no
+precompute or terraform involved.
+"""
+
+import io
+import json
+import tarfile
+
+import pytest
+
+from tests.utils.cache import blobstore, bundle
+from tests.utils.config import FP
+
+STATIC = "a" * 64
+OTHER_STATIC = "b" * 64
+
+
+def _use_cache(monkeypatch, root):
+    monkeypatch.setattr(FP, "CACHE_SCENARIO_DIR", str(root))
+    monkeypatch.setattr(FP, "CACHE_BLOB_DIR", str(root / blobstore.BLOB_DIRNAME))
+
+
+def _scenario(root, key: str, content: str, static: str = STATIC) -> None:
+    digest = blobstore.put_blob(content, ".yml")
+    (root / key).mkdir(parents=True)
+    (root / key / "outputs.json").write_text(json.dumps({"url": key}))
+    entries = {"tower_yml": {"blob": digest, "extension": ".yml", "inputs": "x"}}
+    blobstore.write_manifest(root / key, {"templates": entries, "files": {"outputs.json": "y"}, "static": static})
+
+
+@pytest.fixture
+def runners(tmp_path, monkeypatch):
+    """Returns `use(name)`, which points FP at that runner's cache root and returns it."""
+
+    def use(name):
+        _use_cache(monkeypatch, tmp_path / name)
+        return tmp_path / name
+
+    return use
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_round_trip_imports_only_missing_scenarios(runners, tmp_path):
+    warm = runners("warm")
+    _scenario(warm, "0000000000000001", "shared")
+    _scenario(warm, "0000000000000002", "shared")
+    _scenario(warm, "0000000000000003", "elsewhere", static=OTHER_STATIC)
+    archive = bundle.export_bundle(tmp_path / "artifacts", STATIC)
+
+    cold = runners("cold")
+    _scenario(cold, "0000000000000002", "local copy wins")
+    report = bundle.import_bundle(archive, STATIC)
+
+    assert report.imported == ["0000000000000001"]
+    assert report.already_present == 1 and not report.rejected
+    manifest = blobstore.read_manifest(cold / "0000000000000001")
+    assert blobstore.resolve_entry(manifest["templates"]["tower_yml"]).read_text() == "shared"
+    assert (cold / "0000000000000001" / "outputs.json").read_text() == json.dumps({"url": "0000000000000001"})
+    assert not (cold / "0000000000000003").exists()
+
+    assert bundle.import_bundle(archive, STATIC).already_present == 2
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_bundle_for_another_static_hash_is_refused(runners, tmp_path):
+    _scenario(runners("warm"), "0000000000000001", "content")
+    archive = bundle.export_bundle(tmp_path / "artifacts", STATIC)
+
+    runners("cold")
+    with pytest.raises(ValueError, match="static hash"):
+        bundle.import_bundle(archive, OTHER_STATIC)
+    assert bundle.export_bundle(tmp_path / "artifacts", OTHER_STATIC) is None
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_corrupted_member_rejects_its_scenario(runners, tmp_path):
+    warm = runners("warm")
+    _scenario(warm, "0000000000000001", "good")
+    _scenario(warm, "0000000000000002", "will be corrupted")
+    archive = bundle.export_bundle(tmp_path / "artifacts", STATIC)
+
+    # Rewrite the archive with one blob's bytes flipped; the index still lists the original digest.
+    bad_digest = blobstore.put_blob("will be corrupted", ".yml")
+    tampered = tmp_path / "tampered.tar.gz"
+    with tarfile.open(archive, "r:gz") as src, tarfile.open(tampered, "w:gz") as dst:
+        for member in src.getmembers():
+            data = src.extractfile(member).read()
+            if bad_digest in member.name:
+                data = b"tampered"
+                member.size = len(data)
+            dst.addfile(member, io.BytesIO(data))
+
+    cold = runners("cold")
+    report = bundle.import_bundle(tampered, STATIC)
+
+    assert report.imported == ["0000000000000001"]
+    assert "0000000000000002" in report.rejected
+    assert blobstore.read_manifest(cold / "0000000000000002") is None
+    assert not blobstore.blob_path(bad_digest, ".yml").exists()
@@ -0,0 +1,89 @@
+"""Tests for selective template rendering in `tests/utils/terraform/precompute.py`.
+
+Required templates are derived from the source of the fake tests below; no terraform involved.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tests.utils.cache import blobstore
+from tests.utils.config import FP, all_template_files
+from tests.utils.terraform import precompute
+
+BASELINE_ASSERTIONS = {
+    "tower_env": {"present": {"TOWER_ENABLE_WAVE": "false"}, "omitted": set()},
+    "tower_yml": {"present": {}, "omitted": set()},
+}
+WAVE_ASSERTIONS = {"docker_compose": {"present": {"services.wave-lite.image": "x"}, "omitted": set()}}
+
+
+def assert_all_deltas(*_):
+    pass
+
+
+def merge_deltas(*_):
+    pass
+
+
+def _item(fn, fixturenames=("generated_test_files",), tfvars=None):
+    marker = SimpleNamespace(args=[tfvars]) if tfvars else None
+    return SimpleNamespace(function=fn, fixturenames=list(fixturenames), get_closest_marker=lambda name: marker)
+
+
+def _delta_test(generated_test_files):
+    expected = merge_deltas(BASELINE_ASSERTIONS, WAVE_ASSERTIONS)
+    assert_all_deltas(generated_test_files, expected)
+
+
+def _subscript_test(generated_test_files):
+    return generated_test_files["tower_sql"]["content"], generated_test_files["wave_lite_rds"]["filepath"]
+
+
+def _opaque_test(generated_test_files):
+    for key in generated_test_files:
+        pass
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_required_templates_from_test_source():
+    # Baseline counts here (unlike INDEX.md), but only its non-empty entries.
+    assert precompute.required_templates_for_item(_item(_delta_test)) == {"tower_env", "docker_compose"}
+    assert precompute.required_templates_for_item(_item(_subscript_test)) == {"tower_sql", "wave_lite_rds"}
+    assert precompute.required_templates_for_item(_item(_opaque_test)) is None
+    assert precompute.required_templates_for_item(_item(_opaque_test, fixturenames=["scenario_outputs"])) == set()
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_requirements_union_per_scenario_and_all_wins():
+    items = [
+        _item(_delta_test),
+        _item(_subscript_test),
+        _item(_subscript_test, tfvars="a = 1"),
+        _item(_opaque_test, tfvars="a = 1"),
+    ]
+    required = precompute.collect_required_templates(items)
+    assert required[precompute.hash_scenario("#NONE")] == {"tower_env", "docker_compose", "tower_sql", "wave_lite_rds"}
+    assert required[precompute.hash_scenario("a = 1")] is None
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_stale_parts_only_considers_wanted_templates(tmp_path, monkeypatch):
+    monkeypatch.setattr(FP, "CACHE_BLOB_DIR", str(tmp_path / blobstore.BLOB_DIRNAME))
+    monkeypatch.setattr(
+        precompute, "_input_hashes", lambda: dict.fromkeys([*all_template_files, "locals.json", "outputs.json"], "h")
+    )
+    for name in ("locals.json", "outputs.json"):
+        (tmp_path / name).write_text("{}")
+    manifest = {
+        "templates": {"tower_env": {"blob": blobstore.put_blob("x", ".env"), "extension": ".env", "inputs": "h"}},
+        "files": {"locals.json": "h", "outputs.json": "h"},
+    }
+
+    assert precompute._stale_parts(tmp_path, manifest, {"tower_env"}) == (set(), set())
+    # A later session wanting more fills only the gap.
+    assert precompute._stale_parts(tmp_path, manifest, {"tower_env", "tower_yml"}) == ({"tower_yml"}, set())
+    assert precompute._stale_parts(tmp_path, manifest)[0] == set(all_template_files) - {"tower_env"}
@@ -0,0 +1,100 @@
+"""Tests for the lazy, memoised bundle returned by `generate_tc_files`.
+
+A fake scenario directory (manifest + blobs) is built under `tmp_path`; no precompute or
+terraform involved.
+"""
+
+import pytest
+
+from tests.utils.cache import blobstore
+from tests.utils.config import FP
+from tests.utils.terraform import template_generator
+
+
+@pytest.fixture
+def scenario(tmp_path, monkeypatch):
+    """One scenario with two templates whose `read_type` counts its calls."""
+    monkeypatch.setattr(FP, "CACHE_SCENARIO_DIR", str(tmp_path))
+    monkeypatch.setattr(FP, "CACHE_BLOB_DIR", str(tmp_path / blobstore.BLOB_DIRNAME))
+    monkeypatch.setattr(template_generator, "hash_templatefile_cache_key", lambda tf_modifiers: "abc123")
+
+    reads = []
+
+    def read_type(path):
+        reads.append(path)
+        return {"parsed": path}
+
+    templates = {
+        "tower_env": {"extension": ".env", "read_type": read_type, "validation_type": "kv"},
+        "tower_yml": {"extension": ".yml", "read_type": read_type, "validation_type": "yml"},
+    }
+    monkeypatch.setattr(template_generator, "all_template_files", templates)
+
+    scenario_dir = tmp_path / "abc123"
+    scenario_dir.mkdir()
+    entries = {
+        key: {"blob": blobstore.put_blob(f"{key}\n", meta["extension"]), "extension": meta["extension"], "inputs": ""}
+        for key, meta in templates.items()
+    }
+    blobstore.write_manifest(scenario_dir, {"templates": entries, "files": {}})
+
+    template_generator.clear_memo()
+    yield reads
+    template_generator.clear_memo()
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_nothing_parsed_until_content_is_read(scenario):
+    bundle = template_generator.generate_tc_files("#NONE")
+    assert set(bundle) == {"tower_env", "tower_yml"}
+    assert bundle["tower_yml"]["filepath"].endswith(".yml")
+    assert scenario == []
+
+    assert bundle["tower_env"]["content"] == {"parsed": bundle["tower_env"]["filepath"]}
+    assert scenario == [bundle["tower_env"]["filepath"]]
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_content_parsed_once_per_process(scenario):
+    first = template_generator.generate_tc_files("#NONE")
+    first["tower_env"]["content"]
+    second = template_generator.generate_tc_files("#NONE")
+    assert second["tower_env"]["content"] is first["tower_env"]["content"]
+    assert len(scenario) == 1
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_bundle_is_read_only_and_keeps_legacy_shape(scenario):
+    bundle = template_generator.generate_tc_files("#NONE")
+    assert list(bundle["tower_env"]) == ["extension", "read_type", "content", "filepath", "validation_type"]
+    with pytest.raises(TypeError):
+        bundle["tower_env"] = {}
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_missing_blob_still_fails_fast(scenario, tmp_path):
+    for blob in (tmp_path / blobstore.BLOB_DIRNAME).rglob("*.yml"):
+        blob.unlink()
+    with pytest.raises(FileNotFoundError, match="tower_yml"):
+        template_generator.generate_tc_files("#NONE")
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_unrendered_template_fails_only_when_read(scenario, tmp_path):
+    """A template left out by selective rendering stays in the bundle but can't be read."""
+    manifest = blobstore.read_manifest(tmp_path / "abc123")
+    del manifest["templates"]["tower_yml"]
+    blobstore.write_manifest(tmp_path / "abc123", manifest)
+
+    bundle = template_generator.generate_tc_files("#NONE")
+    assert set(bundle) == {"tower_env", "tower_yml"}
+    assert bundle["tower_yml"]["validation_type"] == "yml"
+    with pytest.raises(FileNotFoundError, match="tower_yml.*not rendered"):
+        bundle["tower_yml"]["content"]
+    with pytest.raises(FileNotFoundError):
+        bundle["tower_yml"]["filepath"]
@@ -0,0 +1,87 @@
+"""Tests for per-template cache invalidation (`tests/utils/cache/cache.py:hash_template_inputs`).
+
+Editing one `.tpl` (or one secret) must change only the input hash of the templates that
+actually read it — that's what lets precompute re-render a single template across
+scenarios instead of the whole cache.
+"""
+
+import pytest
+
+from tests.utils.cache import cache
+from tests.utils.cache.cache import hash_template_inputs
+from tests.utils.config import FP
+
+SECRETS = {
+    "tower": {"TOWER_DB_USER": "tower_user", "TOWER_DB_PASSWORD": "pw"},
+    "wave_lite": {"WAVE_LITE_REDIS_AUTH": "x"},
+}
+TOWER_ENV_EXPR = '${templatefile("assets/tower.env.tpl", { user = local.tower_secrets["TOWER_DB_USER"]["value"] })}'
+DOCKER_LOGGING_EXPR = '${templatefile("assets/daemon.json.tpl", { tag = var.app_name })}'
+
+
+@pytest.fixture
+def project_root(tmp_path, monkeypatch):
+    """Fake project root holding two independent `.tpl` files."""
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets/tower.env.tpl").write_text("TOWER_DB_USER=${user}\n")
+    (tmp_path / "assets/daemon.json.tpl").write_text('{"tag": "${tag}"}\n')
+    monkeypatch.setattr(FP, "ROOT", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_tpl_edit_only_invalidates_its_own_template(project_root):
+    """Changing `tower.env.tpl` changes `tower_env`'s hash and leaves `docker_logging`'s alone."""
+    tower_before = hash_template_inputs(TOWER_ENV_EXPR, SECRETS)
+    logging_before = hash_template_inputs(DOCKER_LOGGING_EXPR, SECRETS)
+
+    (project_root / "assets/tower.env.tpl").write_text("TOWER_DB_USER=${user}\nEXTRA=1\n")
+
+    assert hash_template_inputs(TOWER_ENV_EXPR, SECRETS) != tower_before
+    assert hash_template_inputs(DOCKER_LOGGING_EXPR, SECRETS) == logging_before
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_only_referenced_secrets_are_folded_in(project_root):
+    """A secret the expression doesn't reference must not affect its hash."""
+    baseline = hash_template_inputs(TOWER_ENV_EXPR, SECRETS)
+
+    unrelated = {**SECRETS, "tower": {**SECRETS["tower"], "TOWER_DB_PASSWORD": "rotated"}}
+    assert hash_template_inputs(TOWER_ENV_EXPR, unrelated) == baseline
+
+    related = {**SECRETS, "tower": {**SECRETS["tower"], "TOWER_DB_USER": "renamed"}}
+    assert hash_template_inputs(TOWER_ENV_EXPR, related) != baseline
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_expression_change_invalidates(project_root):
+    """Passing a different arg map to the same `.tpl` is a different render."""
+    changed = DOCKER_LOGGING_EXPR.replace("var.app_name", "var.other")
+    assert hash_template_inputs(changed, SECRETS) != hash_template_inputs(DOCKER_LOGGING_EXPR, SECRETS)
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_replacement_console_gets_its_own_scenario_keys(project_root, monkeypatch):
+    """Stand-in placeholders must never count as fresh entries for a real-terraform session."""
+    (project_root / "000_main.tf").write_text("locals {}\n")
+    monkeypatch.setattr(FP, "TFVARS_BASE", str(project_root / "terraform.tfvars"))
+    monkeypatch.setattr(FP, "TFVARS_BASE_OVERRIDE_DST", str(project_root / "base-overrides.auto.tfvars"))
+    (project_root / "terraform.tfvars").write_text('app_name = "tower"\n')
+    (project_root / "base-overrides.auto.tfvars").write_text("")
+
+    def key(console_bin: str | None) -> str:
+        if console_bin is None:
+            monkeypatch.delenv("PRECOMPUTE_CONSOLE_BIN", raising=False)
+        else:
+            monkeypatch.setenv("PRECOMPUTE_CONSOLE_BIN", console_bin)
+        cache._compute_static_hash_part.cache_clear()
+        return cache.hash_templatefile_cache_key("flag = true")
+
+    real = key(None)
+    assert key("") == real
+    assert key("python3 tests/utils/terraform/console_standin.py") != real
+    cache._compute_static_hash_part.cache_clear()
@@ -0,0 +1,90 @@
+"""Tests for the per-session overlay workspace (`tests/utils/terraform/workspace.py`).
+
+A fake project root is built under `tmp_path`; no terraform involved.
+"""
+
+import pytest
+
+from tests.utils.terraform import workspace
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "modules" / "connection_strings").mkdir(parents=True)
+    (root / "000_main.tf").write_text("locals {}\n")
+    (root / "terraform.tfvars").write_text('app_name = "deployer"\n')
+    (root / "deployer.auto.tfvars").write_text("flag = true\n")
+    (root / "tfplan.json").write_text("{}")
+    (root / ".terraform" / "providers").mkdir(parents=True)
+    (root / ".terraform" / "terraform.tfstate").write_text("{}")
+    return root
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_overlay_links_config_and_keeps_session_files_private(project, tmp_path):
+    ws = workspace.build_workspace(tmp_path / "ws", root=project)
+
+    assert (ws / "000_main.tf").is_symlink() and (ws / "modules").is_symlink()
+    # The deployer's tfvars and any root artefacts never leak into a test session.
+    for name in ("terraform.tfvars", "deployer.auto.tfvars", "tfplan.json"):
+        assert not (ws / name).exists()
+    # Own data dir: shared provider cache, private copy of the backend state.
+    assert not (ws / ".terraform").is_symlink()
+    assert (ws / ".terraform" / "providers").is_symlink()
+    assert not (ws / ".terraform" / "terraform.tfstate").is_symlink()
+
+    # Writes land in the workspace, not the root.
+    (ws / "override.auto.tfvars").write_text("x = 1\n")
+    assert not (project / "override.auto.tfvars").exists()
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_two_workspaces_coexist_and_removal_spares_the_root(project, tmp_path):
+    first = workspace.build_workspace(tmp_path / "ws-a", root=project)
+    second = workspace.build_workspace(tmp_path / "ws-b", root=project)
+    workspace.remove_workspace(first)
+
+    assert not first.exists()
+    assert (second / "000_main.tf").read_text() == "locals {}\n"
+    assert (project / "modules" / "connection_strings").is_dir()
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_refuses_root_and_foreign_directories(project, tmp_path):
+    with pytest.raises(ValueError, match="project root"):
+        workspace.build_workspace(project, root=project)
+    foreign = tmp_path / "not-a-workspace"
+    foreign.mkdir()
+    (foreign / "keep.txt").write_text("mine")
+    with pytest.raises(ValueError, match="not a test workspace"):
+        workspace.build_workspace(foreign, root=project)
+    assert (foreign / "keep.txt").exists()
+
+
+@pytest.mark.local
+@pytest.mark.framework
+def test_staged_secrets_survive_regeneration_of_the_shared_copies(tmp_path, monkeypatch):
+    src = tmp_path / "datafiles" / "secrets"
+    src.mkdir(parents=True)
+    ws = tmp_path / "ws"
+    ws.mkdir()
+    monkeypatch.setattr(workspace.FP, "SECRETS_SRC_DIR", str(src))
+    staged = {}
+    for attr in ("TOWER_SECRETS", "GROUNDSWELL_SECRETS", "SEQERAKIT_SECRETS", "WAVE_LITE_SECRETS"):
+        name = f"{attr.lower()}.json"
+        (src / name).write_text(f'{{"{attr}": 1}}')
+        monkeypatch.setattr(workspace.FP, attr, str(ws / "test-secrets" / name))
+        staged[attr] = ws / "test-secrets" / name
+
+    workspace.stage_secrets()
+    # `make generate_test_data` in another session: rm + rewrite.
+    for path in src.iterdir():
+        path.unlink()
+
+    for attr, path in staged.items():
+        assert path.read_text() == f'{{"{attr}": 1}}'
+    assert (ws / "test-secrets").stat().st_mode & 0o777 == 0o700
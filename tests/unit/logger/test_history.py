@@ -0,0 +1,100 @@
+"""Tests for the cross-session duration history and its regression detection."""
+
+import contextlib
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from tests.utils.logger import history as history_module
+from tests.utils.logger.history import HISTORY_FILENAME, DurationHistory
+from tests.utils.logger.log_parser import PytestLogParser
+from tests.utils.logger.pytest_logger import PytestStructuredLogger
+
+# File-level marker: opts every test in this file into the `logger` slice, which is
+# excluded from the default `make run_tests_*` targets. Run via `make run_tests_logger_only`
+# or `pytest -m logger`.
+pytestmark = pytest.mark.logger
+
+
+class TestDurationHistory:
+    """Test `history.py` against a throwaway SQLite file."""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / HISTORY_FILENAME
+        self.clock = 1_000.0
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def session(self, monkeypatch, session_id: str, samples: dict[str, float], keep: int | None = None) -> int:
+        # One flush per session, each strictly later than the previous one.
+        self.clock += 60
+        monkeypatch.setattr(history_module.time, "time", lambda: self.clock)
+        history = DurationHistory(self.path, session_id)
+        for name, duration in samples.items():
+            history.record("test", name, duration)
+        return history.flush(keep_sessions=keep)
+
+    def test_slowdown_is_flagged_against_rolling_baseline(self, monkeypatch):
+        for i, base in enumerate((1.0, 1.1, 0.9, 1.0)):
+            self.session(monkeypatch, f"s{i}", {"t_slow": base, "t_steady": 0.5})
+        self.session(monkeypatch, "now", {"t_slow": 2.0, "t_steady": 0.55})
+
+        found = DurationHistory(self.path).regressions(threshold=0.5)
+
+        assert [(r.name, r.baseline_runs) for r in found] == [("t_slow", 4)]
+        assert found[0].baseline_p50 == pytest.approx(1.0)
+        assert found[0].ratio == pytest.approx(2.0)
+        # An older session is compared only against the sessions before it.
+        assert DurationHistory(self.path).regressions(session_id="s3", min_runs=3) == []
+
+    def test_min_runs_and_min_delta_suppress_noise(self, monkeypatch):
+        self.session(monkeypatch, "s0", {"t_new": 1.0, "t_fast": 0.01})
+        self.session(monkeypatch, "s1", {"t_new": 1.0, "t_fast": 0.01})
+        self.session(monkeypatch, "now", {"t_new": 5.0, "t_fast": 0.04})  # 4x, but only +30ms
+
+        history = DurationHistory(self.path)
+        assert history.regressions(min_runs=3) == []
+        assert [r.name for r in history.regressions(min_runs=2)] == ["t_new"]
+        assert [r.name for r in history.regressions(min_runs=2, min_delta=0.0)] == ["t_new", "t_fast"]
+
+    def test_flush_prunes_to_newest_sessions(self, monkeypatch):
+        for i in range(5):
+            assert self.session(monkeypatch, f"s{i}", {"t": 1.0}, keep=3) == 1
+        assert self.session(monkeypatch, "empty", {}, keep=3) == 0
+
+        history = DurationHistory(self.path)
+        with contextlib.closing(history._connect()) as conn:
+            sessions = {row[0] for row in conn.execute("SELECT DISTINCT session_id FROM samples")}
+        assert sessions == {"s2", "s3", "s4"}
+
+    def test_record_precompute_skips_failed_runs(self):
+        history = DurationHistory(self.path, "s0")
+        history.record_precompute(
+            [
+                {"status": "miss-ok", "scenarios": ["aaa", "bbb"], "total": 12.0},
+                {"status": "miss-err:CalledProcessError", "scenarios": ["ccc"], "total": 3.0},
+            ]
+        )
+
+        assert history._pending == [("scenario", "aaa", 12.0), ("scenario", "bbb", 12.0)]
+
+    def test_logger_records_passes_and_parser_reports(self):
+        log_file = self.temp_dir / "structured.log"
+        for _ in range(3):
+            logger = PytestStructuredLogger(str(log_file), history=True)
+            logger.log_test_result("tests/x.py::t", "PASSED", 0.2)
+            logger.log_session_end(passed=1, failed=0, skipped=0, errors=0, duration=0.3)
+        logger = PytestStructuredLogger(str(log_file), history=True)
+        logger.log_test_result("tests/x.py::t", "PASSED", 0.9)
+        logger.log_test_result("tests/x.py::t_broken", "FAILED", 9.0)
+        assert logger.history is not None and logger.history._pending == [("test", "tests/x.py::t", 0.9)]
+        logger.log_session_end(passed=1, failed=1, skipped=0, errors=0, duration=10.0)
+
+        report = PytestLogParser(str(log_file)).regressions(kind="test")
+
+        assert "tests/x.py::t" in report and "4.5x" in report
+        assert "t_broken" not in report
@@ -0,0 +1,96 @@
+"""Tests for the streaming insights aggregator and its duration sketch."""
+
+import random
+
+import pytest
+
+from tests.utils.logger.insights import DurationSketch, InsightsAggregator
+from tests.utils.logger.log_formatter import PytestLogFormatter
+from tests.utils.logger.pytest_logger import PytestStructuredLogger
+
+# File-level marker: opts every test in this file into the `logger` slice, which is
+# excluded from the default `make run_tests_*` targets. Run via `make run_tests_logger_only`
+# or `pytest -m logger`.
+pytestmark = pytest.mark.logger
+
+
+def _result(path: str, status: str, duration: float, markers=(), reason: str = "") -> dict:
+    return {
+        "event_type": "test_result",
+        "test_path": path,
+        "status": status,
+        "duration": duration,
+        "failure_reason": reason,
+        "metadata": {"markers": list(markers)},
+    }
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(-2, 1.5) for _ in range(20_000))
+    sketch = DurationSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+    assert len(sketch.buckets) < 1500
+
+
+def test_sketch_handles_zero_and_empty():
+    sketch = DurationSketch()
+    assert sketch.quantile(0.5) == 0.0
+    for value in (0.0, 0.0, 0.0, 2.0):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(2.0, rel=0.01)
+
+
+def test_memory_stays_bounded_without_retained_results():
+    aggregator = InsightsAggregator(max_failures=5)
+    for i in range(10_000):
+        aggregator.add(_result(f"t{i}", "FAILED" if i % 10 == 0 else "PASSED", i / 1000, ["local"], "boom"))
+
+    assert aggregator.results == []
+    assert len(aggregator.failures) == 5 and aggregator.failures_total == 1000
+    assert [r["test_path"] for r in aggregator.slowest()][:2] == ["t9999", "t9998"]
+    assert aggregator.markers["local"] == {"total": 10_000, "passed": 9_000, "failed": 1_000}
+    assert aggregator.insights()["performance_metrics"]["percentiles"]["p50"] == pytest.approx(5.0, rel=0.02)
+
+    report = PytestLogFormatter().format_failed_tests(aggregator)
+    assert report.endswith("... and 995 more failed tests")
+
+
+def test_slowest_ties_keep_log_order():
+    entries = [_result(f"t{i}", "PASSED", 1.0) for i in range(12)]
+    performance = PytestLogFormatter().format_test_performance(iter(entries))
+    lines = performance.splitlines()
+
+    assert lines[3].endswith("t0") and lines[12].endswith("t9")
+    assert lines[-1] == "... and 2 more tests"
+
+
+def test_one_stream_pass_matches_list_rendering():
+    entries = [
+        _result("a", "PASSED", 0.2, ["local"]),
+        _result("b", "FAILED", 0.4, ["db"], "AssertionError"),
+        {"event_type": "session_end", "summary": {"total": 2, "passed": 1, "failed": 1}, "duration": 1.5},
+    ]
+    formatter = PytestLogFormatter()
+
+    assert formatter.format_human_readable(iter(entries)) == formatter.format_human_readable(entries)
+    insights = formatter.extract_key_insights(iter(entries))
+    assert [t["test_path"] for t in insights["test_results"]] == ["a", "b"]
+    assert insights["failure_patterns"] == [{"test_path": "b", "failure_reason": "AssertionError"}]
+
+
+def test_logger_aggregates_live(tmp_path):
+    logger = PytestStructuredLogger(str(tmp_path / "live.log"))
+    logger.log_test_result("tests/x.py::t", "FAILED", 0.5, failure_reason="boom", markers=["local"])
+    logger.log_session_end(passed=0, failed=1, skipped=0, errors=0, duration=0.6)
+
+    insights = logger.insights.insights()
+    assert insights["performance_metrics"]["total_tests"] == 1
+    assert insights["session_info"]["summary"]["failed"] == 1
+    assert insights["marker_usage"] == {"local": 1}
@@ -121,13 +121,13 @@ class TestPytestLogFormatter:
         assert entries[-1]["event_type"] == "session_end"
 
     def test_read_log_entries_with_limit(self):
-        """Test reading log entries with limit."""
+        """Test reading log entries with limit: the most recent N, oldest first."""
         self.create_sample_log_entries()
         entries = self.formatter.read_log_entries(max_entries=3)
 
         assert len(entries) == 3
-        assert entries[0]["event_type"] == "session_start"
-        assert entries[2]["event_type"] == "test_result"
+        assert entries[0]["test_path"] == "tests/unit/test_example.py::test_fail"
+        assert entries[2]["event_type"] == "session_end"
 
     def test_read_log_entries_invalid_json(self):
         """Test reading log file with invalid JSON."""
@@ -0,0 +1,120 @@
+"""Tests for the offset index, tail-first reader and rotation of the structured log."""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from tests.utils.logger import log_index
+from tests.utils.logger.log_formatter import PytestLogFormatter
+from tests.utils.logger.log_parser import PytestLogParser
+
+# File-level marker: opts every test in this file into the `logger` slice, which is
+# excluded from the default `make run_tests_*` targets. Run via `make run_tests_logger_only`
+# or `pytest -m logger`.
+pytestmark = pytest.mark.logger
+
+
+def _entry(session: str, event_type: str, **kwargs) -> dict:
+    # Same key order as `PytestStructuredLogger._create_base_entry`.
+    return {"timestamp": "2025-01-13T10:30:00", "test_session_id": session, "event_type": event_type, **kwargs}
+
+
+class TestLogIndex:
+    """Test `log_index.py` against a throwaway log file."""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.log_file = self.temp_dir / "structured.log"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def append(self, *entries, partial: str = ""):
+        with open(self.log_file, "a") as f:
+            f.writelines(json.dumps(e) + "\n" for e in entries)
+            f.write(partial)
+
+    def session(self, session: str, tests: int) -> list[dict]:
+        entries = [_entry(session, "session_start")]
+        entries += [
+            _entry(session, "test_result", test_path=f"t{i}", status="PASSED", duration=0.1) for i in range(tests)
+        ]
+        entries += [
+            _entry(session, "session_end", summary={"passed": tests, "failed": 0, "total": tests}, duration=1.0)
+        ]
+        return entries
+
+    def test_tail_returns_most_recent_entries_across_blocks(self, monkeypatch):
+        monkeypatch.setattr(log_index, "_BLOCK_BYTES", 64)  # force many backwards block reads
+        self.append(*self.session("aaaa", 20), partial='{"test_session_id": "bb')
+
+        tail = log_index.tail_entries(self.log_file, 3)
+
+        assert [e.get("test_path", e["event_type"]) for e in tail] == ["t18", "t19", "session_end"]
+        assert len(log_index.tail_entries(self.log_file, 1000)) == 22
+
+    def test_index_catches_up_incrementally_with_interleaved_sessions(self):
+        self.append(_entry("aaaa", "session_start"), _entry("bbbb", "session_start"), _entry("aaaa", "test_start"))
+        index = log_index.LogIndex(self.log_file).refresh()
+        indexed_to = index.data["size"]
+        assert index.sessions() == ["aaaa", "bbbb"]
+
+        self.append(_entry("bbbb", "session_end"), partial='{"timestamp": "x", "test_session_id": "cc')
+        index = log_index.LogIndex(self.log_file).refresh()  # reloaded from the sidecar
+
+        assert index.data["size"] > indexed_to
+        assert index.data["size"] < self.log_file.stat().st_size  # partial line not indexed yet
+        assert [e["event_type"] for e in index.session_entries("aaaa")] == ["session_start", "test_start"]
+        assert [e["event_type"] for e in index.session_entries("bbbb")] == ["session_start", "session_end"]
+        assert len(index.data["sessions"]["aaaa"]) == 2  # two separate byte ranges
+
+    def test_index_rebuilds_when_log_is_replaced(self):
+        self.append(*self.session("aaaa", 2))
+        log_index.LogIndex(self.log_file).refresh()
+
+        self.log_file.unlink()
+        self.append(_entry("bbbb", "session_start"))
+
+        assert log_index.LogIndex(self.log_file).refresh().sessions() == ["bbbb"]
+
+    def test_rotation_keeps_sessions_addressable(self):
+        self.append(*self.session("aaaa", 3))
+        log_index.LogIndex(self.log_file).refresh()  # rotation reuses already-indexed ranges
+        self.append(*self.session("bbbb", 2))
+
+        segment = log_index.rotate_log(self.log_file, max_bytes=1)
+        assert segment is not None and not self.log_file.exists()
+        self.append(*self.session("cccc", 1))
+
+        formatter = PytestLogFormatter(str(self.log_file))
+        assert [e["event_type"] for e in formatter.read_log_entries(session_id="bbbb")][-1] == "session_end"
+        assert len(formatter.read_log_entries(session_id="aaaa")) == 5
+        assert log_index.LogIndex(self.log_file).refresh().sessions() == ["aaaa", "bbbb", "cccc"]
+        # The tail continues from the live segment into the rotated one.
+        assert [e["test_session_id"] for e in formatter.read_log_entries(max_entries=4)] == [
+            "bbbb",
+            "cccc",
+            "cccc",
+            "cccc",
+        ]
+
+    def test_rotation_threshold_and_retention(self):
+        self.append(*self.session("aaaa", 1))
+        assert log_index.rotate_log(self.log_file, max_bytes=10**9) is None
+
+        for session in ("bbbb", "cccc", "dddd"):
+            self.append(*self.session(session, 1))
+            log_index.rotate_log(self.log_file, max_bytes=1, keep=2)
+
+        assert len(log_index.rotated_segments(self.log_file)) == 2
+        assert log_index.LogIndex(self.log_file).refresh().sessions() == ["cccc", "dddd"]
+
+    def test_parser_restricted_to_latest_session(self):
+        self.append(*self.session("aaaa", 5), *self.session("bbbb", 2))
+
+        summary = PytestLogParser(str(self.log_file), session_id="latest").summarize_tests()
+
+        assert "Total Tests: 2" in summary
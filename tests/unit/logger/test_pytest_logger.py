@@ -4,11 +4,12 @@ import json
 import os
 from pathlib import Path
 import tempfile
+import threading
 import time
 from unittest.mock import patch
 
 import pytest
-from tests.utils.logger.pytest_logger import PytestStructuredLogger, get_logger, reset_logger
+from tests.utils.logger.pytest_logger import BufferedJsonlWriter, PytestStructuredLogger, get_logger, reset_logger
 
 
 # File-level marker: opts every test in this file into the `logger` slice, which is
@@ -228,6 +229,100 @@ class TestPytestStructuredLogger:
             assert entry["test_session_id"] == session_id
 
 
+class TestBufferedWriter:
+    """Test the background `BufferedJsonlWriter` path (`buffered=True`)."""
+
+    def setup_method(self):
+        reset_logger()
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = Path(self.temp_dir) / "test_buffered.log"
+
+    def teardown_method(self):
+        if self.log_file.exists():
+            self.log_file.unlink()
+        Path(self.temp_dir).rmdir()
+
+    def read_log_entries(self):
+        if not self.log_file.exists():
+            return []
+        return [json.loads(line) for line in self.log_file.read_text().splitlines() if line.strip()]
+
+    def test_entries_are_written_in_order_once_flushed(self):
+        logger = PytestStructuredLogger(str(self.log_file), buffered=True)
+        logger._writer.flush_interval = 60  # nothing may reach disk before the explicit flush
+
+        for i in range(5):
+            logger.log_custom_event("buffered", iteration=i)
+        assert self.read_log_entries() == []
+
+        logger.flush()
+        assert [e["iteration"] for e in self.read_log_entries()] == [0, 1, 2, 3, 4]
+        logger.close()
+
+    def test_full_batch_is_written_without_flush(self):
+        writer = BufferedJsonlWriter(self.log_file, batch_size=3, flush_interval=60)
+        for i in range(3):
+            writer.put({"i": i})
+
+        deadline = time.monotonic() + 5
+        while len(self.read_log_entries()) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [e["i"] for e in self.read_log_entries()] == [0, 1, 2]
+        writer.close()
+
+    def test_session_end_flushes(self):
+        logger = PytestStructuredLogger(str(self.log_file), buffered=True)
+        logger._writer.flush_interval = 60
+
+        logger.log_session_start(["test"])
+        logger.log_session_end(1, 0, 0, 0, 2.0)
+
+        assert [e["event_type"] for e in self.read_log_entries()] == ["session_start", "session_end"]
+        logger.close()
+
+    def test_drop_policy_counts_overflow_instead_of_blocking(self):
+        writer = BufferedJsonlWriter(self.log_file, max_queue=1, batch_size=1, overflow="drop")
+        release = threading.Event()
+        real_write = writer._write
+        writer._write = lambda lines: (release.wait(5), real_write(lines))
+
+        writer.put({"i": 0})  # taken by the writer thread, which then stalls in _write
+        deadline = time.monotonic() + 5
+        while writer._queue.qsize() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.put({"i": 1})  # fills the queue
+        start = time.monotonic()
+        writer.put({"i": 2})  # dropped
+        assert time.monotonic() - start < 0.5
+
+        release.set()
+        writer.close()
+        assert writer.take_dropped() == 1
+        assert [e["i"] for e in self.read_log_entries()] == [0, 1]
+
+    def test_flush_records_dropped_entries(self):
+        logger = PytestStructuredLogger(str(self.log_file), buffered=True, overflow="drop")
+        logger._writer.dropped = 3
+
+        logger.flush()
+        logger.close()
+
+        (entry,) = self.read_log_entries()
+        assert entry["event_type"] == "log_entries_dropped"
+        assert entry["count"] == 3
+
+    def test_get_logger_buffers_unless_disabled(self):
+        with patch.dict(os.environ, {"PYTEST_STRUCTURED_LOGGING_BUFFERED": "false"}):
+            reset_logger()  # the conftest hooks may already have created the session's instance
+            assert get_logger(str(self.log_file))._writer is None
+        reset_logger()
+
+        logger = get_logger(str(self.log_file))
+        logger.log_custom_event("via_get_logger")
+        reset_logger()  # closes (and so flushes) the writer
+        assert [e["event_type"] for e in self.read_log_entries()] == ["via_get_logger"]
+
+
 class TestLoggerGlobals:
     """Test global logger functionality."""
 
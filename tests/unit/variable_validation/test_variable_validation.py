@@ -9,6 +9,9 @@ Structure: rounds.
 Adding a new criterion → add an entry to the appropriate round dict (or add a new round
 if you've introduced a variable with more criteria than any existing one).
 
+All selected rounds are planned concurrently up front (`prepare_plans`), so the module
+takes roughly as long as its slowest round.
+
 Trade-offs vs. one-criterion-per-parametrize:
   - Fewer pytest cases (3 vs 20+) → much faster CI run (~3-6s vs ~20-40s)
   - Each case asserts multiple validations in a single plan invocation
@@ -17,7 +20,7 @@ Trade-offs vs. one-criterion-per-parametrize:
 """
 
 import pytest
-from tests.utils.terraform.executor import prepare_plan
+from tests.utils.terraform.executor import prepare_plans
 
 
 # Each round: {variable_name: (bad_value, criterion_description)}
@@ -53,21 +56,36 @@ SCENARIOS: dict[str, dict[str, tuple[str, str]]] = {
 }
 
 
+def _tf_modifiers(scenario: dict[str, tuple[str, str]]) -> str:
+    return "\n".join(f'{name} = "{value}"' for name, (value, _) in scenario.items())
+
+
+@pytest.fixture(scope="module")
+def round_results(request, session_setup):
+    """Plan every selected round concurrently; `{scenario_name: plan_json | RuntimeError}`."""
+    selected = {
+        item.callspec.params["scenario_name"]
+        for item in request.session.items
+        if item.module is request.module and hasattr(item, "callspec")
+    }
+    return prepare_plans({name: _tf_modifiers(SCENARIOS[name]) for name in SCENARIOS if name in selected})
+
+
 @pytest.mark.local
 @pytest.mark.variable_validation
 @pytest.mark.parametrize("scenario_name", list(SCENARIOS.keys()))
-def test_validation_rejects_bad_values(session_setup, scenario_name):
+def test_validation_rejects_bad_values(round_results, scenario_name):
     """For each round, fire one plan with all that round's bad values and assert every entry is rejected.
 
-    `session_setup` is referenced to enforce AWS preflight ordering; the var is unused inside the body.
+    `round_results` depends on `session_setup`, which stages the workspace the plans run in.
     """
     scenario = SCENARIOS[scenario_name]
-    tf_modifiers = "\n".join(f'{name} = "{value}"' for name, (value, _) in scenario.items())
-
-    with pytest.raises(RuntimeError) as excinfo:
-        prepare_plan(tf_modifiers)
+    result = round_results[scenario_name]
+    assert isinstance(result, RuntimeError), (
+        f"In {scenario_name!r}: terraform plan succeeded; expected validation errors."
+    )
 
-    error_text = str(excinfo.value)
+    error_text = str(result)
     for var_name, (bad_value, criterion) in scenario.items():
         assert var_name in error_text, (
             f"In {scenario_name!r}: `{var_name}` set to {bad_value!r} (criterion: {criterion}) "
@@ -19,10 +19,13 @@ then call the right helper per template. Broader regression coverage belongs in
 lock tests.
 """
 
+from collections import OrderedDict
+from collections.abc import Mapping
+import os
 from pathlib import Path
-import tempfile
+import re
 from types import SimpleNamespace
-from typing import Any
+from typing import Any, NamedTuple
 import warnings
 
 from tests.utils.config import all_template_files
@@ -39,6 +42,17 @@ _logging_args = SimpleNamespace(quiet=True, verbose=False, debug=False)
 _logger = ConsolePrinter(_logging_args)
 _yaml_parser = Parsers.get_yaml_editor()
 
+# Parsed YAML documents (+ their yamlpath `Processor`), keyed by (abspath, st_mtime_ns, st_size).
+# Rendered templates are immutable blobs, so every test asserting on the same scenario's
+# `docker-compose.yml` shares one parse for the whole pytest process.
+_yaml_documents: dict[tuple[str, int, int], tuple[Any, Processor]] = {}
+
+# YAMLPaths the native walk can answer: dot-separated plain keys, no `[...]`, wildcards,
+# searches or leading `/`. Anything else goes to yamlpath.
+_PLAIN_YAML_PATH = re.compile(r"[A-Za-z0-9_-]+(\.[A-Za-z0-9_-]+)*")
+_MISSING = object()
+_FALLBACK = object()
+
 
 def _resolve_inputs(test_file_path, test_file_content, helper_name: str):
     """Mutual-exclusion / presence guard for the dual-input helpers.
@@ -106,9 +120,10 @@ def assert_yaml_delta(
     """Assert nested-structure YAML satisfies `present` and `omitted`.
 
     Input (one required):
-      - `test_file_path`: path to the rendered YAML file. Read directly by `yamlpath`.
-      - `test_file_content`: pre-parsed YAML content as a dict. Dumped to a tempfile for
-        `yamlpath` consumption.
+      - `test_file_path`: path to the rendered YAML file. Parsed once per process (cached on
+        path + mtime) and shared by every assertion against the same file.
+      - `test_file_content`: pre-parsed YAML content as a dict. Walked in memory; only handed
+        to `yamlpath` (via an in-memory round-trip) for non-plain paths.
     If both are set, `test_file_path` wins and a warning is issued.
 
     Assertions:
@@ -116,6 +131,9 @@ def assert_yaml_delta(
         with a value equal to (or that stringifies to) the specified value.
       - `omitted` keys are YAMLPaths that must NOT exist.
 
+    Plain dotted paths are resolved by walking the mappings directly; wildcard / search /
+    index expressions (and anything crossing a sequence) fall back to `yamlpath`.
+
     No baseline comparison — YAML deltas in this project are always per-path. Broader
     regression coverage belongs in per-template lock tests.
     """
@@ -123,41 +141,78 @@ def assert_yaml_delta(
     present = present or {}
     omitted = omitted or set()
 
-    tmp_path: str | None = None
-    try:
-        if test_file_path is not None:
-            yaml_source = str(test_file_path)
-        else:
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as tmp:
-                yaml.dump(test_file_content, tmp)
-                tmp_path = tmp.name
-            yaml_source = tmp_path
+    if test_file_path is not None:
+        yaml_source = str(test_file_path)
+        yaml_data, processor = _load_yaml_document(yaml_source)
+    else:
+        yaml_source = "test_file_content"
+        yaml_data, processor = test_file_content, None
+
+    def resolve(path: str) -> list | None:
+        """Matched values for `path` (None if absent): native walk first, yamlpath if it declines."""
+        nonlocal processor
+        value = _walk_plain_path(yaml_data, path)
+        if value is _MISSING:
+            return None
+        if value is not _FALLBACK:
+            return [value]
+        if processor is None:
+            # Dict input: hand yamlpath an in-memory round-trip of the content (no tempfile).
+            processor = Processor(_logger, _yaml_parser.load(yaml.dump(test_file_content)))
+        try:
+            return [NodeCoords.unwrap_node_coords(n) for n in processor.get_nodes(YAMLPath(path), mustexist=True)]
+        except UnmatchedYAMLPathException:
+            return None
+
+    for path, expected_value in present.items():
+        values = resolve(path)
+        if values is None:
+            raise AssertionError(f"YAMLPath {path!r} not found in {yaml_source}")
+        for actual_value in values:
+            assert str(actual_value) == str(expected_value), (  # noqa: S101  (assert is the helper's job)
+                f"{path}: expected {expected_value!r}, got {actual_value!r}"
+            )
+
+    for path in omitted:
+        if resolve(path) is not None:
+            raise AssertionError(f"YAMLPath {path!r} should be absent from {yaml_source} but exists")
 
+
+def _load_yaml_document(yaml_source: str) -> tuple[Any, Processor]:
+    """Parse `yaml_source` once per (path, mtime, size) and keep its `Processor` alongside."""
+    stat = os.stat(yaml_source)
+    key = (os.path.abspath(yaml_source), stat.st_mtime_ns, stat.st_size)
+    if key not in _yaml_documents:
         yaml_data, document_loaded = Parsers.get_yaml_data(_yaml_parser, _logger, yaml_source)
         if not document_loaded:
             raise AssertionError(f"Could not load YAML from {yaml_source}")
-        processor = Processor(_logger, yaml_data)
-
-        for path, expected_value in present.items():
-            try:
-                nodes = list(processor.get_nodes(YAMLPath(path), mustexist=True))
-            except UnmatchedYAMLPathException as e:
-                raise AssertionError(f"YAMLPath {path!r} not found in {yaml_source}: {e}") from None
-            for node_coord in nodes:
-                actual_value = NodeCoords.unwrap_node_coords(node_coord)
-                assert str(actual_value) == str(expected_value), (  # noqa: S101  (assert is the helper's job)
-                    f"{path}: expected {expected_value!r}, got {actual_value!r}"
-                )
-
-        for path in omitted:
-            try:
-                list(processor.get_nodes(YAMLPath(path), mustexist=True))
-            except UnmatchedYAMLPathException:
-                continue  # absent as required
-            raise AssertionError(f"YAMLPath {path!r} should be absent from {yaml_source} but exists")
-    finally:
-        if tmp_path is not None:
-            Path(tmp_path).unlink(missing_ok=True)
+        _yaml_documents[key] = (yaml_data, Processor(_logger, yaml_data))
+    return _yaml_documents[key]
+
+
+def _walk_plain_path(data: Any, path: str) -> Any:
+    """Resolve a plain dotted YAMLPath by walking mappings directly.
+
+    Returns the value, `_MISSING` when the path provably doesn't exist (missing string key,
+    or a scalar in the way — same as yamlpath), or `_FALLBACK` when yamlpath semantics are
+    needed (non-plain syntax, sequences, non-string keys).
+    """
+    if not _PLAIN_YAML_PATH.fullmatch(path):
+        return _FALLBACK
+    node = data
+    for segment in path.split("."):
+        if isinstance(node, Mapping):
+            if segment in node:
+                node = node[segment]
+            elif all(isinstance(k, str) for k in node):
+                return _MISSING
+            else:
+                return _FALLBACK
+        elif isinstance(node, list):
+            return _FALLBACK
+        else:
+            return _MISSING
+    return node
 
 
 ## ------------------------------------------------------------------------------------
@@ -181,19 +236,26 @@ def assert_text_delta(
       - `present` substrings must appear somewhere in the content.
       - `omitted` substrings must not appear.
 
+    All failures are reported together in one assertion; forbidden substrings include the
+    line they first appear on.
+
     Used for files where structural parsing isn't appropriate (`.sql`, `.sh`, `.conf`) or
     where the existing tests already use substring-based assertions (ansible playbooks).
     """
     test_file_path, test_file_content = _resolve_inputs(test_file_path, test_file_content, "assert_text_delta")
     content = FileHelper.read_file(str(test_file_path)) if test_file_path is not None else test_file_content
 
-    present = present or set()
-    omitted = omitted or set()
-
-    for needle in present:
-        assert needle in content, f"Expected substring not found:\n  {needle!r}"  # noqa: S101  (assert is the helper's job)
-    for needle in omitted:
-        assert needle not in content, f"Substring should be absent but was found:\n  {needle!r}"  # noqa: S101
+    # Collect every failure before asserting so one run reports them all. `str.find` stays
+    # per needle: CPython's substring search beats a single-pass multi-pattern automaton
+    # (pure-Python or regex) on rendered-file sizes, so one pass isn't a win here.
+    failures = [
+        f"Expected substring not found:\n  {needle!r}" for needle in sorted(present or ()) if needle not in content
+    ]
+    forbidden = sorted((offset, needle) for needle in omitted or () if (offset := content.find(needle)) != -1)
+    for offset, needle in forbidden:
+        line = content.count("\n", 0, offset) + 1
+        failures.append(f"Substring should be absent but was found (line {line}):\n  {needle!r}")
+    assert not failures, "\n".join(failures)  # noqa: S101  (assert is the helper's job)
 
 
 ## ------------------------------------------------------------------------------------
@@ -264,33 +326,133 @@ def assert_all_deltas(generated_test_files: dict, expected: dict) -> None:
 ## ------------------------------------------------------------------------------------
 ## Composition helper
 ## ------------------------------------------------------------------------------------
-def _is_dotted_prefix(prefix: str, full: str) -> bool:
-    """True if `prefix` equals `full`, or is a dotted-path ancestor of `full`.
+# Merging runs at the top of every test, over a delta catalogue that keeps growing. Each
+# constant is compiled once (paths pre-split, ancestors pre-computed), conflict resolution
+# walks a dotted-path trie instead of comparing every present key against every omitted
+# key, and merged results are memoised on the identities of the input constants.
+# Constants are treated as immutable once passed to `merge_deltas`.
+_MEMO_SIZE = 512
+_compiled_deltas: OrderedDict[tuple[int], tuple[tuple[dict], dict]] = OrderedDict()
+_merged_deltas: OrderedDict[tuple[int, ...], tuple[tuple[dict, ...], dict]] = OrderedDict()
 
-    Used to handle YAMLPath transitions: adding `services.wave-lite.image` to `present`
-    should clear `services.wave-lite` from `omitted` (the parent path can't be both
-    absent and have children present). For flat kv keys (no dots), this degenerates
-    to exact-equality, so kv deltas behave identically.
-    """
-    if prefix == full:
-        return True
-    pseg = prefix.split(".")
-    fseg = full.split(".")
-    return len(pseg) < len(fseg) and fseg[: len(pseg)] == pseg
 
+def _memo_get(memo: OrderedDict, inputs: tuple):
+    """LRU lookup keyed on input identities (the memo holds its inputs, so ids can't be recycled)."""
+    hit = memo.get(tuple(map(id, inputs)))
+    if hit is None or not all(a is b for a, b in zip(hit[0], inputs, strict=True)):
+        return None
+    memo.move_to_end(tuple(map(id, inputs)))
+    return hit[1]
 
-def _apply_present_to_dict_slot(slot: dict, present_in: dict) -> None:
-    """Add `present_in` keys to the slot's `present` dict, clearing prefix matches from `omitted`."""
-    for pkey in present_in:
-        slot["omitted"] -= {okey for okey in slot["omitted"] if _is_dotted_prefix(okey, pkey)}
-    slot["present"].update(present_in)
 
+def _memo_put(memo: OrderedDict, inputs: tuple, value) -> None:
+    memo[tuple(map(id, inputs))] = (inputs, value)
+    if len(memo) > _MEMO_SIZE:
+        memo.popitem(last=False)
 
-def _apply_omitted_to_dict_slot(slot: dict, omitted_in: set) -> None:
-    """Add `omitted_in` to the slot's `omitted` set, clearing prefix matches from `present` dict."""
-    for okey in omitted_in:
-        slot["present"] = {pkey: v for pkey, v in slot["present"].items() if not _is_dotted_prefix(okey, pkey)}
-    slot["omitted"] |= omitted_in
+
+class _CompiledPart(NamedTuple):
+    """One template's delta, pre-processed for merging.
+
+    Dict-shaped parts keep `(key, segments, ancestors_and_self, value)` per present key and
+    `(key, segments)` per omitted key; text parts keep plain frozensets.
+    """
+
+    is_text: bool
+    present: tuple | frozenset
+    omitted: tuple | frozenset
+
+
+def _compile_delta(delta: dict[str, dict]) -> dict[str, _CompiledPart]:
+    compiled = _memo_get(_compiled_deltas, (delta,))
+    if compiled is not None:
+        return compiled
+    compiled = {}
+    for template, parts in delta.items():
+        present_in = parts.get("present")
+        omitted_in = parts.get("omitted") or set()
+        if isinstance(present_in, set):
+            compiled[template] = _CompiledPart(True, frozenset(present_in), frozenset(omitted_in))
+            continue
+        present = []
+        for key, value in (present_in or {}).items():
+            segments = tuple(key.split("."))
+            ancestors = tuple(".".join(segments[: i + 1]) for i in range(len(segments)))
+            present.append((key, segments, ancestors, value))
+        omitted = tuple((key, tuple(key.split("."))) for key in omitted_in)
+        compiled[template] = _CompiledPart(False, tuple(present), omitted)
+    _memo_put(_compiled_deltas, (delta,), compiled)
+    return compiled
+
+
+class _PathTrie:
+    """Dotted-path trie over the keys of a merged `present` dict."""
+
+    __slots__ = ("children", "key")
+
+    def __init__(self):
+        self.children: dict[str, _PathTrie] = {}
+        self.key: str | None = None  # full key when a present entry ends here
+
+    def add(self, segments: tuple[str, ...], key: str) -> None:
+        node = self
+        for segment in segments:
+            node = node.children.setdefault(segment, _PathTrie())
+        node.key = key
+
+    def pop_subtree(self, segments: tuple[str, ...]) -> list[str]:
+        """Detach the node at `segments` and return every key at or below it."""
+        parent = self
+        for segment in segments[:-1]:
+            parent = parent.children.get(segment)
+            if parent is None:
+                return []
+        node = parent.children.pop(segments[-1], None)
+        keys, stack = [], [node] if node else []
+        while stack:
+            current = stack.pop()
+            if current.key is not None:
+                keys.append(current.key)
+            stack.extend(current.children.values())
+        return keys
+
+
+class _MergeSlot:
+    """Mutable merge state for one template."""
+
+    __slots__ = ("is_text", "omitted", "present", "trie")
+
+    def __init__(self, part: _CompiledPart):
+        # First occurrence is copied as-is (no conflict resolution within a single delta).
+        self.is_text = part.is_text
+        if part.is_text:
+            self.present = set(part.present)
+            self.omitted = set(part.omitted)
+            return
+        self.present = {key: value for key, _, _, value in part.present}
+        self.omitted = {key for key, _ in part.omitted}
+        self.trie = _PathTrie()
+        for key, segments, _, _ in part.present:
+            self.trie.add(segments, key)
+
+    def apply(self, part: _CompiledPart) -> None:
+        """Overlay a later delta: its `present` wins over our `omitted`, then its `omitted` over our `present`."""
+        if self.is_text:
+            self.present |= part.present
+            self.omitted -= part.present
+            self.present -= part.omitted
+            self.omitted |= part.omitted
+            return
+        for key, segments, ancestors, value in part.present:
+            # The new key and its YAMLPath ancestors can no longer be absent.
+            self.omitted.difference_update(ancestors)
+            self.present[key] = value
+            self.trie.add(segments, key)
+        for key, segments in part.omitted:
+            # The omitted path and everything under it can no longer be present.
+            for removed in self.trie.pop_subtree(segments):
+                del self.present[removed]
+            self.omitted.add(key)
 
 
 def merge_deltas(*deltas: dict[str, dict]) -> dict[str, dict]:
@@ -311,34 +473,37 @@ def merge_deltas(*deltas: dict[str, dict]) -> dict[str, dict]:
     declares `services.wave-lite.labels.seqera` in `present` — the parent must be cleared
     from `omitted` to avoid contradictory assertions.
 
+    Inputs are compiled once and the merge is memoised on their identities, so repeated
+    calls with the same constants cost a copy. Every call returns fresh dicts/sets the
+    caller may mutate; the constants themselves must not be mutated after first use.
+
     Example:
         merge_deltas(BASELINE_ASSERTIONS, WAVE_SEQERA_HOSTED_ACTIVE_ASSERTIONS) → a single
         nested dict whose `tower_env` entry contains both inputs' `present` keys (Wave's
         wins on collision) + the union of their `omitted` keys (with conflicts resolved).
     """
-    out: dict[str, dict] = {}
-    for delta in deltas:
-        for template, parts in delta.items():
-            present_in = parts.get("present")
-            omitted_in = parts.get("omitted") or set()
-            if template not in out:
-                if isinstance(present_in, set):
-                    out[template] = {"present": set(present_in), "omitted": set(omitted_in)}
-                else:
-                    out[template] = {"present": dict(present_in or {}), "omitted": set(omitted_in)}
-                continue
-
-            slot = out[template]
-            if present_in:
-                if isinstance(slot["present"], dict):
-                    _apply_present_to_dict_slot(slot, present_in)
-                else:
-                    slot["present"] |= present_in
-                    slot["omitted"] -= present_in
-            if omitted_in:
-                if isinstance(slot["present"], dict):
-                    _apply_omitted_to_dict_slot(slot, omitted_in)
+    merged = _memo_get(_merged_deltas, deltas)
+    if merged is None:
+        slots: dict[str, _MergeSlot] = {}
+        for delta in deltas:
+            for template, part in _compile_delta(delta).items():
+                if template in slots:
+                    slots[template].apply(part)
                 else:
-                    slot["present"] -= omitted_in
-                    slot["omitted"] |= omitted_in
-    return out
+                    slots[template] = _MergeSlot(part)
+        merged = {
+            template: (
+                frozenset(slot.present) if slot.is_text else tuple(slot.present.items()),
+                frozenset(slot.omitted),
+            )
+            for template, slot in slots.items()
+        }
+        _memo_put(_merged_deltas, deltas, merged)
+
+    return {
+        template: {
+            "present": set(present) if isinstance(present, frozenset) else dict(present),
+            "omitted": set(omitted),
+        }
+        for template, (present, omitted) in merged.items()
+    }
@@ -0,0 +1,107 @@
+"""Content-addressed blob store backing the scenario cache.
+
+Most scenarios render byte-identical files for most templates (`tower_sql`, `docker_logging`,
+`private_ca_conf`, ...), so storing a full copy per scenario directory scales disk and
+write I/O with scenario count for no benefit. Instead:
+
+  tests/.scenario_cache/
+    blobs/<aa>/<sha256><ext>      ← one file per unique rendered content
+    <cache_key>/manifest.json     ← {templates: {key: {blob, extension, inputs}}, files: {...}}
+    <cache_key>/locals.json       ← per-scenario, small, kept as plain files
+    <cache_key>/outputs.json
+
+Blob filenames keep the template's extension so consumers that hand `filepath` to tools
+sniffing by suffix (docker volume mounts, yamlpath) keep working. Blobs are immutable once
+written and shared across scenarios — treat every `filepath` resolved through a manifest
+as read-only.
+
+All writes go via tempfile + `os.replace`, so concurrent precompute workers racing on the
+same blob (or a crash mid-write) never leave a truncated file behind. The manifest is
+written last; its presence is what marks a scenario directory as complete.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from tests.utils.config import FP
+
+MANIFEST_FILENAME = "manifest.json"
+BLOB_DIRNAME = "blobs"
+
+
+## ------------------------------------------------------------------------------------
+## Atomic writes
+## ------------------------------------------------------------------------------------
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write `data` to `path` via a sibling tempfile + `os.replace`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+## ------------------------------------------------------------------------------------
+## Blobs
+## ------------------------------------------------------------------------------------
+def blob_path(digest: str, extension: str) -> Path:
+    """On-disk location of a blob. Two-char fan-out keeps directory listings short."""
+    return Path(FP.CACHE_BLOB_DIR) / digest[:2] / f"{digest}{extension}"
+
+
+def put_blob(content: str | bytes, extension: str) -> str:
+    """Store `content` (if not already present) and return its SHA-256 digest."""
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(digest, extension)
+    try:
+        os.utime(path)  # reused: refresh mtime so `housekeeping` treats it as recently written
+    except FileNotFoundError:
+        _atomic_write(path, data)
+    return digest
+
+
+def put_blob_file(source: Path, extension: str) -> str:
+    """Store a file already rendered on disk (e.g. by `sedalternative.py`) and return its digest."""
+    return put_blob(Path(source).read_bytes(), extension)
+
+
+## ------------------------------------------------------------------------------------
+## Manifests
+## ------------------------------------------------------------------------------------
+def write_manifest(cache_dir: Path, manifest: dict) -> None:
+    """Atomically write the scenario's manifest.
+
+    Shape: `{"templates": {key: {blob, extension, inputs}}, "files": {name: inputs}}` —
+    `inputs` is the per-part freshness key from `hash_template_inputs`.
+    """
+    _atomic_write(Path(cache_dir) / MANIFEST_FILENAME, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+
+
+def read_manifest(cache_dir: Path) -> dict[str, dict] | None:
+    """Return the scenario's manifest, or `None` if it hasn't been (fully) written."""
+    path = Path(cache_dir) / MANIFEST_FILENAME
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def resolve_entry(entry: dict) -> Path:
+    """Blob path for a single manifest entry."""
+    return blob_path(entry["blob"], entry["extension"])
+
+
+def iter_scenario_dirs(cache_root: Path | None = None) -> list[Path]:
+    """Per-scenario directories under the cache root (i.e. everything except the blob store)."""
+    root = Path(cache_root or FP.CACHE_SCENARIO_DIR)
+    if not root.exists():
+        return []
+    return sorted(d for d in root.iterdir() if d.is_dir() and d.name != BLOB_DIRNAME)
@@ -0,0 +1,253 @@
+"""Portable scenario-cache bundles, so CI runners can share one warm `.scenario_cache`.
+
+One archive per static-disk-state hash (`_compute_static_hash_part`), since only entries
+built from the same tfvars + `000_main.tf` can ever be hit:
+
+  <artifact_dir>/scenario-cache-<static[:16]>.tar.gz
+    bundle.json                     ← {static, entries: {key: {name: sha256}}, blobs: {path: sha256}}
+    scenarios/<cache_key>/<name>    ← manifest.json, locals.json, outputs.json
+    blobs/<aa>/<sha256><ext>        ← every blob those manifests reference
+
+`bundle.json` is the archive's first member and the only thing trusted up front. On import
+every other member is checked against it (and each blob against its own digest) before it
+touches the cache; members it doesn't list are never read, so a crafted archive can't write
+outside the cache. Only scenarios missing locally are imported, blobs first and manifest last
+— the same "manifest marks it complete" rule precompute follows — so a rejected or
+half-read entry is simply absent and gets recomputed.
+
+    python -m tests.utils.cache.bundle export <artifact_dir> [--static HASH]
+    python -m tests.utils.cache.bundle import <artifact_dir> [--static HASH]
+
+With `SCENARIO_CACHE_ARTIFACT_DIR` set, `session_setup` imports the current static hash's
+bundle before precompute and re-exports it whenever precompute rendered anything.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import tarfile
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tests.utils.cache.blobstore import (
+    BLOB_DIRNAME,
+    MANIFEST_FILENAME,
+    _atomic_write,
+    iter_scenario_dirs,
+    read_manifest,
+    resolve_entry,
+)
+from tests.utils.config import FP
+
+ARTIFACT_DIR_ENV = "SCENARIO_CACHE_ARTIFACT_DIR"
+INDEX_MEMBER = "bundle.json"
+BUNDLE_FORMAT = 1
+
+_CACHE_KEY = re.compile(r"^[0-9a-f]{16}$")
+_FILE_NAME = re.compile(r"^(?!\.\.?$)[A-Za-z0-9_.-]+$")
+_BLOB_PATH = re.compile(r"^([0-9a-f]{2})/(\1[0-9a-f]{62})(\.[A-Za-z0-9_.-]+)?$")
+
+
+@dataclass
+class ImportReport:
+    imported: list[str] = field(default_factory=list)
+    already_present: int = 0
+    rejected: dict[str, str] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        line = f"Scenario bundle: imported {len(self.imported)} scenarios, {self.already_present} already present"
+        if self.rejected:
+            line += f", rejected {len(self.rejected)}: " + "; ".join(f"{k}: {v}" for k, v in self.rejected.items())
+        return line + "."
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def bundle_path(artifact_dir: str | Path, static_hash: str) -> Path:
+    return Path(artifact_dir) / f"scenario-cache-{static_hash[:16]}.tar.gz"
+
+
+## ------------------------------------------------------------------------------------
+## Export
+## ------------------------------------------------------------------------------------
+def _add_member(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mode = 0o644
+    tar.addfile(info, io.BytesIO(data))
+
+
+def export_bundle(artifact_dir: str | Path, static_hash: str) -> Path | None:
+    """Pack every complete scenario recorded under `static_hash` into one archive.
+
+    Returns the archive path, or `None` when the cache holds no such scenario. Scenarios
+    whose blobs have gone missing are left out rather than exported half-complete.
+    """
+    entries: dict[str, dict[str, bytes]] = {}
+    blobs: dict[str, Path] = {}
+    for cache_dir in iter_scenario_dirs():
+        manifest = read_manifest(cache_dir)
+        if not manifest or manifest.get("static") != static_hash or not _CACHE_KEY.match(cache_dir.name):
+            continue
+        refs = {resolve_entry(entry) for entry in manifest.get("templates", {}).values()}
+        names = [MANIFEST_FILENAME, *manifest.get("files", {})]
+        try:
+            files = {name: (cache_dir / name).read_bytes() for name in names}
+        except OSError:
+            continue
+        if not all(ref.is_file() for ref in refs):
+            continue
+        entries[cache_dir.name] = files
+        blobs.update({ref.relative_to(FP.CACHE_BLOB_DIR).as_posix(): ref for ref in refs})
+    if not entries:
+        return None
+
+    blob_data = {rel: path.read_bytes() for rel, path in sorted(blobs.items())}
+    index = {
+        "format": BUNDLE_FORMAT,
+        "static": static_hash,
+        "entries": {key: {name: _sha256(data) for name, data in files.items()} for key, files in entries.items()},
+        "blobs": {rel: _sha256(data) for rel, data in blob_data.items()},
+    }
+
+    target = bundle_path(artifact_dir, static_hash)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, tarfile.open(fileobj=raw, mode="w:gz") as tar:
+            _add_member(tar, INDEX_MEMBER, json.dumps(index, indent=2, sort_keys=True).encode("utf-8"))
+            for key, files in sorted(entries.items()):
+                for name, data in sorted(files.items()):
+                    _add_member(tar, f"scenarios/{key}/{name}", data)
+            for rel, data in blob_data.items():
+                _add_member(tar, f"{BLOB_DIRNAME}/{rel}", data)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return target
+
+
+## ------------------------------------------------------------------------------------
+## Import
+## ------------------------------------------------------------------------------------
+def _validated_index(index: dict, static_hash: str | None) -> dict:
+    """Reject indexes that are for another static hash or name anything outside the cache layout."""
+    if index.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"unsupported bundle format {index.get('format')!r}")
+    if not isinstance(index.get("entries"), dict) or not isinstance(index.get("blobs"), dict):
+        raise ValueError("bundle index lists no entries/blobs")  # noqa: TRY004  (every bad index is a ValueError)
+    if static_hash is not None and index.get("static") != static_hash:
+        raise ValueError(f"bundle is for static hash {str(index.get('static'))[:16]}, not {static_hash[:16]}")
+    for key, files in index["entries"].items():
+        if not _CACHE_KEY.match(key) or MANIFEST_FILENAME not in files:
+            raise ValueError(f"malformed entry {key!r}")
+        if not all(_FILE_NAME.match(name) for name in files):
+            raise ValueError(f"malformed file name in entry {key}")
+    for rel, digest in index["blobs"].items():
+        match = _BLOB_PATH.match(rel)
+        if not match or match.group(2) != digest:
+            raise ValueError(f"malformed blob {rel!r}")
+    return index
+
+
+def import_bundle(archive: str | Path, static_hash: str | None = None) -> ImportReport:
+    """Unpack the scenarios from `archive` that are missing locally, verifying every byte first.
+
+    `static_hash`, when given, must match the bundle's. Mismatches and malformed indexes
+    raise `ValueError` before anything is written; individual entries that fail their
+    checksums are skipped and listed in `ImportReport.rejected`.
+    """
+    report = ImportReport()
+    with tarfile.open(archive, mode="r|gz") as tar:
+        first = tar.next()
+        if first is None or first.name != INDEX_MEMBER:
+            raise ValueError(f"{archive}: first member must be {INDEX_MEMBER}")
+        index = _validated_index(json.loads(tar.extractfile(first).read()), static_hash)
+
+        wanted = {}
+        for key, files in index["entries"].items():
+            if read_manifest(Path(FP.CACHE_SCENARIO_DIR) / key) is not None:
+                report.already_present += 1
+            else:
+                wanted.update({f"scenarios/{key}/{name}": digest for name, digest in files.items()})
+        if not wanted:
+            return report
+
+        # Blobs are content-addressed, so verified ones can go straight into the store; the
+        # (small) scenario files are held until their whole entry has checked out.
+        verified: dict[str, bytes] = {}
+        for member in tar:
+            if not member.isfile():
+                continue
+            if member.name.startswith(f"{BLOB_DIRNAME}/"):
+                rel = member.name.removeprefix(f"{BLOB_DIRNAME}/")
+                target = Path(FP.CACHE_BLOB_DIR) / rel
+                if rel not in index["blobs"] or target.exists():
+                    continue
+                data = tar.extractfile(member).read()
+                if _sha256(data) == index["blobs"][rel]:
+                    _atomic_write(target, data)
+            elif member.name in wanted:
+                data = tar.extractfile(member).read()
+                if _sha256(data) == wanted[member.name]:
+                    verified[member.name] = data
+
+    for key, files in index["entries"].items():
+        if f"scenarios/{key}/{MANIFEST_FILENAME}" not in wanted:
+            continue
+        bad = sorted(name for name in files if f"scenarios/{key}/{name}" not in verified)
+        if bad:
+            report.rejected[key] = f"checksum mismatch or missing: {', '.join(bad)}"
+            continue
+        manifest = json.loads(verified[f"scenarios/{key}/{MANIFEST_FILENAME}"])
+        missing = [e["blob"][:12] for e in manifest.get("templates", {}).values() if not resolve_entry(e).is_file()]
+        if missing:
+            report.rejected[key] = f"blobs failed verification: {', '.join(missing)}"
+            continue
+        cache_dir = Path(FP.CACHE_SCENARIO_DIR) / key
+        for name in sorted(files, key=lambda n: n == MANIFEST_FILENAME):  # manifest last
+            _atomic_write(cache_dir / name, verified[f"scenarios/{key}/{name}"])
+        report.imported.append(key)
+    return report
+
+
+## ------------------------------------------------------------------------------------
+## CLI
+## ------------------------------------------------------------------------------------
+def _recorded_static_hashes() -> set[str]:
+    return {m["static"] for d in iter_scenario_dirs() if (m := read_manifest(d)) and m.get("static")}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m tests.utils.cache.bundle", description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("artifact_dir")
+    parser.add_argument("--static", help="Static hash to export/accept (default: every one found).")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        for static_hash in sorted([args.static] if args.static else _recorded_static_hashes()):
+            path = export_bundle(args.artifact_dir, static_hash)
+            print(f"{static_hash[:16]}: {path or 'no cached scenarios'}")
+        return
+
+    # Cache keys fold in the static hash, so importing another hash's bundle is harmless —
+    # its entries are never looked up and `housekeeping` evicts them in time.
+    archives = (
+        [bundle_path(args.artifact_dir, args.static)]
+        if args.static
+        else sorted(Path(args.artifact_dir).glob("scenario-cache-*.tar.gz"))
+    )
+    for archive in archives:
+        print(f"{archive.name}: {import_bundle(archive, args.static).summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import functools
 import hashlib
-from pathlib import Path
+import os
 import re
 
 from tests.utils.config import FP
@@ -13,7 +13,7 @@ from tests.utils.filehandling.filehandling import FileHelper
 def hash_cache_key(tf_modifiers: str, qualifier: str = "") -> str:
     """Generate SHA-256 hash of override data and tfvars content for cache key.
 
-    Used by the plan-based path (`prepare_plan`, currently scoped to
+    Used by the plan-based path (`prepare_plan` / `prepare_plans`, currently scoped to
     `test_variable_validation.py`) for the per-scenario plan cache under
     `tests/.plan_cache/`. The templatefile-rendering path uses
     `hash_templatefile_cache_key` instead.
@@ -87,39 +87,67 @@ def hash_scenario(tf_modifiers: str) -> str:
 
 @functools.lru_cache(maxsize=1)
 def _compute_static_hash_part() -> str:
-    """Hash of disk-resident inputs that affect rendered templatefile content.
+    """Hash of disk-resident inputs shared by every rendered templatefile in a scenario.
 
     Folds in:
       - Project tfvars files (terraform.tfvars + base-overrides.auto.tfvars)
-      - The four secret JSON fixtures (tower / groundswell / seqerakit / wave_lite)
-      - Locals source (`000_main.tf`) and template source (`009_define_file_templates.tf`)
-      - Every `.tpl` file under `assets/src/`
+      - Locals source (`000_main.tf`)
+      - `PRECOMPUTE_CONSOLE_BIN`, when set: output from a replacement console (e.g. the
+        offline stand-in's placeholder templates) must never be served to a real-terraform run
 
-    Changing any of these invalidates every templatefile cache entry. Cached per-process
-    via lru_cache — these inputs are stable across a pytest session. Workers (separate
-    processes) compute this once each on first call.
+    Template-specific inputs (the template's 009 expression, its `.tpl`, the secrets it
+    references) are deliberately NOT folded in here — they're tracked per template by
+    `hash_template_inputs` and recorded in each scenario's manifest, so editing one `.tpl`
+    re-renders only that template instead of invalidating every scenario directory.
+
+    Cached per-process via lru_cache — these inputs are stable across a pytest session.
     """
     parts = [
         FileHelper.read_file(FP.TFVARS_BASE),
         FileHelper.read_file(FP.TFVARS_BASE_OVERRIDE_DST),
-        FileHelper.read_file(FP.TOWER_SECRETS),
-        FileHelper.read_file(FP.GROUNDSWELL_SECRETS),
-        FileHelper.read_file(FP.SEQERAKIT_SECRETS),
-        FileHelper.read_file(FP.WAVE_LITE_SECRETS),
         FileHelper.read_file(f"{FP.ROOT}/000_main.tf"),
-        FileHelper.read_file(f"{FP.ROOT}/009_define_file_templates.tf"),
     ]
-    parts.extend(tpl.read_text() for tpl in sorted(Path(f"{FP.ROOT}/assets/src").rglob("*.tpl")))
+    # Only when set, so keys rendered by real terraform are unchanged.
+    console_bin = os.environ.get("PRECOMPUTE_CONSOLE_BIN")
+    if console_bin:
+        parts.append(f"console:{console_bin}")
     return hashlib.sha256("".join(parts).encode("utf-8")).hexdigest()
 
 
 def hash_templatefile_cache_key(tf_modifiers: str) -> str:
-    """Disk-only cache key for rendered templatefiles. No terraform console required.
+    """Disk-only cache key for a scenario's directory. No terraform console required.
 
-    Combines the static-disk-state hash with the per-test tfvars modifiers. Both
+    Combines the shared static-disk-state hash with the per-test tfvars modifiers. Both
     precompute workers and runtime `generate_tc_files` compute this the same way →
     same cache directory under `tests/.scenario_cache/` → cross-test reuse works
-    whenever two tests' tfvars match byte-for-byte.
+    whenever two tests' tfvars match byte-for-byte. Freshness of the individual templates
+    inside that directory is tracked separately; see `hash_template_inputs`.
     """
     normalized = normalize_whitespace(tf_modifiers).strip()
     return hashlib.sha256((_compute_static_hash_part() + normalized).encode("utf-8")).hexdigest()[:16]
+
+
+_TEMPLATEFILE_PATH = re.compile(r'templatefile\(\s*"([^"]+)"')
+_SECRET_REF = re.compile(r'local\.(\w+)_secrets\["([^"]+)"\]')
+
+
+def hash_template_inputs(expression: str, secrets: dict[str, dict], extra_files: tuple[str, ...] = ()) -> str:
+    """Per-template freshness key: everything a single rendered template depends on beyond the scenario key.
+
+    Folds in:
+      - The template's raw expression from `009_define_file_templates.json` (which locals,
+        vars and module outputs it passes, and how)
+      - The content of every `.tpl` the expression loads via `templatefile("...")`
+      - The values of only the secrets the expression references (`local.<x>_secrets["NAME"]`)
+      - Any `extra_files` (used for templates rendered outside console, e.g. `wave_lite_rds`)
+
+    Values of the referenced locals/vars are already covered by the scenario key (tfvars +
+    `000_main.tf`), so they don't need to be folded in again here.
+    """
+    parts = [expression]
+    for tpl in sorted(set(_TEMPLATEFILE_PATH.findall(expression))):
+        parts.append(FileHelper.read_file(f"{FP.ROOT}/{tpl}"))
+    for category, name in sorted(set(_SECRET_REF.findall(expression))):
+        parts.append(f"{category}.{name}={secrets.get(category, {}).get(name)!r}")
+    parts.extend(FileHelper.read_file(path) for path in extra_files)
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:16]
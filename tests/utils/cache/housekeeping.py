@@ -0,0 +1,188 @@
+"""Size-bounded LRU garbage collection for the scenario cache.
+
+Every `.tpl` or tfvars change produces new `hash_templatefile_cache_key` directories, so
+`tests/.scenario_cache/` only ever grows. Instead of `make purge_cache` (which drops
+still-valid entries too), each scenario directory records when it was last used and
+`collect_garbage` — run at session end, or via `make prune_cached_scenarios` — evicts the
+least recently used directories beyond the budget, then deletes blobs no manifest
+references any more:
+
+  - `SCENARIO_CACHE_MAX_MB` (default 1024): total bytes, scenario dirs + blob store
+  - `SCENARIO_CACHE_MAX_ENTRIES` (default 500): scenario directories
+
+Anything used or written in the last `_GRACE_SECONDS` is never deleted, so a concurrent
+session's scenarios (and blobs written ahead of their manifest) survive another session's
+cleanup. Scenarios passed as `keep` (the current session's) are never evicted either.
+"""
+
+import argparse
+import os
+import shutil
+import stat
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tests.utils.cache.blobstore import iter_scenario_dirs, read_manifest, resolve_entry
+from tests.utils.config import FP
+
+LAST_USED_FILENAME = ".last_used"
+
+_DEFAULT_MAX_MB = 1024
+_DEFAULT_MAX_ENTRIES = 500
+_GRACE_SECONDS = 60 * 60
+
+
+@dataclass
+class GCReport:
+    evicted: list[str] = field(default_factory=list)
+    blobs_removed: int = 0
+    reclaimed_bytes: int = 0
+    remaining: int = 0
+    remaining_bytes: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"Scenario cache: evicted {len(self.evicted)} scenarios and {self.blobs_removed} blobs, "
+            f"reclaimed {self.reclaimed_bytes / 1024 / 1024:.1f} MB; "
+            f"{self.remaining} scenarios / {self.remaining_bytes / 1024 / 1024:.1f} MB remain."
+        )
+
+
+## ------------------------------------------------------------------------------------
+## Access tracking
+## ------------------------------------------------------------------------------------
+def touch_scenario(cache_dir: Path) -> None:
+    """Mark a scenario directory as used now."""
+    marker = Path(cache_dir) / LAST_USED_FILENAME
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+
+
+def last_used(cache_dir: Path) -> float:
+    """When the scenario was last used: its marker, else its manifest, else the directory itself."""
+    for path in (cache_dir / LAST_USED_FILENAME, cache_dir / "manifest.json", cache_dir):
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            continue
+    return 0.0
+
+
+## ------------------------------------------------------------------------------------
+## Collection
+## ------------------------------------------------------------------------------------
+def _file_stats(root: Path) -> dict[Path, os.stat_result]:
+    """Stat every file under `root`, skipping ones a concurrent session deletes mid-walk."""
+    stats = {}
+    try:
+        for path in root.rglob("*"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                stats[path] = st
+    except OSError:  # `root` itself evicted or purged under us
+        pass
+    return stats
+
+
+def _tree_size(path: Path) -> int:
+    return sum(st.st_size for st in _file_stats(path).values())
+
+
+def _referenced_blobs(cache_dir: Path) -> set[Path]:
+    manifest = read_manifest(cache_dir) or {}
+    return {resolve_entry(entry) for entry in manifest.get("templates", {}).values()}
+
+
+def _budget(env: str, default: float) -> float:
+    return float(os.environ.get(env, default))
+
+
+def collect_garbage(
+    max_bytes: int | None = None,
+    max_entries: int | None = None,
+    keep: set[str] | frozenset[str] = frozenset(),
+    now: float | None = None,
+) -> GCReport:
+    """Evict least-recently-used scenario dirs until the cache fits its budgets, then drop unreferenced blobs.
+
+    `keep` holds scenario directory names (cache keys) that must survive regardless of age.
+    Budgets default to `SCENARIO_CACHE_MAX_MB` / `SCENARIO_CACHE_MAX_ENTRIES`.
+    """
+    max_bytes = int(_budget("SCENARIO_CACHE_MAX_MB", _DEFAULT_MAX_MB) * 1024 * 1024) if max_bytes is None else max_bytes
+    max_entries = (
+        int(_budget("SCENARIO_CACHE_MAX_ENTRIES", _DEFAULT_MAX_ENTRIES)) if max_entries is None else max_entries
+    )
+    now = time.time() if now is None else now
+    report = GCReport()
+
+    scenarios = {d: (last_used(d), _tree_size(d), _referenced_blobs(d)) for d in iter_scenario_dirs()}
+    blob_root = Path(FP.CACHE_BLOB_DIR)
+    blob_stats = _file_stats(blob_root)
+    blob_sizes = {b: st.st_size for b, st in blob_stats.items()}
+    refcount: dict[Path, int] = {}
+    for _, _, blobs in scenarios.values():
+        for blob in blobs:
+            refcount[blob] = refcount.get(blob, 0) + 1
+
+    def collectable(blob: Path) -> bool:
+        # Fresh blobs may belong to a concurrent session's not-yet-written manifest.
+        return (
+            refcount.get(blob, 0) <= 0
+            and not blob.name.startswith(".")
+            and now - blob_stats[blob].st_mtime >= _GRACE_SECONDS
+        )
+
+    # Bytes the blob pass below will free, counted up front so eviction stops as soon as
+    # the cache fits: already-orphaned blobs, plus each blob whose last reference is evicted.
+    total = sum(size for _, size, _ in scenarios.values())
+    total += sum(size for blob, size in blob_sizes.items() if not collectable(blob))
+    count = len(scenarios)
+    for cache_dir in sorted(scenarios, key=lambda d: scenarios[d][0]):
+        if total <= max_bytes and count <= max_entries:
+            break
+        used_at, size, blobs = scenarios[cache_dir]
+        if cache_dir.name in keep or now - used_at < _GRACE_SECONDS:
+            continue
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        report.evicted.append(cache_dir.name)
+        report.reclaimed_bytes += size
+        total -= size
+        count -= 1
+        for blob in blobs:
+            refcount[blob] -= 1
+            if blob in blob_sizes and collectable(blob):
+                total -= blob_sizes[blob]
+
+    # Blobs nothing references any more: freed by the evictions above, or left behind when
+    # a template re-rendered under new inputs.
+    for blob, size in blob_sizes.items():
+        if not collectable(blob):
+            continue
+        try:
+            blob.unlink()
+        except OSError:
+            continue
+        report.blobs_removed += 1
+        report.reclaimed_bytes += size
+
+    report.remaining = count
+    report.remaining_bytes = total
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evict least-recently-used entries from tests/.scenario_cache.")
+    parser.add_argument("--max-mb", type=float, help="size budget in MB (default: $SCENARIO_CACHE_MAX_MB or 1024)")
+    parser.add_argument("--max-entries", type=int, help="scenario budget (default: $SCENARIO_CACHE_MAX_ENTRIES or 500)")
+    args = parser.parse_args()
+
+    max_bytes = None if args.max_mb is None else int(args.max_mb * 1024 * 1024)
+    print(collect_garbage(max_bytes=max_bytes, max_entries=args.max_entries).summary())
+
+
+if __name__ == "__main__":
+    main()
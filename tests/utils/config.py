@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+import os
 from pathlib import Path
 
 from tests.utils.filehandling.filehandling import FileHelper
@@ -7,15 +8,35 @@ from tests.utils.filehandling.filehandling import FileHelper
 ## ------------------------------------------------------------------------------------
 ## Universal Configuration
 ## ------------------------------------------------------------------------------------
+WORKSPACE_ENV = "CX_TEST_WORKSPACE"
+WORKSPACE_PARENT = "/tmp/cx-installer/workspaces"  # noqa: S108  (project-namespaced, alongside the hcl2json binary)
+
+
+def _default_workspace() -> str:
+    """`CX_TEST_WORKSPACE` if set, else one directory per pytest process (session or xdist worker)."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    override = os.environ.get(WORKSPACE_ENV)
+    if override:
+        # xdist workers inherit the same env; keep them apart.
+        return str(Path(override).resolve() / worker) if worker else str(Path(override).resolve())
+    return f"{WORKSPACE_PARENT}/{worker or 'session'}-{os.getpid()}"
+
+
 @dataclass
 class FilePaths:
-    """Absolute paths to tfvars files, cache directories, plan artefacts, and secret JSON fixtures."""
+    """Absolute paths to tfvars files, cache directories, plan artefacts, and secret JSON fixtures.
+
+    Terraform never runs in `ROOT`. Each session builds an overlay of it at `WORKSPACE`
+    (see `tests/utils/terraform/workspace.py`), and every per-session file — tfvars, secret
+    fixtures, plan, state, 009/012 JSON, precompute profile — lives there. Caches stay under
+    `ROOT/tests/` and are shared.
+    """
 
     # NOTE: Assumes this file lives at 3rd layer of project (i.e. PROJECT_ROOT/tests/utils/config.py)
     ROOT: str = str(Path(__file__).parent.parent.parent.resolve())
+    WORKSPACE: str = ""
 
     TFVARS_BASE: str = ""
-    TFVARS_BACKUP: str = ""
     TFVARS_TEST_SRC: str = ""
     TFVARS_TEST_DST: str = ""
     TFVARS_BASE_OVERRIDE_SRC: str = ""
@@ -24,32 +45,41 @@ class FilePaths:
 
     CACHE_PLAN_DIR: str = ""
     CACHE_SCENARIO_DIR: str = ""
+    CACHE_BLOB_DIR: str = ""
     TFPLAN_FILE_LOCATION: str = ""
     TFPLAN_JSON_LOCATION: str = ""
+    PRECOMPUTE_PROFILE: str = ""
 
+    SECRETS_SRC_DIR: str = ""
     TOWER_SECRETS: str = ""
     GROUNDSWELL_SECRETS: str = ""
     SEQERAKIT_SECRETS: str = ""
     WAVE_LITE_SECRETS: str = ""
 
     def __post_init__(self):
-        self.TFVARS_BASE = f"{self.ROOT}/terraform.tfvars"
-        self.TFVARS_BACKUP = f"{self.ROOT}/terraform.tfvars.backup"
+        self.WORKSPACE = self.WORKSPACE or _default_workspace()
+
+        self.TFVARS_BASE = f"{self.WORKSPACE}/terraform.tfvars"
         self.TFVARS_TEST_SRC = f"{self.ROOT}/tests/datafiles/terraform.tfvars"
         self.TFVARS_TEST_DST = self.TFVARS_BASE
         self.TFVARS_BASE_OVERRIDE_SRC = f"{self.ROOT}/tests/datafiles/base-overrides.auto.tfvars"
-        self.TFVARS_BASE_OVERRIDE_DST = f"{self.ROOT}/base-overrides.auto.tfvars"
-        self.TFVARS_AUTO_OVERRIDE_DST = f"{self.ROOT}/override.auto.tfvars"
+        self.TFVARS_BASE_OVERRIDE_DST = f"{self.WORKSPACE}/base-overrides.auto.tfvars"
+        self.TFVARS_AUTO_OVERRIDE_DST = f"{self.WORKSPACE}/override.auto.tfvars"
 
         self.CACHE_PLAN_DIR = f"{self.ROOT}/tests/.plan_cache"
         self.CACHE_SCENARIO_DIR = f"{self.ROOT}/tests/.scenario_cache"
-        self.TFPLAN_FILE_LOCATION = f"{self.ROOT}/tfplan"
-        self.TFPLAN_JSON_LOCATION = f"{self.ROOT}/tfplan.json"
-
-        self.TOWER_SECRETS = f"{self.ROOT}/tests/datafiles/secrets/ssm_sensitive_values_tower_testing.json"
-        self.GROUNDSWELL_SECRETS = f"{self.ROOT}/tests/datafiles/secrets/ssm_sensitive_values_groundswell_testing.json"
-        self.SEQERAKIT_SECRETS = f"{self.ROOT}/tests/datafiles/secrets/ssm_sensitive_values_seqerakit_testing.json"
-        self.WAVE_LITE_SECRETS = f"{self.ROOT}/tests/datafiles/secrets/ssm_sensitive_values_wave_lite_testing.json"
+        self.CACHE_BLOB_DIR = f"{self.CACHE_SCENARIO_DIR}/blobs"
+        self.TFPLAN_FILE_LOCATION = f"{self.WORKSPACE}/tfplan"
+        self.TFPLAN_JSON_LOCATION = f"{self.WORKSPACE}/tfplan.json"
+        self.PRECOMPUTE_PROFILE = f"{self.WORKSPACE}/precompute_profile.jsonl"
+
+        # Generated into SECRETS_SRC_DIR by `make generate_test_data`, which deletes and rewrites
+        # them; each session reads its own copy (staged by `workspace.stage_secrets`).
+        self.SECRETS_SRC_DIR = f"{self.ROOT}/tests/datafiles/secrets"
+        self.TOWER_SECRETS = f"{self.WORKSPACE}/test-secrets/ssm_sensitive_values_tower_testing.json"
+        self.GROUNDSWELL_SECRETS = f"{self.WORKSPACE}/test-secrets/ssm_sensitive_values_groundswell_testing.json"
+        self.SEQERAKIT_SECRETS = f"{self.WORKSPACE}/test-secrets/ssm_sensitive_values_seqerakit_testing.json"
+        self.WAVE_LITE_SECRETS = f"{self.WORKSPACE}/test-secrets/ssm_sensitive_values_wave_lite_testing.json"
 
 
 FP = FilePaths()
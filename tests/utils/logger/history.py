@@ -0,0 +1,167 @@
+"""Cross-session duration history and p50 regression detection.
+
+The structured log records each test's duration, but nothing compares runs. This keeps a
+compact SQLite table of durations per session, next to the log:
+
+  tests/logs/duration_history.sqlite
+    samples(kind, name, session_id, recorded_at, duration)
+      kind = "test"      name = test path          fed by `PytestStructuredLogger.log_test_result`
+      kind = "scenario"  name = `hash_scenario`    fed by the precompute's per-run profiles
+
+Samples are buffered in memory and written in one transaction at session end (nothing is
+recorded for a session that never ends), and only the newest `PYTEST_DURATION_HISTORY_SESSIONS`
+sessions (default 50) are kept. Only passing tests and successful renders are recorded:
+a failure's duration says nothing about how long the work takes.
+
+`regressions` compares each name's median in one session (default: the newest) against a
+rolling baseline — the median of its per-session medians over the previous `window`
+sessions. `python tests/utils/logger/log_parser.py regressions` prints them.
+"""
+
+import contextlib
+import os
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+HISTORY_FILENAME = "duration_history.sqlite"
+DEFAULT_HISTORY = Path(__file__).parent.parent.parent / "logs" / HISTORY_FILENAME
+_DEFAULT_KEEP_SESSIONS = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_by_session ON samples (session_id);
+CREATE INDEX IF NOT EXISTS samples_by_time ON samples (recorded_at);
+"""
+
+
+@dataclass
+class Regression:
+    kind: str
+    name: str
+    current_p50: float
+    baseline_p50: float
+    baseline_runs: int
+
+    @property
+    def ratio(self) -> float:
+        return self.current_p50 / self.baseline_p50 if self.baseline_p50 else float("inf")
+
+
+class DurationHistory:
+    """Buffered writer / reader for the duration history of one logging session."""
+
+    def __init__(self, path: str | Path | None = None, session_id: str = ""):
+        self.path = Path(path or DEFAULT_HISTORY)
+        self.session_id = session_id
+        self._pending: list[tuple[str, str, float]] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def record(self, kind: str, name: str, duration: float) -> None:
+        """Buffer one sample; written by `flush`."""
+        self._pending.append((kind, name, duration))
+
+    def record_precompute(self, profiles: list[dict]) -> None:
+        """Buffer one `scenario` sample per scenario of every successful precompute run (see `profiling.py`)."""
+        for profile in profiles:
+            if profile["status"].startswith("miss-err"):
+                continue
+            # Batched scenarios share one console run; each is charged the run's total.
+            for scenario in profile["scenarios"]:
+                self.record("scenario", scenario, profile["total"])
+
+    def flush(self, keep_sessions: int | None = None) -> int:
+        """Write buffered samples in one transaction and prune old sessions. Returns samples written."""
+        if not self._pending:
+            return 0
+        if keep_sessions is None:
+            keep_sessions = int(os.environ.get("PYTEST_DURATION_HISTORY_SESSIONS", _DEFAULT_KEEP_SESSIONS))
+        now = time.time()
+        rows = [(kind, name, self.session_id, now, duration) for kind, name, duration in self._pending]
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute(
+                """DELETE FROM samples WHERE session_id NOT IN (
+                       SELECT session_id FROM samples GROUP BY session_id ORDER BY MAX(recorded_at) DESC LIMIT ?
+                   )""",
+                (keep_sessions,),
+            )
+        written, self._pending = len(self._pending), []
+        return written
+
+    def regressions(
+        self,
+        threshold: float = 0.5,
+        window: int = 10,
+        min_runs: int = 3,
+        min_delta: float = 0.05,
+        session_id: str | None = None,
+        kind: str | None = None,
+    ) -> list[Regression]:
+        """Names whose median in `session_id` (default: newest) exceeds the baseline by more than `threshold`.
+
+        `threshold=0.5` flags a p50 over 1.5x its baseline. Names with fewer than `min_runs`
+        baseline sessions, or slower by less than `min_delta` seconds, are never flagged.
+        Sorted worst ratio first.
+        """
+        if not self.path.exists():
+            return []
+        with contextlib.closing(self._connect()) as conn:
+            sessions = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT session_id FROM samples GROUP BY session_id ORDER BY MAX(recorded_at) DESC"
+                )
+            ]
+            if session_id is None and sessions:
+                session_id = sessions[0]
+            if session_id not in sessions:
+                return []
+            baseline_sessions = sessions[sessions.index(session_id) + 1 :][:window]
+            considered = [session_id, *baseline_sessions]
+            rows = conn.execute(
+                f"SELECT kind, name, session_id, duration FROM samples WHERE session_id IN ({','.join('?' * len(considered))})",  # noqa: S608  (placeholders only)
+                considered,
+            ).fetchall()
+
+        samples: dict[tuple[str, str], dict[str, list[float]]] = {}
+        for row_kind, name, row_session, duration in rows:
+            if kind is None or row_kind == kind:
+                samples.setdefault((row_kind, name), {}).setdefault(row_session, []).append(duration)
+
+        found = []
+        for (row_kind, name), by_session in samples.items():
+            current = by_session.pop(session_id, None)
+            if not current or len(by_session) < min_runs:
+                continue
+            current_p50 = statistics.median(current)
+            baseline_p50 = statistics.median(statistics.median(d) for d in by_session.values())
+            if current_p50 > baseline_p50 * (1 + threshold) and current_p50 - baseline_p50 >= min_delta:
+                found.append(Regression(row_kind, name, current_p50, baseline_p50, len(by_session)))
+        return sorted(found, key=lambda r: r.ratio, reverse=True)
+
+
+def format_regressions(regressions: list[Regression], threshold: float) -> str:
+    """Human-readable report for `log_parser.py regressions`."""
+    if not regressions:
+        return f"No p50 duration regressions beyond +{threshold:.0%}."
+    output = [f"Duration Regressions (p50 > baseline +{threshold:.0%})", "=" * 40, ""]
+    for r in regressions:
+        output.append(
+            f"[{r.kind:>8s}] {r.current_p50:7.3f}s vs {r.baseline_p50:7.3f}s ({r.ratio:4.1f}x, "
+            f"{r.baseline_runs} runs) {r.name}"
+        )
+    return "\n".join(output)
@@ -0,0 +1,170 @@
+"""Single-pass, bounded-memory aggregation of structured pytest log entries.
+
+`InsightsAggregator.add` consumes one entry at a time, so the same object can be fed from a
+file stream (`PytestLogFormatter.iter_log_entries`) or live, as `PytestStructuredLogger`
+emits entries from `pytest_runtest_logreport`. Everything the `format_*` renderers and
+`extract_key_insights` need is kept incrementally:
+
+  - first `session_end` summary
+  - duration count / sum / min / max, plus p50/p90/p99 from a `DurationSketch`
+  - the 10 slowest results (heap), per-marker total/passed/failed counts
+  - failures (optionally capped at `max_failures`), and every result only if `retain_results`
+"""
+
+import heapq
+import itertools
+import math
+from typing import Any
+
+
+class DurationSketch:
+    """Log-bucketed quantile sketch: any quantile within `relative_accuracy` of the true value.
+
+    Bucket `i` holds values in `(gamma**(i-1), gamma**i]`, so memory grows with the spread of
+    the durations (a few hundred buckets from microseconds to hours at 1%), not their count.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Estimated `q`-quantile (0 <= q <= 1); 0.0 when empty."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        seen = self.zeros
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket in relative terms, which bounds the error both ways.
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class InsightsAggregator:
+    """Streaming replacement for walking a materialised entry list once per report section."""
+
+    SLOWEST = 10
+    PERCENTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, retain_results: bool = False, max_failures: int | None = None):
+        self.retain_results = retain_results
+        self.max_failures = max_failures
+
+        self.entries_seen = 0
+        self.session_end: dict[str, Any] | None = None
+        self.results_count = 0
+        self.duration_total = 0.0
+        self.duration_min = math.inf
+        self.duration_max = -math.inf
+        self.sketch = DurationSketch()
+        self.failures: list[dict[str, Any]] = []
+        self.failures_total = 0
+        self.markers: dict[str, dict[str, int]] = {}
+        self.results: list[dict[str, Any]] = []
+        self._slowest: list[tuple[float, int, dict[str, Any]]] = []  # min-heap of the slowest results
+        self._seq = itertools.count()
+
+    def consume(self, entries) -> "InsightsAggregator":
+        for entry in entries:
+            self.add(entry)
+        return self
+
+    def add(self, entry: dict[str, Any]) -> None:
+        self.entries_seen += 1
+        event_type = entry.get("event_type")
+        if event_type == "session_end" and self.session_end is None:
+            self.session_end = {
+                "summary": entry.get("summary", {}),
+                "duration": entry.get("duration", 0.0),
+                "timestamp": entry.get("timestamp", ""),
+            }
+        elif event_type == "test_result":
+            self._add_result(entry)
+
+    def _add_result(self, entry: dict[str, Any]) -> None:
+        test_path = entry.get("test_path", "")
+        status = entry.get("status", "")
+        duration = entry.get("duration", 0.0)
+        markers = entry.get("metadata", {}).get("markers", [])
+
+        self.results_count += 1
+        self.duration_total += duration
+        self.duration_min = min(self.duration_min, duration)
+        self.duration_max = max(self.duration_max, duration)
+        self.sketch.add(duration)
+
+        # Ties keep log order (the earlier result ranks higher), like a stable sort would.
+        slow = (duration, -next(self._seq), {"test_path": test_path, "status": status, "duration": duration})
+        if len(self._slowest) < self.SLOWEST:
+            heapq.heappush(self._slowest, slow)
+        elif slow[:2] > self._slowest[0][:2]:
+            heapq.heapreplace(self._slowest, slow)
+
+        for marker in markers:
+            counts = self.markers.setdefault(marker, {"total": 0, "passed": 0, "failed": 0})
+            counts["total"] += 1
+            if status == "PASSED":
+                counts["passed"] += 1
+            elif status == "FAILED":
+                counts["failed"] += 1
+
+        failure_reason = entry.get("failure_reason", "") if status == "FAILED" else ""
+        if status == "FAILED":
+            self.failures_total += 1
+            if self.max_failures is None or len(self.failures) < self.max_failures:
+                self.failures.append(
+                    {"test_path": test_path, "duration": duration, "failure_reason": failure_reason[:500]}
+                )
+        if self.retain_results:
+            self.results.append(
+                {
+                    "test_path": test_path,
+                    "status": status,
+                    "duration": duration,
+                    "markers": markers,
+                    "failure_reason": failure_reason,
+                }
+            )
+
+    def slowest(self) -> list[dict[str, Any]]:
+        """Up to `SLOWEST` results, slowest first."""
+        return [item[2] for item in sorted(self._slowest, key=lambda item: item[:2], reverse=True)]
+
+    def percentiles(self) -> dict[str, float]:
+        return {f"p{round(q * 100)}": self.sketch.quantile(q) for q in self.PERCENTILES}
+
+    def insights(self) -> dict[str, Any]:
+        """Same shape as `PytestLogFormatter.extract_key_insights`, plus duration percentiles."""
+        insights: dict[str, Any] = {
+            "session_info": dict(self.session_end) if self.session_end else {},
+            "test_results": list(self.results),
+            "performance_metrics": {},
+            "failure_patterns": [
+                {"test_path": f["test_path"], "failure_reason": f["failure_reason"]} for f in self.failures
+            ],
+            "marker_usage": {marker: counts["total"] for marker, counts in self.markers.items()},
+        }
+        if self.results_count:
+            insights["performance_metrics"] = {
+                "avg_duration": self.duration_total / self.results_count,
+                "max_duration": self.duration_max,
+                "min_duration": self.duration_min,
+                "total_tests": self.results_count,
+                "percentiles": self.percentiles(),
+            }
+        return insights
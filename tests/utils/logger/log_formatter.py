@@ -1,10 +1,14 @@
 """Log formatting utilities for pytest structured logging."""
 
+from collections.abc import Iterable, Iterator
 import json
 from pathlib import Path
 import re
 from typing import Any
 
+from tests.utils.logger.insights import InsightsAggregator
+from tests.utils.logger.log_index import LogIndex, tail_entries
+
 
 class PytestLogFormatter:
     """Formatter for pytest structured logs with various output options."""
@@ -16,12 +20,25 @@ class PytestLogFormatter:
 
         self.log_file = Path(log_file)
 
-    def read_log_entries(self, max_entries: int | None = None) -> list[dict[str, Any]]:
-        """Read and parse JSON Lines from log file."""
-        entries = []
-
+    def read_log_entries(self, max_entries: int | None = None, session_id: str | None = None) -> list[dict[str, Any]]:
+        """Read and parse JSON Lines from log file.
+
+        `max_entries` keeps the most recent N entries, read backwards from the end of the log
+        (so the cost doesn't grow with log history). `session_id` returns one session's
+        entries via the sidecar offset index, including sessions in rotated segments. With
+        neither, the whole live segment is read. See `log_index.py`.
+        """
+        if session_id is not None:
+            entries = LogIndex(self.log_file).refresh().session_entries(session_id)
+            return entries[-max_entries:] if max_entries else entries
+        if max_entries:
+            return tail_entries(self.log_file, max_entries)
+        return list(self.iter_log_entries())
+
+    def iter_log_entries(self) -> Iterator[dict[str, Any]]:
+        """Yield the live segment's entries one at a time, without holding the log in memory."""
         if not self.log_file.exists():
-            return entries
+            return
 
         try:
             with open(self.log_file, encoding="utf-8") as f:
@@ -31,11 +48,7 @@ class PytestLogFormatter:
                         continue
 
                     try:
-                        entry = json.loads(line)
-                        entries.append(entry)
-
-                        if max_entries and len(entries) >= max_entries:
-                            break
+                        yield json.loads(line)
 
                     except json.JSONDecodeError as e:
                         print(f"Warning: Invalid JSON on line {line_num}: {e}")
@@ -46,19 +59,26 @@ class PytestLogFormatter:
         except Exception as e:
             print(f"Error reading log file: {e}")
 
-        return entries
+    def latest_session_id(self) -> str | None:
+        """`test_session_id` of the most recently logged entry."""
+        latest = tail_entries(self.log_file, 1)
+        return latest[0].get("test_session_id") if latest else None
 
-    def format_test_summary(self, entries: list[dict[str, Any]]) -> str:
+    @staticmethod
+    def aggregate(entries: Iterable[dict[str, Any]] | InsightsAggregator) -> InsightsAggregator:
+        """One pass over `entries` (a list, a stream, or an already-fed aggregator)."""
+        if isinstance(entries, InsightsAggregator):
+            return entries
+        return InsightsAggregator().consume(entries)
+
+    def format_test_summary(self, entries: Iterable[dict[str, Any]] | InsightsAggregator) -> str:
         """Format test summary in human-readable format."""
-        if not entries:
+        insights = self.aggregate(entries)
+        if not insights.entries_seen:
             return "No test entries found."
 
         # Find session summary
-        session_summary = None
-        for entry in entries:
-            if entry.get("event_type") == "session_end":
-                session_summary = entry.get("summary", {})
-                break
+        session_summary = insights.session_end["summary"] if insights.session_end else None
 
         if not session_summary:
             return "No session summary found."
@@ -71,11 +91,7 @@ class PytestLogFormatter:
         errors = session_summary.get("errors", 0)
 
         # Get session duration
-        duration = 0.0
-        for entry in entries:
-            if entry.get("event_type") == "session_end":
-                duration = entry.get("duration", 0.0)
-                break
+        duration = insights.session_end["duration"]
 
         success_rate = (passed / total * 100) if total > 0 else 0
 
@@ -93,21 +109,19 @@ Success Rate: {success_rate:.1f}% ({passed}/{total})
 """
         return summary.strip()
 
-    def format_failed_tests(self, entries: list[dict[str, Any]]) -> str:
+    def format_failed_tests(self, entries: Iterable[dict[str, Any]] | InsightsAggregator) -> str:
         """Format failed tests with failure reasons."""
-        failed_tests = [
-            entry for entry in entries if entry.get("event_type") == "test_result" and entry.get("status") == "FAILED"
-        ]
+        insights = self.aggregate(entries)
 
-        if not failed_tests:
+        if not insights.failures:
             return "No failed tests found."
 
         output = ["Failed Tests", "=" * 40, ""]
 
-        for i, test in enumerate(failed_tests, 1):
-            test_path = test.get("test_path", "Unknown")
-            duration = test.get("duration", 0.0)
-            failure_reason = test.get("failure_reason", "No failure reason provided")
+        for i, test in enumerate(insights.failures, 1):
+            test_path = test["test_path"] or "Unknown"
+            duration = test["duration"]
+            failure_reason = test["failure_reason"] or "No failure reason provided"
 
             output.extend(
                 [
@@ -118,48 +132,35 @@ Success Rate: {success_rate:.1f}% ({passed}/{total})
                 ]
             )
 
+        if insights.failures_total > len(insights.failures):
+            output.append(f"... and {insights.failures_total - len(insights.failures)} more failed tests")
+
         return "\n".join(output)
 
-    def format_test_performance(self, entries: list[dict[str, Any]]) -> str:
+    def format_test_performance(self, entries: Iterable[dict[str, Any]] | InsightsAggregator) -> str:
         """Format test performance statistics."""
-        test_results = [entry for entry in entries if entry.get("event_type") == "test_result"]
+        insights = self.aggregate(entries)
 
-        if not test_results:
+        if not insights.results_count:
             return "No test results found."
 
-        # Sort by duration (slowest first)
-        test_results.sort(key=lambda x: x.get("duration", 0), reverse=True)
-
         output = ["Test Performance (Slowest First)", "=" * 40, ""]
 
-        for i, test in enumerate(test_results[:10], 1):  # Top 10 slowest
-            test_path = test.get("test_path", "Unknown")
-            duration = test.get("duration", 0.0)
-            status = test.get("status", "UNKNOWN")
+        for i, test in enumerate(insights.slowest(), 1):  # Top 10 slowest
+            test_path = test["test_path"] or "Unknown"
+            duration = test["duration"]
+            status = test["status"] or "UNKNOWN"
 
             output.append(f"{i:2d}. {duration:6.3f}s [{status:>6s}] {test_path}")
 
-        if len(test_results) > 10:
-            output.append(f"\n... and {len(test_results) - 10} more tests")
+        if insights.results_count > 10:
+            output.append(f"\n... and {insights.results_count - 10} more tests")
 
         return "\n".join(output)
 
-    def format_marker_summary(self, entries: list[dict[str, Any]]) -> str:
+    def format_marker_summary(self, entries: Iterable[dict[str, Any]] | InsightsAggregator) -> str:
         """Format summary of test markers usage."""
-        marker_counts = {}
-
-        for entry in entries:
-            if entry.get("event_type") == "test_result":
-                markers = entry.get("metadata", {}).get("markers", [])
-                for marker in markers:
-                    if marker not in marker_counts:
-                        marker_counts[marker] = {"total": 0, "passed": 0, "failed": 0}
-
-                    marker_counts[marker]["total"] += 1
-                    if entry.get("status") == "PASSED":
-                        marker_counts[marker]["passed"] += 1
-                    elif entry.get("status") == "FAILED":
-                        marker_counts[marker]["failed"] += 1
+        marker_counts = self.aggregate(entries).markers
 
         if not marker_counts:
             return "No markers found."
@@ -178,16 +179,17 @@ Success Rate: {success_rate:.1f}% ({passed}/{total})
 
         return "\n".join(output)
 
-    def format_human_readable(self, entries: list[dict[str, Any]]) -> str:
-        """Format complete human-readable report."""
+    def format_human_readable(self, entries: Iterable[dict[str, Any]] | InsightsAggregator) -> str:
+        """Format complete human-readable report (one pass over `entries` for all sections)."""
+        insights = self.aggregate(entries)
         sections = [
-            self.format_test_summary(entries),
+            self.format_test_summary(insights),
             "",
-            self.format_failed_tests(entries),
+            self.format_failed_tests(insights),
             "",
-            self.format_test_performance(entries),
+            self.format_test_performance(insights),
             "",
-            self.format_marker_summary(entries),
+            self.format_marker_summary(insights),
         ]
 
         return "\n".join(sections)
@@ -208,66 +210,6 @@ Success Rate: {success_rate:.1f}% ({passed}/{total})
 
         return text.strip()
 
-    def extract_key_insights(self, entries: list[dict[str, Any]]) -> dict[str, Any]:
-        """Extract key insights for LLM analysis."""
-        insights = {
-            "session_info": {},
-            "test_results": [],
-            "performance_metrics": {},
-            "failure_patterns": [],
-            "marker_usage": {},
-        }
-
-        # Extract session info
-        for entry in entries:
-            if entry.get("event_type") == "session_end":
-                insights["session_info"] = {
-                    "summary": entry.get("summary", {}),
-                    "duration": entry.get("duration", 0.0),
-                    "timestamp": entry.get("timestamp", ""),
-                }
-                break
-
-        # Extract test results
-        for entry in entries:
-            if entry.get("event_type") == "test_result":
-                insights["test_results"].append(
-                    {
-                        "test_path": entry.get("test_path", ""),
-                        "status": entry.get("status", ""),
-                        "duration": entry.get("duration", 0.0),
-                        "markers": entry.get("metadata", {}).get("markers", []),
-                        "failure_reason": entry.get("failure_reason", "") if entry.get("status") == "FAILED" else "",
-                    }
-                )
-
-        # Calculate performance metrics
-        if insights["test_results"]:
-            durations = [t["duration"] for t in insights["test_results"]]
-            insights["performance_metrics"] = {
-                "avg_duration": sum(durations) / len(durations),
-                "max_duration": max(durations),
-                "min_duration": min(durations),
-                "total_tests": len(insights["test_results"]),
-            }
-
-        # Extract failure patterns
-        failed_tests = [t for t in insights["test_results"] if t["status"] == "FAILED"]
-        insights["failure_patterns"] = [
-            {
-                "test_path": t["test_path"],
-                "failure_reason": t["failure_reason"][:500],  # Truncate for LLM
-            }
-            for t in failed_tests
-        ]
-
-        # Extract marker usage
-        marker_counts = {}
-        for test in insights["test_results"]:
-            for marker in test["markers"]:
-                if marker not in marker_counts:
-                    marker_counts[marker] = 0
-                marker_counts[marker] += 1
-        insights["marker_usage"] = marker_counts
-
-        return insights
+    def extract_key_insights(self, entries: Iterable[dict[str, Any]]) -> dict[str, Any]:
+        """Extract key insights for LLM analysis (single pass; see `insights.py`)."""
+        return InsightsAggregator(retain_results=True).consume(entries).insights()
@@ -0,0 +1,258 @@
+"""Byte-offset index, tail-first reads and rotation for the structured pytest log.
+
+`tests/logs/pytest_structured.log` is append-only, so reading it top-to-bottom makes every
+`log_parser.py` query slower the longer a checkout lives. Instead:
+
+  pytest_structured.log                      ← live segment, appended by `PytestStructuredLogger`
+  pytest_structured.log.index.json           ← {size, inode, sessions: {id: [[start, end], ...]}, segments}
+  pytest_structured.log.<stamp>.gz           ← rotated segments (whole sessions, gzipped)
+
+- `tail_entries` reads backwards from the end in blocks: the last N entries cost O(N).
+- `LogIndex.session_entries` seeks straight to one session's byte ranges. The index catches
+  up incrementally (only bytes appended since the last query are scanned) and re-scans from
+  scratch if the live file was replaced or truncated. It is a cache: deleting it is safe.
+- `rotate_log` — run whenever a logger opens the file — gzips the live segment once it
+  exceeds `PYTEST_LOG_ROTATE_MB` (default 64), keeps the newest `PYTEST_LOG_KEEP_SEGMENTS`
+  (default 10), and carries each segment's session ranges into the index.
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+INDEX_SUFFIX = ".index.json"
+_BLOCK_BYTES = 64 * 1024
+_DEFAULT_ROTATE_MB = 64
+_DEFAULT_KEEP_SEGMENTS = 10
+
+# `json.dumps` default separators; `test_session_id` is the second key of every entry, so
+# the head of the line is enough and multi-MB captured stdout is never parsed.
+_SESSION_ID = re.compile(rb'"test_session_id": "([^"]+)"')
+
+
+def _session_of(line: bytes) -> str | None:
+    match = _SESSION_ID.search(line, 0, 256)
+    return match.group(1).decode() if match else None
+
+
+def _parse(line: bytes) -> dict[str, Any] | None:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        print(f"Warning: Invalid JSON line skipped: {e}")
+        return None
+
+
+def rotated_segments(log_file: str | Path) -> list[Path]:
+    """Rotated, gzipped segments of `log_file`, oldest first."""
+    log_file = Path(log_file)
+    return sorted(log_file.parent.glob(f"{log_file.name}.*.gz"))
+
+
+## ------------------------------------------------------------------------------------
+## Tail-first reads
+## ------------------------------------------------------------------------------------
+def _reverse_lines(path: Path) -> Iterator[bytes]:
+    """Non-empty lines of `path`, last first, read in fixed-size blocks from the end."""
+    with open(path, "rb") as handle:
+        pos = handle.seek(0, os.SEEK_END)
+        if pos == 0:
+            return
+        handle.seek(pos - 1)
+        # A line still being appended by a running session has no newline yet; skip it.
+        skip_partial = handle.read(1) != b"\n"
+        carry = b""
+        while pos > 0:
+            step = min(_BLOCK_BYTES, pos)
+            pos -= step
+            handle.seek(pos)
+            lines = (handle.read(step) + carry).split(b"\n")
+            carry = lines.pop(0)  # may continue in the previous block
+            for line in reversed(lines):
+                if skip_partial:
+                    skip_partial = False
+                elif line.strip():
+                    yield line
+        if carry.strip() and not skip_partial:
+            yield carry
+
+
+def _reverse_segment_lines(segment: Path) -> Iterator[bytes]:
+    """Same as `_reverse_lines` for a gzipped segment (decompressed whole, only once reached)."""
+    for line in reversed(gzip.decompress(segment.read_bytes()).splitlines()):
+        if line.strip():
+            yield line
+
+
+def tail_entries(log_file: str | Path, count: int) -> list[dict[str, Any]]:
+    """The last `count` entries in chronological order, without reading the rest of the log.
+
+    Falls back to the newest rotated segments if the live segment holds fewer entries.
+    """
+    log_file = Path(log_file)
+    newest_first: list[dict[str, Any]] = []
+    sources: list[Iterator[bytes]] = [_reverse_lines(log_file)] if log_file.exists() else []
+    sources += [_reverse_segment_lines(seg) for seg in reversed(rotated_segments(log_file))]
+    for source in sources:
+        for line in source:
+            entry = _parse(line)
+            if entry is not None:
+                newest_first.append(entry)
+            if len(newest_first) >= count:
+                return newest_first[::-1]
+    return newest_first[::-1]
+
+
+## ------------------------------------------------------------------------------------
+## Session index
+## ------------------------------------------------------------------------------------
+def _scan(handle, start: int, sessions: dict[str, list[list[int]]]) -> int:
+    """Add the session ranges of every complete line from `start` on; return the end offset."""
+    handle.seek(start)
+    offset = start
+    for line in handle:
+        if not line.endswith(b"\n"):
+            break  # partial line; indexed once its writer finishes it
+        session_id = _session_of(line)
+        if session_id:
+            ranges = sessions.setdefault(session_id, [])
+            if ranges and ranges[-1][1] == offset:
+                ranges[-1][1] = offset + len(line)
+            else:
+                ranges.append([offset, offset + len(line)])
+        offset += len(line)
+    return offset
+
+
+class LogIndex:
+    """Sidecar index of where each `test_session_id` lives in the log and its rotated segments."""
+
+    def __init__(self, log_file: str | Path):
+        self.log_file = Path(log_file)
+        self.path = self.log_file.with_name(self.log_file.name + INDEX_SUFFIX)
+        try:
+            self.data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.data = {}
+        self.data.setdefault("segments", [])
+        self.data.setdefault("size", 0)
+        self.data.setdefault("inode", None)
+        self.data.setdefault("sessions", {})
+
+    def _save(self) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.data))
+        tmp.replace(self.path)
+
+    def refresh(self) -> "LogIndex":
+        """Index whatever was appended (or rotated) since the last refresh."""
+        changed = False
+        known = {segment["name"] for segment in self.data["segments"]}
+        on_disk = {seg.name for seg in rotated_segments(self.log_file)}
+        if known != on_disk:
+            segments = [s for s in self.data["segments"] if s["name"] in on_disk]
+            for name in sorted(on_disk - known):
+                sessions: dict[str, list[list[int]]] = {}
+                with gzip.open(self.log_file.parent / name, "rb") as handle:
+                    _scan(handle, 0, sessions)
+                segments.append({"name": name, "sessions": sessions})
+            self.data["segments"] = sorted(segments, key=lambda s: s["name"])
+            changed = True
+
+        try:
+            stat = self.log_file.stat()
+        except FileNotFoundError:
+            stat = None
+        if stat is None or stat.st_ino != self.data["inode"] or stat.st_size < self.data["size"]:
+            changed = changed or self.data["size"] > 0 or stat is not None
+            self.data.update(size=0, inode=stat.st_ino if stat else None, sessions={})
+        if stat is not None and stat.st_size > self.data["size"]:
+            with open(self.log_file, "rb") as handle:
+                self.data["size"] = _scan(handle, self.data["size"], self.data["sessions"])
+            changed = True
+        if changed:
+            self._save()
+        return self
+
+    def sessions(self) -> list[str]:
+        """Session ids, oldest first."""
+        ordered = [sid for segment in self.data["segments"] for sid in segment["sessions"]]
+        ordered += list(self.data["sessions"])
+        return list(dict.fromkeys(ordered))
+
+    def session_entries(self, session_id: str) -> list[dict[str, Any]]:
+        """Every entry of one session, read only from its indexed byte ranges."""
+        located = [
+            (self.log_file.parent / segment["name"], segment["sessions"][session_id])
+            for segment in self.data["segments"]
+            if session_id in segment["sessions"]
+        ]
+        if session_id in self.data["sessions"]:
+            located.append((self.log_file, self.data["sessions"][session_id]))
+
+        entries = []
+        for path, ranges in located:
+            with gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb") as handle:
+                for start, end in ranges:
+                    handle.seek(start)
+                    for line in handle.read(end - start).splitlines():
+                        entry = _parse(line)
+                        if entry is not None:
+                            entries.append(entry)
+        return entries
+
+
+## ------------------------------------------------------------------------------------
+## Rotation
+## ------------------------------------------------------------------------------------
+def rotate_log(log_file: str | Path, max_bytes: int | None = None, keep: int | None = None) -> Path | None:
+    """Gzip the live segment once it exceeds `max_bytes`; return the new segment, if any.
+
+    Only call while no logger is appending to `log_file` (a session start): a writer holding
+    the old file open would keep writing into the rotated-away copy.
+    """
+    log_file = Path(log_file)
+    if max_bytes is None:
+        max_bytes = int(float(os.environ.get("PYTEST_LOG_ROTATE_MB", _DEFAULT_ROTATE_MB)) * 1024 * 1024)
+    if keep is None:
+        keep = int(os.environ.get("PYTEST_LOG_KEEP_SEGMENTS", _DEFAULT_KEEP_SEGMENTS))
+    try:
+        if log_file.stat().st_size < max_bytes:
+            return None
+    except FileNotFoundError:
+        return None
+
+    stamp = datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%S%f")
+    segment = log_file.with_name(f"{log_file.name}.{stamp}.gz")
+    staged = log_file.with_name(f".{log_file.name}.{stamp}.rotating")
+    try:
+        os.replace(log_file, staged)  # appends from here on start a fresh live segment
+    except FileNotFoundError:
+        return None  # another session rotated it first
+
+    index = LogIndex(log_file)
+    sessions = index.data["sessions"] if index.data["inode"] == staged.stat().st_ino else {}
+    with open(staged, "rb") as src:
+        _scan(src, index.data["size"] if sessions else 0, sessions)
+        src.seek(0)
+        tmp = segment.with_name(f".{segment.name}.tmp")
+        with gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+    tmp.replace(segment)
+    staged.unlink()
+
+    for old in rotated_segments(log_file)[:-keep] if keep > 0 else []:
+        old.unlink(missing_ok=True)
+    retained = {seg.name for seg in rotated_segments(log_file)}
+    index.data["segments"] = [s for s in index.data["segments"] if s["name"] in retained]
+    if segment.name in retained:
+        index.data["segments"].append({"name": segment.name, "sessions": sessions})
+    index.data.update(size=0, inode=None, sessions={})
+    index._save()
+    return segment
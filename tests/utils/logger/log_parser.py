@@ -2,21 +2,37 @@
 """LLM-friendly log parsing utilities for pytest structured logs."""
 
 import argparse
+from collections.abc import Iterable
 import json
 import sys
 
+from tests.utils.logger.history import HISTORY_FILENAME, DurationHistory, format_regressions
+from tests.utils.logger.insights import InsightsAggregator
 from tests.utils.logger.log_formatter import PytestLogFormatter
 
 
 class PytestLogParser:
     """Parser for pytest structured logs with LLM-friendly output."""
 
-    def __init__(self, log_file: str | None = None):
+    def __init__(self, log_file: str | None = None, session_id: str | None = None):
         self.formatter = PytestLogFormatter(log_file)
+        # Restricts every command to one session ("latest" = the most recent one).
+        if session_id == "latest":
+            session_id = self.formatter.latest_session_id()
+        self.session_id = session_id
+
+    def _entries(self, recent: int | None = None) -> list[dict]:
+        return self.formatter.read_log_entries(max_entries=recent, session_id=self.session_id)
+
+    def _stream(self, recent: int | None = None) -> Iterable[dict]:
+        """Entries for single-pass consumers: the whole live log is streamed, never materialised."""
+        if recent or self.session_id is not None:
+            return self._entries(recent)
+        return self.formatter.iter_log_entries()
 
     def validate_log_format(self) -> bool:
         """Validate log file format and structure."""
-        entries = self.formatter.read_log_entries()
+        entries = self._entries()
 
         if not entries:
             print("❌ No log entries found")
@@ -60,12 +76,11 @@ class PytestLogParser:
 
     def summarize_tests(self, recent: int = 0) -> str:
         """Generate human-readable test summary."""
-        entries = self.formatter.read_log_entries(max_entries=recent)
-        return self.formatter.format_human_readable(entries)
+        return self.formatter.format_human_readable(self._stream(recent))
 
     def extract_failures(self, include_reasons: bool = True) -> str:
         """Extract failed tests for analysis."""
-        entries = self.formatter.read_log_entries()
+        entries = self._stream()
 
         if include_reasons:
             return self.formatter.format_failed_tests(entries)
@@ -79,8 +94,7 @@ class PytestLogParser:
 
     def llm_format(self, recent: int | None = None) -> str:
         """Format logs for LLM consumption."""
-        entries = self.formatter.read_log_entries(max_entries=recent)
-        insights = self.formatter.extract_key_insights(entries)
+        insights = InsightsAggregator().consume(self._stream(recent)).insights()
 
         # Format as structured text for LLM analysis
         output = []
@@ -102,6 +116,10 @@ class PytestLogParser:
             output.append(f"- Average test duration: {perf.get('avg_duration', 0.0):.3f}s")
             output.append(f"- Slowest test: {perf.get('max_duration', 0.0):.3f}s")
             output.append(f"- Fastest test: {perf.get('min_duration', 0.0):.3f}s")
+            if perf.get("percentiles"):
+                output.append(
+                    "- Duration percentiles: " + ", ".join(f"{k} {v:.3f}s" for k, v in perf["percentiles"].items())
+                )
             output.append("")
 
         # Failure analysis
@@ -126,13 +144,12 @@ class PytestLogParser:
 
     def export_json(self, recent: int | None = None) -> str:
         """Export log data as JSON for programmatic analysis."""
-        entries = self.formatter.read_log_entries(max_entries=recent)
-        insights = self.formatter.extract_key_insights(entries)
+        insights = self.formatter.extract_key_insights(self._stream(recent))
         return json.dumps(insights, indent=2)
 
     def llm_test(self) -> str:
         """Test log parsing with sample LLM-style queries."""
-        entries = self.formatter.read_log_entries()
+        entries = self._entries()
 
         if not entries:
             return "No log entries found for testing."
@@ -169,6 +186,14 @@ class PytestLogParser:
 
         return "\n".join(output)
 
+    def regressions(self, threshold: float = 0.5, window: int = 10, min_runs: int = 3, kind: str | None = None) -> str:
+        """p50 duration regressions of one session (default: newest) against the preceding sessions."""
+        history = DurationHistory(self.formatter.log_file.with_name(HISTORY_FILENAME))
+        found = history.regressions(
+            threshold=threshold, window=window, min_runs=min_runs, session_id=self.session_id, kind=kind
+        )
+        return format_regressions(found, threshold)
+
 
 def main():
     """Main CLI interface."""
@@ -176,7 +201,7 @@ def main():
 
     parser.add_argument(
         "command",
-        choices=["validate", "summarize", "extract-failures", "llm-format", "llm-test", "export-json"],
+        choices=["validate", "summarize", "extract-failures", "llm-format", "llm-test", "export-json", "regressions"],
         help="Command to execute",
     )
 
@@ -184,9 +209,19 @@ def main():
 
     parser.add_argument("--recent", type=int, help="Limit to N most recent entries")
 
+    parser.add_argument("--session", type=str, help="Only this test_session_id ('latest' for the most recent session)")
+
+    parser.add_argument("--threshold", type=float, default=0.5, help="regressions: flag p50 > baseline x (1 + N)")
+
+    parser.add_argument("--window", type=int, default=10, help="regressions: baseline sessions to compare against")
+
+    parser.add_argument("--min-runs", type=int, default=3, help="regressions: skip names with fewer baseline sessions")
+
+    parser.add_argument("--kind", choices=["test", "scenario"], help="regressions: only tests or only scenarios")
+
     args = parser.parse_args()
 
-    parser_instance = PytestLogParser(args.log_file)
+    parser_instance = PytestLogParser(args.log_file, session_id=args.session)
 
     try:
         if args.command == "validate":
@@ -208,6 +243,9 @@ def main():
         elif args.command == "export-json":
             print(parser_instance.export_json(args.recent))
 
+        elif args.command == "regressions":
+            print(parser_instance.regressions(args.threshold, args.window, args.min_runs, args.kind))
+
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -1,17 +1,23 @@
 """Pytest structured logging utilities for LLM-friendly test output capture."""
 
+import atexit
 from datetime import UTC, datetime
 from enum import Enum
 import json
 import logging
 import os
 from pathlib import Path
+import queue
 import sys
+import threading
 import time
 from typing import Any
 import uuid
 
 from tests.utils.config import FP
+from tests.utils.logger.history import HISTORY_FILENAME, DurationHistory
+from tests.utils.logger.insights import InsightsAggregator
+from tests.utils.logger.log_index import rotate_log
 
 
 class LogLevel(Enum):
@@ -24,16 +30,145 @@ class LogLevel(Enum):
     CRITICAL = logging.CRITICAL
 
 
+class BufferedJsonlWriter:
+    """Appends JSON-Lines entries to a file from a background thread, in batches.
+
+    Callers only enqueue the entry dict; `json.dumps` and the file I/O run on the writer
+    thread. A batch is written once `batch_size` entries are waiting or `flush_interval`
+    seconds after the first of them arrived, whichever comes first. The file is opened per
+    batch, so it can be rotated or removed underneath the writer.
+
+    The queue holds at most `max_queue` entries. When it is full, `overflow="block"` makes
+    the caller wait for the writer to catch up (no entry is lost); `overflow="drop"` discards
+    the entry and counts it in `dropped`, so a slow disk never stalls a test.
+    """
+
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_queue: int = 10_000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        overflow: str = "block",
+    ):
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"overflow must be 'block' or 'drop', not {overflow!r}")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"jsonl-writer-{self.path.name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, entry: dict[str, Any], force: bool = False) -> None:
+        """Enqueue `entry`. `force` blocks for room even under `overflow="drop"`."""
+        if self._closed:
+            self._write([json.dumps(entry, default=str)])
+            return
+        if force or self.overflow == "block":
+            self._queue.put(entry)
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._count_dropped(1)
+
+    def take_dropped(self) -> int:
+        """Entries dropped since the last call (and reset the count)."""
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    def flush(self) -> None:
+        """Block until every entry enqueued so far is on disk."""
+        if self._closed:
+            return
+        self._queue.put(self._FLUSH)
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write everything still queued and stop the thread. Idempotent; also runs at exit."""
+        if self._closed:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._closed = True
+        atexit.unregister(self.close)
+
+    def _count_dropped(self, count: int) -> None:
+        with self._dropped_lock:
+            self.dropped += count
+
+    def _write(self, lines: list[str]) -> None:
+        if not lines:
+            return
+        try:
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write("\n".join(lines) + "\n")
+        except OSError:
+            self._count_dropped(len(lines))
+
+    def _run(self) -> None:
+        lines: list[str] = []
+        taken = 0  # entries (and markers) got from the queue but not yet `task_done`
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+                taken += 1
+            except queue.Empty:
+                item = self._FLUSH
+
+            if item is not self._FLUSH and item is not self._STOP:
+                lines.append(json.dumps(item, default=str))
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(lines) < self.batch_size:
+                    continue
+
+            self._write(lines)
+            lines, deadline = [], None
+            for _ in range(taken):
+                self._queue.task_done()
+            taken = 0
+            if item is self._STOP:
+                return
+
+
 class PytestStructuredLogger:
-    """Centralized logger for pytest execution data in JSON Lines format."""
+    """Centralized logger for pytest execution data in JSON Lines format.
+
+    `insights` aggregates every emitted entry as it is logged, so session statistics are
+    available without re-reading the file. With `buffered=True` entries go through a `BufferedJsonlWriter` instead of being
+    serialised and written on the calling (test) thread; `flush()` / `close()` drain it,
+    and `log_session_end` flushes automatically. With `history=True` passing tests' durations
+    are also written to the cross-session `DurationHistory` at session end.
+    """
 
     def __init__(
         self,
         log_file: str = "",
         enabled: bool = True,
         log_level: LogLevel = LogLevel.INFO,
+        buffered: bool = False,
+        max_queue: int = 10_000,
+        overflow: str = "block",
+        history: bool = False,
     ):
         self.enabled = enabled
+        self._writer: BufferedJsonlWriter | None = None
+        self.history: DurationHistory | None = None
+        # Live, bounded-memory aggregate of everything this logger emits (see `insights.py`).
+        self.insights = InsightsAggregator(max_failures=50)
         if not self.enabled:
             return
 
@@ -44,10 +179,14 @@ class PytestStructuredLogger:
 
         self.log_file = Path(log_file)
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        # Before this session writes anything: gzip the log away once it outgrows PYTEST_LOG_ROTATE_MB.
+        rotate_log(self.log_file)
 
         # Session tracking
         self.session_id = str(uuid.uuid4())[:8]
         self.session_start_time = time.time()
+        if history:
+            self.history = DurationHistory(self.log_file.with_name(HISTORY_FILENAME), self.session_id)
 
         # Setup file handler
         self.logger = logging.getLogger(f"pytest_structured_{self.session_id}")
@@ -55,6 +194,9 @@ class PytestStructuredLogger:
 
         # Remove existing handlers to avoid duplicates then create file handler
         self.logger.handlers.clear()
+        if buffered:
+            self._writer = BufferedJsonlWriter(self.log_file, max_queue=max_queue, overflow=overflow)
+            return
         handler = logging.FileHandler(self.log_file, mode="a", encoding="utf-8")
         handler.setLevel(log_level.value)
 
@@ -64,6 +206,30 @@ class PytestStructuredLogger:
 
         self.logger.addHandler(handler)
 
+    def _emit(self, entry: dict[str, Any]) -> None:
+        """Write one entry, directly or via the background writer."""
+        self.insights.add(entry)
+        if self._writer is None:
+            self.logger.info(json.dumps(entry))
+        elif self.logger.isEnabledFor(logging.INFO):
+            self._writer.put(entry)
+
+    def flush(self) -> None:
+        """Block until buffered entries are on disk, recording any that overflow dropped."""
+        if self._writer is None:
+            return
+        dropped = self._writer.take_dropped()
+        if dropped:
+            self._writer.put(self._create_base_entry("log_entries_dropped", count=dropped), force=True)
+        self._writer.flush()
+
+    def close(self) -> None:
+        """Flush and stop the background writer, if any."""
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+
     def _create_base_entry(self, event_type: str, **kwargs) -> dict[str, Any]:
         """Create base log entry with common fields.
 
@@ -91,7 +257,7 @@ class PytestStructuredLogger:
             python_version=sys.version,
             working_directory=str(Path.cwd()),
         )
-        self.logger.info(json.dumps(entry))
+        self._emit(entry)
 
     def log_collection_modifyitems(self, total_tests: int):
         """Log test session start."""
@@ -103,7 +269,7 @@ class PytestStructuredLogger:
             total_tests=total_tests,
             working_directory=str(Path.cwd()),
         )
-        self.logger.info(json.dumps(entry))
+        self._emit(entry)
 
     def log_deselected(self, deselected_count: int, reasons: list[str] | None = None):
         """Log information about tests that were deselected (filtered out)."""
@@ -118,7 +284,7 @@ class PytestStructuredLogger:
             reasons=reasons,
             working_directory=str(Path.cwd()),
         )
-        self.logger.info(json.dumps(entry))
+        self._emit(entry)
 
     def log_session_end(self, passed: int, failed: int, skipped: int, errors: int, duration: float):
         """Log test session end with summary."""
@@ -136,7 +302,10 @@ class PytestStructuredLogger:
             },
             duration=duration,
         )
-        self.logger.info(json.dumps(entry))
+        self._emit(entry)
+        self.flush()
+        if self.history is not None:
+            self.history.flush()
 
     def log_test_start(
         self,
@@ -163,7 +332,7 @@ class PytestStructuredLogger:
                 "parametrize": parametrize,
             },
         )
-        self.logger.info(json.dumps(entry))
+        self._emit(entry)
 
     def log_test_end(self, test_path: str, duration: float):
         """Log individual test end."""
@@ -171,7 +340,7 @@ class PytestStructuredLogger:
             return
 
         entry = self._create_base_entry("test_end", test_path=test_path, duration=duration)
-        self.logger.info(json.dumps(entry))
+        self._emit(entry)
 
     def log_custom_event(self, event_type: str, **kwargs):
         """Log custom event with arbitrary data."""
@@ -179,7 +348,7 @@ class PytestStructuredLogger:
             return
 
         entry = self._create_base_entry(event_type, **kwargs)
-        self.logger.info(json.dumps(entry))
+        self._emit(entry)
 
     def log_test_result(
         self,
@@ -201,6 +370,9 @@ class PytestStructuredLogger:
         if fixtures is None:
             fixtures = []
 
+        if self.history is not None and status == "PASSED":
+            self.history.record("test", test_path, duration)
+
         entry = self._create_base_entry(
             "test_result",
             # test_path=test_path,
@@ -216,7 +388,7 @@ class PytestStructuredLogger:
                 "parametrize": parametrize,
             },
         )
-        self.logger.info(json.dumps(entry))
+        self._emit(entry)
 
 
 # Global logger instance
@@ -240,8 +412,21 @@ def get_logger(log_file: str = "") -> PytestStructuredLogger:
     else:
         log_level = LogLevel.INFO
 
+    # Background writer: on unless explicitly disabled; `drop` trades completeness for never stalling a test.
+    buffered = os.environ.get("PYTEST_STRUCTURED_LOGGING_BUFFERED", "true").lower() != "false"
+    overflow = os.environ.get("PYTEST_STRUCTURED_LOGGING_OVERFLOW", "block").lower()
+    # Per-test durations into `duration_history.sqlite` for `log_parser.py regressions`.
+    history = os.environ.get("PYTEST_DURATION_HISTORY", "true").lower() != "false"
+
     if _logger_instance is None:
-        _logger_instance = PytestStructuredLogger(log_file=log_file, enabled=enabled, log_level=log_level)
+        _logger_instance = PytestStructuredLogger(
+            log_file=log_file,
+            enabled=enabled,
+            log_level=log_level,
+            buffered=buffered,
+            overflow=overflow,
+            history=history,
+        )
 
     return _logger_instance
 
@@ -249,4 +434,6 @@ def get_logger(log_file: str = "") -> PytestStructuredLogger:
 def reset_logger():
     """Reset global logger instance (primarily for testing)."""
     global _logger_instance  # noqa: PLW0603  (singleton instance pattern; TODO refactor to class-based registry)
+    if _logger_instance is not None:
+        _logger_instance.close()
     _logger_instance = None
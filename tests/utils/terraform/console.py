@@ -0,0 +1,257 @@
+"""Warm `terraform console` sessions for the scenario precompute.
+
+Almost all of a `terraform console` call's wall time is startup: config load, module
+resolution, and one provider-plugin launch per provider to fetch schemas. Only after that
+does console start reading stdin. Two properties of console shape how this module hides
+that cost:
+
+  1. Variables are bound at launch. `-var-file` is read once, before the first prompt, so
+     a running session can't be re-pointed at a different scenario's tfvars. A session is
+     therefore tied to exactly one tfvars payload, and a new payload means a new launch.
+  2. In piped mode console buffers its answers and only prints the last result at EOF, so
+     each session serves exactly one request/response frame: expression line in, stdin
+     closed, single result out.
+
+Since a session can't be reused across scenarios, N scenarios still cost N console
+startups; `ConsolePool` overlaps them instead. Each worker keeps a *warm* session,
+launched for the next queued scenario as soon as the worker picks up its current one, so
+provider/module init for scenario N+1 runs while scenario N is being evaluated and written
+to disk. Startups run one ahead per worker: they are hidden only as far as each is no
+longer than the evaluation it overlaps.
+
+Workers are threads, not processes: every heavy operation is the `terraform` subprocess
+itself, and the Python work per scenario (JSON parse + file writes) is small.
+
+`PRECOMPUTE_CONSOLE_BIN` replaces the `terraform` executable (split like a shell command),
+e.g. with the offline stand-in in `console_standin.py` for benchmarking the orchestration.
+"""
+
+import itertools
+import os
+import queue
+import re
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Self
+
+from tests.utils.cache.cache import hash_scenario, normalize_whitespace
+from tests.utils.config import FP
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+# Distinguishes concurrent sessions for the same scenario (e.g. a retry racing a warm spare).
+_session_counter = itertools.count()
+
+
+def _terraform_command() -> list[str]:
+    return shlex.split(os.environ.get("PRECOMPUTE_CONSOLE_BIN", "")) or ["terraform"]
+
+
+class ConsoleError(RuntimeError):
+    """`terraform console` exited non-zero. Carries the return code and ANSI-stripped stderr."""
+
+    def __init__(self, returncode: int, stderr: str):
+        self.returncode = returncode
+        self.stderr = stderr
+        super().__init__(f"rc={returncode}; stderr={stderr[:800]}")
+
+
+class ConsoleSession:
+    """One `terraform console` process bound to one scenario's tfvars.
+
+    The process is launched in `__init__` and immediately starts its provider/module init;
+    `evaluate()` blocks only for whatever init remains plus the evaluation itself. Owns a
+    tfvars tempfile and a private `-state` path (so parallel sessions don't contend for the
+    default state lock); both are removed by `close()`.
+    """
+
+    def __init__(self, tf_modifiers: str, label: str = "session"):
+        self.tf_modifiers = tf_modifiers
+        self.tfvars_key = hash_scenario(tf_modifiers)
+        self._used = False
+
+        session_id = f"{label}-{self.tfvars_key}-{os.getpid()}-{next(_session_counter)}"
+        # Phase durations picked up by the precompute profile (see `profiling.py`).
+        self.phase_timings: dict[str, float] = {}
+
+        start = time.monotonic()
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            suffix=".tfvars",
+            prefix=f"precompute-{session_id}-",
+            delete=False,
+        ) as tf:
+            # Canonicalise (whitespace-normalize + dedup): terraform rejects duplicate variable
+            # assignments within a single tfvars file. Dedup is "last wins", which gives the
+            # BASELINE + scenario_modifier precedence semantics.
+            tf.write(normalize_whitespace(tf_modifiers))
+            self.tfvars_path = Path(tf.name)
+        self.state_path = Path(tempfile.gettempdir()) / f"precompute-{session_id}.tfstate"
+        self.phase_timings["tfvars_write"] = time.monotonic() - start
+
+        cmd = [*_terraform_command(), "console", f"-var-file={self.tfvars_path}", f"-state={self.state_path}"]
+        start = time.monotonic()
+        try:
+            self._proc = subprocess.Popen(  # noqa: S603  (tfvars/state paths are tempfile-generated, not user input)
+                cmd,
+                cwd=FP.WORKSPACE,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except OSError:
+            self.tfvars_path.unlink(missing_ok=True)
+            raise
+        self._spawned_at = time.monotonic()
+        self.phase_timings["console_spawn"] = self._spawned_at - start
+
+    def matches(self, tf_modifiers: str) -> bool:
+        """True if this session is still unused and was launched for the same (normalized) tfvars."""
+        return not self._used and self.tfvars_key == hash_scenario(tf_modifiers)
+
+    def evaluate(self, expression: str) -> str:
+        """Send one expression frame, close stdin, and return console's stdout.
+
+        Raises:
+            ConsoleError: console exited non-zero (syntax error, unknown reference, etc.).
+            RuntimeError: the session has already served its frame.
+        """
+        if self._used:
+            raise RuntimeError("ConsoleSession already evaluated; launch a new session for the next expression.")
+        self._used = True
+        start = time.monotonic()
+        self.phase_timings["console_warm_lead"] = start - self._spawned_at
+        # `terraform console` treats stdin newlines as submit-this-expression markers, so the
+        # frame is exactly one line.
+        stdout, stderr = self._proc.communicate(expression.replace("\n", "") + "\n")
+        self.phase_timings["console_evaluate"] = time.monotonic() - start
+        if self._proc.returncode != 0:
+            raise ConsoleError(self._proc.returncode, _ANSI_ESCAPE.sub("", stderr or ""))
+        return stdout
+
+    def close(self) -> None:
+        """Terminate the process if it never served a frame and remove its tempfiles."""
+        if self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.communicate()
+        self.tfvars_path.unlink(missing_ok=True)
+        self.state_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ConsolePool:
+    """Fixed-size pool of worker threads, each keeping one warm `ConsoleSession` ahead of its queue.
+
+    `run(scenarios, fn)` calls `fn(scenario_hash, tf_modifiers, session)` for every scenario
+    and returns `{scenario_hash: fn_result}`. The session handed to `fn` was launched for that
+    scenario's tfvars while the worker was busy with its previous scenario. `fn` may ignore
+    it (e.g. on a cache hit) — unused sessions are killed and cleaned up by the pool.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max(1, max_workers)
+        # `{scenario_key: (queued_seconds, execution_seconds)}` for the most recent `run()`.
+        # Queued = time from `run()` start until a worker began the item (warm-up wait
+        # included in execution, since the item's console started while it was queued).
+        self.timings: dict[str, tuple[float, float]] = {}
+
+    def run(
+        self,
+        scenarios: dict[str, str],
+        fn: Callable[[str, str, ConsoleSession], object],
+        on_error: Callable[[str, Exception], object] | None = None,
+    ) -> dict[str, object]:
+        """Dispatch every scenario to the pool, in `scenarios` iteration order. Blocks until all complete.
+
+        Workers pull from a shared FIFO, so callers control scheduling by ordering the dict
+        (e.g. longest-expected-first). `on_error(scenario_hash, exc)` converts an unexpected worker exception into a result;
+        without it the exception propagates out of `run()` once all workers stop. A console that
+        fails to launch counts as that scenario's exception, and every scenario gets a result.
+        """
+        work: queue.Queue[tuple[str, str]] = queue.Queue()
+        for item in scenarios.items():
+            work.put(item)
+
+        results: dict[str, object] = {}
+        errors: list[Exception] = []
+        lock = threading.Lock()
+        self.timings = {}
+        run_start = time.monotonic()
+
+        def take() -> tuple[str, str] | None:
+            try:
+                return work.get_nowait()
+            except queue.Empty:
+                return None
+
+        def launch(item: tuple[str, str] | None) -> ConsoleSession | Exception | None:
+            """Warm session for `item`. A launch failure is kept and reported as that scenario's error."""
+            if item is None:
+                return None
+            try:
+                return ConsoleSession(item[1], label="warm")
+            except Exception as e:  # noqa: BLE001  (surfaced for that scenario below)
+                return e
+
+        def worker() -> None:
+            current = take()
+            warm = launch(current)
+            try:
+                while current is not None:
+                    session = warm
+                    # Launch the next scenario's console before evaluating this one, so its
+                    # startup overlaps with our evaluation + disk writes.
+                    upcoming = take()
+                    warm = launch(upcoming)
+                    scenario_hash, tf_modifiers = current
+                    started = time.monotonic()
+                    try:
+                        if isinstance(session, Exception):
+                            raise session
+                        result = fn(scenario_hash, tf_modifiers, session)
+                    except Exception as e:  # noqa: BLE001  (surfaced via on_error or re-raised after join)
+                        if on_error is None:
+                            with lock:
+                                errors.append(e)
+                            return
+                        result = on_error(scenario_hash, e)
+                    finally:
+                        if isinstance(session, ConsoleSession):
+                            session.close()
+                    with lock:
+                        results[scenario_hash] = result
+                        self.timings[scenario_hash] = (started - run_start, time.monotonic() - started)
+                    current = upcoming
+            finally:
+                if isinstance(warm, ConsoleSession):
+                    warm.close()
+
+        threads = [
+            threading.Thread(target=worker, name=f"console-pool-{i}", daemon=True)
+            for i in range(min(self.max_workers, len(scenarios)))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        if errors:
+            raise errors[0]
+        # A worker that died outside `fn` (e.g. `on_error` itself raised) drops the items it held.
+        missing = [scenario_hash for scenario_hash in scenarios if scenario_hash not in results]
+        if missing and on_error is None:
+            raise RuntimeError(f"ConsolePool: no result for {len(missing)} scenario(s), e.g. {missing[0]}")
+        for scenario_hash in missing:
+            results[scenario_hash] = on_error(scenario_hash, RuntimeError("console pool worker stopped"))
+        return results
@@ -0,0 +1,183 @@
+"""Offline stand-in for `terraform console`, for benchmarking the precompute without terraform.
+
+`ConsoleSession` launches `$PRECOMPUTE_CONSOLE_BIN console -var-file=<tfvars> -state=<path>`
+instead of `terraform console ...` when that variable is set (split like a shell command):
+
+  PRECOMPUTE_CONSOLE_BIN="python3 $PWD/tests/utils/terraform/console_standin.py"
+
+The value is part of the scenario cache key (`_compute_static_hash_part`), so whatever the
+stand-in renders is cached apart from real terraform output.
+
+Same contract as the real console in piped mode: one `jsonencode({locals = {...},
+outputs = {...}, templates = {...}})` line on stdin, the JSON-quoted result on stdout, and
+a non-zero exit plus `Error: ...` on stderr on failure. Only the standard library is used,
+so startup costs an interpreter launch rather than terraform's config and provider init.
+Behaviour comes from the environment, which the stand-in inherits from pytest:
+
+  PRECOMPUTE_STANDIN_MODE        replay      answer from a recording (missing → exit 1)
+                                 synthesize  make up a result with the requested keys (default
+                                             without PRECOMPUTE_STANDIN_FIXTURES)
+                                 record      run the real console, save its answer, pass it on
+  PRECOMPUTE_STANDIN_FIXTURES    recordings directory: `<key>.json` = {stdout, stderr, returncode}
+  PRECOMPUTE_STANDIN_TERRAFORM   real command used by `record` (default: terraform)
+  PRECOMPUTE_STANDIN_STARTUP_S   seconds slept before reading stdin (console init)
+  PRECOMPUTE_STANDIN_EVAL_S      seconds slept after reading stdin (evaluation)
+  PRECOMPUTE_STANDIN_JITTER      +/- fraction applied to both sleeps
+  PRECOMPUTE_STANDIN_FAIL_RATE   fraction of calls that exit 1 instead of answering
+  PRECOMPUTE_STANDIN_SEED        varies which calls fail / how they jitter (default 0)
+
+A recording's key hashes everything the real answer depends on: the workspace's
+`terraform.tfvars` and `*.auto.tfvars`, the `-var-file` and the expression. Jitter and
+failures are drawn from that key too, so a rerun of the same catalogue fails the same
+scenarios and sleeps the same amounts.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import shlex
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+_OPENERS = {"(": ")", "[": "]", "{": "}"}
+
+
+def section_keys(expression: str) -> dict[str, list[str]]:
+    """Top-level keys of each section of `jsonencode({ section = { key = ..., ... }, ... })`.
+
+    Values are arbitrary HCL (nested objects, function calls, quoted strings with `${...}`
+    interpolations containing more quotes), so this tracks bracket depth and string state
+    rather than splitting on commas.
+    """
+    sections: dict[str, list[str]] = {}
+    section = None
+    stack: list[str] = []  # closers for open brackets; "\"" for strings; "}" ending an interpolation
+    expect_key = False
+    i = 0
+    while i < len(expression):
+        char = expression[i]
+        if stack and stack[-1] == '"':
+            if char == "\\":
+                i += 1
+            elif char == '"':
+                stack.pop()
+            elif char in "$%" and expression.startswith("{", i + 1):
+                stack.append("}")
+                i += 1
+            i += 1
+            continue
+        if char == '"':
+            stack.append('"')
+        elif char in _OPENERS:
+            stack.append(_OPENERS[char])
+            expect_key = char == "{"
+        elif stack and char == stack[-1]:
+            stack.pop()
+        elif char == ",":
+            expect_key = True
+        elif expect_key and (match := _IDENTIFIER.match(expression, i)):
+            expect_key = False
+            after = expression[match.end() :].lstrip()
+            if after.startswith("=") and not after.startswith("=="):
+                if len(stack) == 2:  # jsonencode( { <section> = ...
+                    section = match.group()
+                    sections[section] = []
+                elif len(stack) == 3 and section is not None:
+                    sections[section].append(match.group())
+            i = match.end()
+            continue
+        elif not char.isspace():
+            expect_key = False
+        i += 1
+    return sections
+
+
+def synthesize(expression: str, key: str) -> dict:
+    """A result of the requested shape: null locals/outputs, a one-line placeholder per template."""
+    keys = section_keys(expression)
+    return {
+        "locals": dict.fromkeys(keys.get("locals", [])),
+        "outputs": dict.fromkeys(keys.get("outputs", [])),
+        "templates": {name: f"# console stand-in: {name} for {key}\n" for name in keys.get("templates", [])},
+    }
+
+
+def recording_key(var_file: str | None, expression: str, workspace: Path) -> str:
+    """Hash of the workspace tfvars, the `-var-file` contents (its name is a random tempfile) and the expression."""
+    digest = hashlib.sha256()
+    inputs = [(p.name, p) for p in [workspace / "terraform.tfvars", *sorted(workspace.glob("*.auto.tfvars"))]]
+    inputs += [("-var-file", Path(var_file))] if var_file else []
+    for name, path in inputs:
+        digest.update(name.encode() + b"\0")
+        digest.update(path.read_bytes() if path.is_file() else b"")
+        digest.update(b"\0")
+    digest.update(expression.encode())
+    return digest.hexdigest()[:24]
+
+
+def _sleep(seconds: float, jitter: float, rng: random.Random) -> None:
+    if seconds > 0:
+        time.sleep(max(0.0, seconds * (1 + rng.uniform(-jitter, jitter))))
+
+
+def main(argv: list[str]) -> int:
+    env = os.environ
+    var_file = next((arg.split("=", 1)[1] for arg in argv if arg.startswith("-var-file=")), None)
+    fixtures = env.get("PRECOMPUTE_STANDIN_FIXTURES")
+    mode = env.get("PRECOMPUTE_STANDIN_MODE") or ("replay" if fixtures else "synthesize")
+    jitter = float(env.get("PRECOMPUTE_STANDIN_JITTER", 0))
+
+    startup = float(env.get("PRECOMPUTE_STANDIN_STARTUP_S", 0))
+    if startup > 0:  # the key needs stdin; seed the startup jitter from the tfvars alone
+        tfvars = Path(var_file).read_text() if var_file and Path(var_file).is_file() else ""
+        _sleep(startup, jitter, random.Random(f"{env.get('PRECOMPUTE_STANDIN_SEED', 0)}:{tfvars}"))
+
+    expression = sys.stdin.read().strip()
+    key = recording_key(var_file, expression, Path.cwd())
+    rng = random.Random(f"{env.get('PRECOMPUTE_STANDIN_SEED', 0)}:{key}")
+    _sleep(float(env.get("PRECOMPUTE_STANDIN_EVAL_S", 0)), jitter, rng)
+
+    if rng.random() < float(env.get("PRECOMPUTE_STANDIN_FAIL_RATE", 0)):
+        sys.stderr.write(f"Error: injected failure (console stand-in, key {key})\n")
+        return 1
+
+    recording = Path(fixtures or ".") / f"{key}.json"
+    if mode == "synthesize":
+        answer = {"stdout": json.dumps(json.dumps(synthesize(expression, key))) + "\n", "stderr": "", "returncode": 0}
+    elif mode == "replay":
+        if not recording.is_file():
+            sys.stderr.write(f"Error: no recording {recording} (console stand-in)\n")
+            return 1
+        answer = json.loads(recording.read_text())
+    elif mode == "record":
+        if not fixtures:
+            sys.stderr.write("Error: PRECOMPUTE_STANDIN_FIXTURES is required to record (console stand-in)\n")
+            return 1
+        real = subprocess.run(  # noqa: S603  (same argv terraform would have been given)
+            [*shlex.split(env.get("PRECOMPUTE_STANDIN_TERRAFORM", "terraform")), *argv],
+            input=expression + "\n",
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        answer = {"stdout": real.stdout, "stderr": real.stderr, "returncode": real.returncode}
+        recording.parent.mkdir(parents=True, exist_ok=True)
+        tmp = recording.with_name(f".{recording.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(answer))
+        tmp.replace(recording)
+    else:
+        sys.stderr.write(f"Error: unknown PRECOMPUTE_STANDIN_MODE {mode!r} (console stand-in)\n")
+        return 2
+
+    sys.stdout.write(answer["stdout"])
+    sys.stderr.write(answer["stderr"])
+    return answer["returncode"]
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,7 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 import os
 from pathlib import Path
 import shutil
 import subprocess
+import tempfile
+import threading
 
 from tests.utils.cache.cache import hash_cache_key, normalize_whitespace
 from tests.utils.config import FP
@@ -19,8 +23,8 @@ TF_CONSOLE_UNKNOWN_MARKER = "(known after apply)"
 # stdout/stderr are captured (not echoed) to keep the test console clean during success.
 # On failure, both streams are surfaced inside the raised RuntimeError so pytest tracebacks
 # include the actual terraform error rather than a bare "exit status 1".
-def execute_subprocess(command: str) -> str:
-    """Execute a subprocess command. Surfaces stdout+stderr on failure."""
+def execute_subprocess(command: str, cwd: str | None = None) -> str:
+    """Execute a subprocess command in `cwd` (default: the session workspace). Surfaces stdout+stderr on failure."""
     try:
         result = subprocess.run(  # noqa: S602  (shell=True is intentional; commands are project-constructed terraform CLI strings, not user input)
             command,
@@ -28,6 +32,7 @@ def execute_subprocess(command: str) -> str:
             capture_output=True,
             text=True,
             shell=True,
+            cwd=cwd or FP.WORKSPACE,
         )
     except subprocess.CalledProcessError as e:
         raise RuntimeError(
@@ -47,7 +52,7 @@ class TF:
 
     - Plan based on core tfvars, core override, and testcase override.
     - Targeted apply/destroy available if necessary. eg.
-      - `terraform apply   --auto-approve tfpan`
+      - `terraform apply   --auto-approve <cached_plan_path(...)>`
       - `terraform apply   --auto-approve -target=null_resource.my_resource`
       - `terraform destroy --auto-approve`
       - `terraform destroy --auto-approve -target=null_resource.my_resource`
@@ -66,8 +71,7 @@ class TF:
 
     @staticmethod
     def apply(qualifier: str = "") -> None:
-        """Run terraform apply (defaults to using tfplan)."""
-        qualifier = qualifier if len(qualifier) > 0 else "tfplan"
+        """Run terraform apply. To apply a prepared plan, pass its file, e.g. `cached_plan_path(tf_modifiers)`."""
         command = f"terraform apply --auto-approve {qualifier}"
         execute_subprocess(command)
 
@@ -82,42 +86,151 @@ class TF:
 ## ------------------------------------------------------------------------------------
 ## Plan Generation
 ## ------------------------------------------------------------------------------------
+# Each plan runs in its own scratch dir (`-var-file` / `-state` / `-out` all private), so any
+# number can run at once in the session workspace. Finished plans are moved into
+# `.plan_cache/` and read from there in place. The cache is LRU-bounded by
+# `PLAN_CACHE_MAX_MB` (default 512): a hit refreshes the entry's mtime, and every store
+# evicts the least recently used entries until the cache fits.
+_DEFAULT_PLAN_CACHE_MAX_MB = 512
+_plan_cache_lock = threading.Lock()
+
+
+def _plan_cache_budget() -> int:
+    return int(float(os.environ.get("PLAN_CACHE_MAX_MB", _DEFAULT_PLAN_CACHE_MAX_MB)) * 1024 * 1024)
+
+
+def _cached_paths(cache_key: str) -> tuple[Path, Path]:
+    return Path(FP.CACHE_PLAN_DIR) / f"plan_{cache_key}", Path(FP.CACHE_PLAN_DIR) / f"plan_{cache_key}.json"
+
+
+def cached_plan_path(tf_modifiers: str, qualifier: str = "") -> Path:
+    """Binary plan file `prepare_plan(tf_modifiers, qualifier)` caches (exists once that has run)."""
+    return _cached_paths(hash_cache_key(normalize_whitespace(tf_modifiers), qualifier))[0]
+
+
+def _read_cached_plan(cache_key: str) -> dict | None:
+    """The cached plan JSON, read in place (and marked as recently used), or `None` on a miss."""
+    cached_plan, cached_json = _cached_paths(cache_key)
+    try:
+        plan = FileHelper.read_json(str(cached_json))
+        os.utime(cached_json)
+    except (OSError, ValueError):
+        return None  # missing, evicted by a concurrent session mid-read, or half-written
+    return plan if cached_plan.exists() else None
+
+
+def evict_plan_cache(max_bytes: int | None = None, keep: tuple[str, ...] = ()) -> int:
+    """Delete least-recently-used `.plan_cache` entries until it fits in `max_bytes`. Returns bytes freed.
+
+    An entry is the `plan_<key>` / `plan_<key>.json` pair; recency is the JSON's mtime.
+    Entries whose key is in `keep` are never evicted.
+    """
+    budget = _plan_cache_budget() if max_bytes is None else max_bytes
+    entries: dict[str, list[Path]] = {}
+    for path in Path(FP.CACHE_PLAN_DIR).glob("plan_*"):
+        entries.setdefault(path.name.removesuffix(".json").removeprefix("plan_"), []).append(path)
+
+    def stat(paths: list[Path]) -> tuple[float, int]:
+        last_used, size = 0.0, 0
+        for path in paths:
+            with contextlib.suppress(OSError):
+                st = path.stat()
+                size += st.st_size
+                if path.suffix == ".json":
+                    last_used = st.st_mtime
+        return last_used, size
+
+    stats = {key: stat(paths) for key, paths in entries.items()}
+    total = sum(size for _, size in stats.values())
+    freed = 0
+    for key in sorted(stats, key=lambda k: stats[k][0]):
+        if total - freed <= budget:
+            break
+        if key in keep:
+            continue
+        for path in entries[key]:
+            path.unlink(missing_ok=True)
+        freed += stats[key][1]
+    return freed
+
+
+def _run_plan(tf_modifiers: str, qualifier: str, cache_key: str) -> dict:
+    """Plan one scenario in a private scratch dir and move the result into the cache."""
+    cached_plan, cached_json = _cached_paths(cache_key)
+    with tempfile.TemporaryDirectory(prefix=f"plan-{cache_key}-") as scratch:
+        run_dir = Path(scratch)
+        (run_dir / "override.tfvars").write_text(tf_modifiers)
+        command = (
+            f"terraform plan {qualifier} -var-file={run_dir}/override.tfvars -state={run_dir}/terraform.tfstate "
+            f"-out={run_dir}/tfplan -refresh=false -input=false "
+            f"&& terraform show -json {run_dir}/tfplan > {run_dir}/tfplan.json"
+        )
+        execute_subprocess(command)
+
+        # Stage beside the cache (same filesystem), then rename: readers never see a partial
+        # file. JSON last — its presence marks the entry as complete for `_read_cached_plan`.
+        Path(FP.CACHE_PLAN_DIR).mkdir(parents=True, exist_ok=True)
+        for produced, cached in ((run_dir / "tfplan", cached_plan), (run_dir / "tfplan.json", cached_json)):
+            staged = cached.with_name(f".{cached.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            shutil.move(produced, staged)
+            staged.replace(cached)
+
+    with _plan_cache_lock:
+        evict_plan_cache(keep=(cache_key,))
+    return FileHelper.read_json(str(cached_json))
+
+
 # Find a cached Terraform plan, or generate new one with fresh set of tfvars files.
 def prepare_plan(tf_modifiers: str, qualifier: str = "") -> dict:
-    """Generate override.auto.tfvars and run terraform plan with caching.
+    """Return the terraform plan JSON for `tf_modifiers`, planning it on a cache miss.
 
     Args:
         tf_modifiers: Terraform variable overrides
         qualifier: Additional modifier to add to cache key (e.g '-target=null_resource.my_resource')
 
     Returns:
-        Terraform plan JSON data
+        Terraform plan JSON data, read straight from `.plan_cache/`.
+
+    Raises:
+        RuntimeError: `terraform plan` failed; carries its stdout/stderr (e.g. validation errors).
     """
     # Cache key affected by whitespace. Standardize before hashing.
     tf_modifiers = normalize_whitespace(tf_modifiers)
     cache_key = hash_cache_key(tf_modifiers, qualifier)
 
     # Always try to use cached results (for speed and performance)
-    cached_plan = f"{FP.CACHE_PLAN_DIR}/plan_{cache_key}"
-    cached_json = f"{FP.CACHE_PLAN_DIR}/plan_{cache_key}.json"
-
-    # Write normalized tf_modifiers to the 'override.auto.tfvars' file.
-    FileHelper.write_file(FP.TFVARS_AUTO_OVERRIDE_DST, tf_modifiers)
-
-    if os.path.exists(cached_json):
+    plan = _read_cached_plan(cache_key)
+    if plan is not None:
         print(f"Cache hit! {cache_key}")
-        shutil.copy(cached_plan, FP.TFPLAN_FILE_LOCATION)
-        shutil.copy(cached_json, FP.TFPLAN_JSON_LOCATION)
-        return FileHelper.read_json(FP.TFPLAN_JSON_LOCATION)
+        return plan
 
     # Cache miss. Create plan files and cache for future use.
     print(f"Cache miss. {cache_key}")
-    TF.plan(qualifier)
+    return _run_plan(tf_modifiers, qualifier, cache_key)
+
+
+def prepare_plans(
+    scenarios: dict[str, str],
+    qualifier: str = "",
+    max_workers: int | None = None,
+) -> dict[str, dict | RuntimeError]:
+    """`prepare_plan` for every `{name: tf_modifiers}` at once. Returns `{name: plan_json | RuntimeError}`.
+
+    Plans run concurrently on threads (the work is the `terraform` subprocess itself);
+    `max_workers` defaults to the CPU count. A failed plan is returned, not raised, so
+    callers can assert on each scenario's error text.
+    """
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(scenarios) or 1))
 
-    shutil.copy(FP.TFPLAN_FILE_LOCATION, cached_plan)
-    shutil.copy(FP.TFPLAN_JSON_LOCATION, cached_json)
+    def run(tf_modifiers: str) -> dict | RuntimeError:
+        try:
+            return prepare_plan(tf_modifiers, qualifier)
+        except RuntimeError as e:
+            return e
 
-    return FileHelper.read_json(FP.TFPLAN_JSON_LOCATION)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(run, tf_modifiers) for name, tf_modifiers in scenarios.items()}
+        return {name: future.result() for name, future in futures.items()}
 
 
 ## ------------------------------------------------------------------------------------
@@ -136,5 +249,6 @@ def console_evaluate_local(local_name: str) -> str:
         capture_output=True,
         text=True,
         check=True,
+        cwd=FP.WORKSPACE,
     )
     return result.stdout.strip()
@@ -1,14 +1,24 @@
 """Parallel precompute of resolved locals + rendered templatefiles per scenario.
 
-Each unique tfvars scenario gets one parallel `terraform console` worker that:
+Each unique tfvars scenario gets one `terraform console` evaluation that:
   1. Builds payloads for every templatefile (Python-side substitution of secrets + tls stubs).
   2. Submits a single `jsonencode({locals = {...}, templates = {...}})` to console.
-  3. Parses the result; writes `locals.json` + every rendered template into
-     `tests/.scenario_cache/{cache_key}/`.
+  3. Parses the result; writes `locals.json` + `outputs.json` into
+     `tests/.scenario_cache/{cache_key}/`, every rendered template into the shared
+     content-addressed blob store, and a `manifest.json` mapping template keys to blobs
+     (see `tests/utils/cache/blobstore.py`).
 
 The cache key is `hash_templatefile_cache_key(tf_modifiers)` — disk-only, no console
-needed. Tests read from this cache directly at runtime; no further console invocations
-occur.
+needed. Each manifest entry also records a per-template input hash (`hash_template_inputs`:
+the template's 009 expression, its `.tpl`, the secrets it references), so editing one
+template re-renders just that template across scenarios instead of the whole cache. Tests read from this cache directly at runtime; no further console invocations
+occur. Console processes are pre-launched by the warm pool in `console.py`, so each
+scenario's provider/module init overlaps with the previous scenario's evaluation.
+
+Only the templates a scenario's tests actually read are rendered: `collect_required_templates`
+derives them from each test's source (see `required_templates_for_item`), and the manifest
+records which templates a scenario has so later sessions fill only the gaps.
+`PRECOMPUTE_ALL_TEMPLATES=1` renders everything.
 
 `wave_lite_rds.sql` is rendered separately via `sedalternative.py` because its postgres
 single-quote literals break `terraform console`'s stdin input parsing.
@@ -16,10 +26,11 @@ single-quote literals break `terraform console`'s stdin input parsing.
 
 import ast
 from collections import defaultdict
-import concurrent.futures
 from datetime import UTC, datetime
+import functools
 import inspect
 import json
+import os
 from pathlib import Path
 import re
 import shutil
@@ -28,9 +39,19 @@ import tempfile
 import textwrap
 import time
 
-from tests.utils.cache.cache import hash_scenario, hash_templatefile_cache_key, normalize_whitespace
+from tests.utils.cache.blobstore import put_blob, put_blob_file, read_manifest, resolve_entry, write_manifest
+from tests.utils.cache.housekeeping import touch_scenario
+from tests.utils.cache.cache import (
+    _compute_static_hash_part,
+    hash_scenario,
+    hash_template_inputs,
+    hash_templatefile_cache_key,
+)
 from tests.utils.config import FP, all_template_files
 from tests.utils.filehandling.filehandling import FileHelper
+from tests.utils.terraform import profiling
+from tests.utils.terraform.console import ConsoleError, ConsolePool, ConsoleSession
+from tests.utils.terraform.profiling import PhaseProfile
 
 
 JSON_009_PATH = "009_define_file_templates.json"
@@ -59,6 +80,8 @@ _TLS_KEY_STUBS = {"public_key_fingerprint_sha256": "SHA256:mocksshfingerprintfor
 # `all_template_files` key uses underscores; the actual on-disk filename uses hyphens.
 _WAVE_LITE_RDS_KEY = "wave_lite_rds"
 _WAVE_LITE_RDS_FILENAME = "wave-lite-rds.sql"
+_WAVE_LITE_RDS_SOURCE = f"{FP.ROOT}/assets/src/wave_lite_config/{_WAVE_LITE_RDS_FILENAME}"
+_SEDALTERNATIVE_SCRIPT = f"{FP.ROOT}/scripts/installer/utils/sedalternative.py"
 
 
 ## ------------------------------------------------------------------------------------
@@ -101,7 +124,7 @@ def _replace_refs(input_str: str, vars_dict: dict, pattern: str) -> str:
 ## ------------------------------------------------------------------------------------
 def discover_referenced_locals() -> set[str]:
     """Console-resolvable locals referenced from 009.json (minus the allowlisted skips)."""
-    path = Path(FP.ROOT) / JSON_009_PATH
+    path = Path(FP.WORKSPACE) / JSON_009_PATH
     if not path.exists():
         return set()
     content = path.read_text()
@@ -120,7 +143,7 @@ def discover_output_expressions() -> dict[str, str]:
     with the two-layer-defense pattern in `locals.tf`. Console can evaluate every value
     expression that this function returns.
     """
-    path = Path(FP.ROOT) / JSON_012_PATH
+    path = Path(FP.WORKSPACE) / JSON_012_PATH
     if not path.exists():
         return {}
     data = json.loads(path.read_text())
@@ -161,22 +184,6 @@ def read_scenario_outputs(tf_modifiers: str) -> dict:
 ## ------------------------------------------------------------------------------------
 ## Worker helpers
 ## ------------------------------------------------------------------------------------
-def _expected_filenames() -> set[str]:
-    """The full set of filenames a complete scenario cache directory should contain."""
-    names = {"locals.json", "outputs.json"}
-    for key, meta in all_template_files.items():
-        names.add(_WAVE_LITE_RDS_FILENAME if key == _WAVE_LITE_RDS_KEY else f"{key}{meta['extension']}")
-    return names
-
-
-def _scenario_cache_complete(cache_dir: Path) -> bool:
-    """True if every expected file is present in the cache dir."""
-    if not cache_dir.exists():
-        return False
-    present = {p.name for p in cache_dir.iterdir()}
-    return _expected_filenames().issubset(present)
-
-
 def _load_secrets() -> dict[str, dict]:
     """Load and normalize the four secret JSON fixtures into `{category: {key: value}}`."""
     raw = {
@@ -203,53 +210,126 @@ def _build_template_payload(raw_expression: str, secrets: dict) -> str:
     return payload.replace("\n", "")
 
 
-def _render_wave_lite_rds(cache_dir: Path) -> None:
-    """Render the SQL file via sedalternative.py — single-quotes break console input parsing."""
-    source_path = Path(FP.ROOT) / "assets/src/wave_lite_config" / _WAVE_LITE_RDS_FILENAME
-    shutil.copy(source_path, cache_dir / _WAVE_LITE_RDS_FILENAME)
-    script_path = Path(FP.ROOT) / "scripts/installer/utils/sedalternative.py"
-    cmd = ["python3", str(script_path), "wave_lite_test_limited", "wave_lite_test_limited_password", str(cache_dir)]
-    subprocess.run(cmd, check=True, capture_output=True)  # noqa: S603  (args are hardcoded test fixtures)
+def _render_wave_lite_rds() -> str:
+    """Render the SQL file via sedalternative.py — single-quotes break console input parsing.
+
+    sedalternative.py edits the file in place inside a directory, so render into a scratch
+    dir and move the result into the blob store. Returns the blob digest.
+    """
+    with tempfile.TemporaryDirectory(prefix="precompute-wave-lite-rds-") as scratch:
+        shutil.copy(_WAVE_LITE_RDS_SOURCE, Path(scratch) / _WAVE_LITE_RDS_FILENAME)
+        cmd = ["python3", _SEDALTERNATIVE_SCRIPT, "wave_lite_test_limited", "wave_lite_test_limited_password", scratch]
+        subprocess.run(cmd, check=True, capture_output=True)  # noqa: S603  (args are hardcoded test fixtures)
+        return put_blob_file(
+            Path(scratch) / _WAVE_LITE_RDS_FILENAME, all_template_files[_WAVE_LITE_RDS_KEY]["extension"]
+        )
 
 
-## ------------------------------------------------------------------------------------
-## Worker
-## ------------------------------------------------------------------------------------
-def _precompute_scenario(scenario_hash: str, tf_modifiers: str) -> tuple[str, float, str]:
-    """Resolve locals + render all templatefiles for one scenario. Write to disk cache.
+@functools.lru_cache(maxsize=1)
+def _input_hashes() -> dict[str, str]:
+    """Per-part freshness keys for this session: one per template, plus `locals.json` / `outputs.json`.
 
-    Returns (scenario_hash, elapsed_seconds, status). Status:
-      - `"hit"`: cache dir already complete
-      - `"miss-ok"`: rendered successfully
-      - `"miss-err: <message>"`: terraform console or parse failure
+    Computed once per process from 009.json / 012.json (written by `session_setup`) and the
+    files each template reads. A manifest entry whose recorded `inputs` differs from the
+    value here is stale and gets re-rendered; everything else in the scenario is kept.
     """
-    cache_key = hash_templatefile_cache_key(tf_modifiers)
-    cache_dir = Path(FP.CACHE_SCENARIO_DIR) / cache_key
-    start = time.time()
+    raw_locals = json.loads((Path(FP.WORKSPACE) / JSON_009_PATH).read_text())["locals"][0]
+    secrets = _load_secrets()
+    hashes = {
+        key: hash_template_inputs(raw_locals.get(key, ""), secrets)
+        for key in all_template_files
+        if key != _WAVE_LITE_RDS_KEY
+    }
+    hashes[_WAVE_LITE_RDS_KEY] = hash_template_inputs(
+        _WAVE_LITE_RDS_KEY,
+        secrets,
+        extra_files=(_WAVE_LITE_RDS_SOURCE, _SEDALTERNATIVE_SCRIPT),
+    )
+    hashes["locals.json"] = hash_template_inputs(" ".join(sorted(discover_referenced_locals())), secrets)
+    hashes["outputs.json"] = hash_template_inputs((Path(FP.WORKSPACE) / JSON_012_PATH).read_text(), secrets)
+    return hashes
+
+
+def _stale_parts(
+    cache_dir: Path,
+    manifest: dict | None,
+    wanted: set[str] | None = None,
+) -> tuple[set[str], set[str]]:
+    """Return `(stale_template_keys, stale_files)` for one scenario directory.
+
+    A template is stale if its manifest entry is missing, its recorded inputs hash differs
+    from `_input_hashes()`, or its blob has gone. Only templates in `wanted` (default: all)
+    are considered — the manifest records exactly which templates a scenario has, so a later
+    session wanting more fills just the gap. `stale_files` covers `locals.json` /
+    `outputs.json` the same way. Both empty means a full cache hit.
+    """
+    hashes = _input_hashes()
+    templates = (manifest or {}).get("templates", {})
+    files = (manifest or {}).get("files", {})
+    stale_templates = {
+        key
+        for key in all_template_files
+        if (wanted is None or key in wanted)
+        and (
+            key not in templates
+            or templates[key].get("inputs") != hashes[key]
+            or not resolve_entry(templates[key]).exists()
+        )
+    }
+    stale_files = {
+        name
+        for name in ("locals.json", "outputs.json")
+        if files.get(name) != hashes[name] or not (cache_dir / name).exists()
+    }
+    return stale_templates, stale_files
 
-    if _scenario_cache_complete(cache_dir):
-        return scenario_hash, time.time() - start, "hit"
 
-    cache_dir.mkdir(parents=True, exist_ok=True)
+def _needs_console(stale_templates: set[str], stale_files: set[str]) -> bool:
+    """`wave_lite_rds` renders without console; anything else stale needs an evaluation."""
+    return bool(stale_files or (stale_templates - {_WAVE_LITE_RDS_KEY}))
+
+
+## ------------------------------------------------------------------------------------
+## Worker
+## ------------------------------------------------------------------------------------
+def _evaluate_parts(
+    tf_modifiers: str,
+    stale_templates: set[str],
+    stale_files: set[str],
+    session: ConsoleSession | None = None,
+    profile: PhaseProfile | None = None,
+) -> dict:
+    """One console round trip resolving the requested locals/outputs/templates. Returns the parsed map.
+
+    Phase timings (payload build, session tfvars/spawn/warm-lead/evaluate, JSON parse) are
+    accumulated onto `profile` when given.
+
+    Raises:
+        ConsoleError: console exited non-zero.
+        ValueError: console output wasn't the expected double-encoded JSON.
+    """
+    profile = profile or PhaseProfile("adhoc", [])
+    build_start = time.monotonic()
 
     # Load 009 templatefile expressions + secret fixtures.
-    templatefile_json = json.loads((Path(FP.ROOT) / JSON_009_PATH).read_text())
+    templatefile_json = json.loads((Path(FP.WORKSPACE) / JSON_009_PATH).read_text())
     raw_locals = templatefile_json["locals"][0]
     secrets = _load_secrets()
 
-    # Build per-template payloads (skip wave_lite_rds — rendered separately).
+    # Build payloads for the stale templates only (wave_lite_rds is rendered separately).
     template_payloads = {
         key: _build_template_payload(raw_locals[key], secrets)
         for key in all_template_files
-        if key != _WAVE_LITE_RDS_KEY and key in raw_locals
+        if key in stale_templates and key != _WAVE_LITE_RDS_KEY and key in raw_locals
     }
 
-    # Mega-expression: locals + every output from 012_outputs.tf + every templatefile,
-    # all in one jsonencode round trip. Each output's value expression is enumerated from
-    # 012_outputs.json and embedded directly — `test_outputs.py` reads the resulting map
-    # from `outputs.json` to validate per-scenario output behaviour.
-    locals_to_resolve = discover_referenced_locals()
-    output_expressions = discover_output_expressions()
+    # Mega-expression: locals + every output from 012_outputs.tf + every stale
+    # templatefile, all in one jsonencode round trip. Each output's value expression is
+    # enumerated from 012_outputs.json and embedded directly — `test_outputs.py` reads
+    # the resulting map from `outputs.json` to validate per-scenario output behaviour.
+    # Fresh sections are sent as empty objects.
+    locals_to_resolve = discover_referenced_locals() if "locals.json" in stale_files else set()
+    output_expressions = discover_output_expressions() if "outputs.json" in stale_files else {}
     locals_body = ", ".join(f"{n} = try(local.{n}, null)" for n in sorted(locals_to_resolve))
     outputs_body = ", ".join(f"{name} = {value_expr}" for name, value_expr in sorted(output_expressions.items()))
     templates_body = ", ".join(f"{k} = {p}" for k, p in template_payloads.items())
@@ -260,87 +340,300 @@ def _precompute_scenario(scenario_hash: str, tf_modifiers: str) -> tuple[str, fl
         f"templates = {{ {templates_body} }} "
         f"}})"
     )
+    profile.add("payload_build", time.monotonic() - build_start)
 
-    # Per-worker tfvars + state paths so parallel processes don't fight over the default state lock.
-    with tempfile.NamedTemporaryFile(
-        mode="w",
-        suffix=".tfvars",
-        prefix=f"precompute-{scenario_hash}-",
-        delete=False,
-    ) as tf:
-        # Canonicalise (whitespace-normalize + dedup): terraform rejects duplicate variable
-        # assignments within a single tfvars file. Dedup is "last wins", which gives the
-        # BASELINE + scenario_modifier precedence semantics.
-        tf.write(normalize_whitespace(tf_modifiers))
-        tfvars_path = Path(tf.name)
-    state_path = Path(tempfile.gettempdir()) / f"precompute-{scenario_hash}.tfstate"
-
+    # Reuse the warm session the pool launched for this scenario; launch one on demand otherwise.
+    owns_session = session is None or not session.matches(tf_modifiers)
+    if owns_session:
+        session = ConsoleSession(tf_modifiers)
     try:
-        cmd = ["terraform", "console", f"-var-file={tfvars_path}", f"-state={state_path}"]
-        try:
-            result = subprocess.run(  # noqa: S603  (tfvars/state paths are tempfile-generated, not user input)
-                cmd,
-                cwd=FP.ROOT,
-                input=expr,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            stderr_clean = re.sub(r"\x1b\[[0-9;]*m", "", e.stderr or "")
-            return scenario_hash, time.time() - start, f"miss-err: rc={e.returncode}; stderr={stderr_clean[:800]}"
+        stdout = session.evaluate(expr)
+    finally:
+        for phase, seconds in session.phase_timings.items():
+            profile.add(phase, seconds)
+        if owns_session:
+            session.close()
 
+    with profile.phase("json_parse"):
         try:
-            parsed = json.loads(json.loads(result.stdout.strip()))
+            return json.loads(json.loads(stdout.strip()))
         except (json.JSONDecodeError, ValueError) as e:
-            stderr_clean = re.sub(r"\x1b\[[0-9;]*m", "", result.stderr or "")
-            return (
-                scenario_hash,
-                time.time() - start,
-                (f"miss-err: json-parse {e}; stdout={result.stdout[:200]!r}; stderr={stderr_clean[:400]}"),
-            )
-
-        # Persist resolved locals (useful for debugging; not consumed by tests today).
+            raise ValueError(f"json-parse {e}; stdout={stdout[:200]!r}") from e
+
+
+def _precompute_scenario(
+    scenario_hash: str,
+    tf_modifiers: str,
+    session: ConsoleSession | None = None,
+    wanted: set[str] | None = None,
+) -> tuple[str, float, str]:
+    """Resolve locals + render the stale templatefiles for one scenario. Write to disk cache.
+
+    Only the parts that are stale (or missing) for this scenario are evaluated; fresh
+    manifest entries are carried over untouched. A scenario whose only stale part is
+    `wave_lite_rds` never launches console at all.
+
+    `session` is a pre-launched console for this scenario's tfvars (see `ConsolePool`).
+    If omitted — or launched for different tfvars — a fresh session is started and closed here.
+    `wanted` is the set of templates this scenario's tests read (see
+    `collect_required_templates`); `None` wants every template.
+
+    Returns (scenario_hash, elapsed_seconds, status). Statuses:
+      - `"hit"`: every wanted part already fresh
+      - `"miss-ok"`: every wanted part rendered into an empty scenario directory
+      - `"partial-ok"`: only the stale subset re-rendered
+      - `"miss-err: <message>"`: terraform console or parse failure
+    """
+    start = time.time()
+    cache_dir = Path(FP.CACHE_SCENARIO_DIR) / hash_templatefile_cache_key(tf_modifiers)
+    manifest = read_manifest(cache_dir) or {}
+    stale_templates, stale_files = _stale_parts(cache_dir, manifest, wanted)
+    if not stale_templates and not stale_files:
+        if "static" not in manifest:  # written before manifests recorded it; needed for export
+            write_manifest(cache_dir, {**manifest, "static": _compute_static_hash_part()})
+        return scenario_hash, time.time() - start, "hit"
+
+    profile = PhaseProfile(label=scenario_hash, scenarios=[scenario_hash])
+    parsed: dict = {"locals": {}, "outputs": {}, "templates": {}}
+    if _needs_console(stale_templates, stale_files):
+        try:
+            parsed = _evaluate_parts(tf_modifiers, stale_templates, stale_files, session=session, profile=profile)
+        except (ConsoleError, ValueError) as e:
+            profile.finish("miss-err")
+            return scenario_hash, time.time() - start, f"miss-err: {e}"
+
+    # Blob digests are content hashes, so each distinct render is stored once however many
+    # scenarios share it.
+    hashes = _input_hashes()
+    write_start = time.monotonic()
+    templates_manifest = {k: v for k, v in manifest.get("templates", {}).items() if k not in stale_templates}
+    for key, content in parsed["templates"].items():
+        ext = all_template_files[key]["extension"]
+        templates_manifest[key] = {"blob": put_blob(content, ext), "extension": ext, "inputs": hashes[key]}
+    profile.add("template_writes", time.monotonic() - write_start)
+
+    # Wave-lite-rds SQL via the sedalternative.py path.
+    if _WAVE_LITE_RDS_KEY in stale_templates:
+        with profile.phase("wave_lite_render"):
+            templates_manifest[_WAVE_LITE_RDS_KEY] = {
+                "blob": _render_wave_lite_rds(),
+                "extension": all_template_files[_WAVE_LITE_RDS_KEY]["extension"],
+                "inputs": hashes[_WAVE_LITE_RDS_KEY],
+            }
+
+    write_start = time.monotonic()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    files_manifest = {n: h for n, h in manifest.get("files", {}).items() if n not in stale_files}
+
+    # Persist resolved locals (useful for debugging; not consumed by tests today).
+    if "locals.json" in stale_files:
         (cache_dir / "locals.json").write_text(json.dumps(parsed["locals"], indent=2))
+        files_manifest["locals.json"] = hashes["locals.json"]
 
-        # Persist resolved `module.connection_strings` outputs — consumed by `test_outputs.py`.
+    # Persist resolved `module.connection_strings` outputs — consumed by `test_outputs.py`.
+    if "outputs.json" in stale_files:
         (cache_dir / "outputs.json").write_text(json.dumps(parsed["outputs"], indent=2))
+        files_manifest["outputs.json"] = hashes["outputs.json"]
+
+    # Manifest last: its presence marks the scenario directory as complete. `static`
+    # lets `cache/bundle.py` export every scenario built from the same disk state.
+    write_manifest(
+        cache_dir,
+        {"templates": templates_manifest, "files": files_manifest, "static": _compute_static_hash_part()},
+    )
+    profile.add("template_writes", time.monotonic() - write_start)
 
-        # Persist rendered templates.
-        for key, content in parsed["templates"].items():
-            ext = all_template_files[key]["extension"]
-            (cache_dir / f"{key}{ext}").write_text(content)
+    full_render = not manifest.get("templates") and len(stale_files) == 2
+    status = "miss-ok" if full_render else "partial-ok"
+    profile.finish(status)
+    return scenario_hash, time.time() - start, status
 
-        # Wave-lite-rds SQL via the sedalternative.py path.
-        _render_wave_lite_rds(cache_dir)
 
-        return scenario_hash, time.time() - start, "miss-ok"
-    finally:
-        tfvars_path.unlink(missing_ok=True)
-        state_path.unlink(missing_ok=True)
+def _selective_enabled() -> bool:
+    """`PRECOMPUTE_ALL_TEMPLATES=1` renders every template regardless of what tests read."""
+    return os.environ.get("PRECOMPUTE_ALL_TEMPLATES", "0").lower() in {"0", "false", "no"}
+
+
+## ------------------------------------------------------------------------------------
+## Scheduling
+## ------------------------------------------------------------------------------------
+_TIMINGS_FILENAME = "timings.json"
+
+# Resident memory of one `terraform console` (core + AWS provider plugin schema load).
+# Override with PRECOMPUTE_CONSOLE_MEMORY_MB if your provider set is heavier or lighter.
+_DEFAULT_CONSOLE_MEMORY_MB = 700
+
+# Each pool worker holds its current console plus one warm spare (see `ConsolePool`).
+_CONSOLES_PER_WORKER = 2
+
+
+def _available_cores() -> int:
+    """Cores this process may actually run on (respects cgroup/taskset affinity on Linux)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
 
 
-def precompute_in_parallel(scenarios: dict[str, str], max_workers: int = 8) -> dict[str, str]:
-    """Run `_precompute_scenario` over all unique scenarios in parallel. Return status map."""
+def _available_memory_mb() -> int | None:
+    """`MemAvailable` from /proc/meminfo, or `None` where that isn't readable (non-Linux)."""
+    try:
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def recommended_worker_count() -> int:
+    """Size the console pool from available cores and memory.
+
+    `PRECOMPUTE_MAX_WORKERS` pins the count outright. Otherwise: one worker per pair of
+    available cores (each worker's warm spare boots while its current console evaluates, so
+    every worker keeps two terraform processes busy), capped so that every worker's pair of
+    consoles fits in `MemAvailable`.
+    """
+    pinned = os.environ.get("PRECOMPUTE_MAX_WORKERS")
+    if pinned:
+        return max(1, int(pinned))
+
+    workers = _available_cores() // _CONSOLES_PER_WORKER
+    memory_mb = _available_memory_mb()
+    if memory_mb is not None:
+        per_console_mb = int(os.environ.get("PRECOMPUTE_CONSOLE_MEMORY_MB", _DEFAULT_CONSOLE_MEMORY_MB))
+        workers = min(workers, memory_mb // (per_console_mb * _CONSOLES_PER_WORKER))
+    return max(1, workers)
+
+
+def _timings_path() -> Path:
+    return Path(FP.CACHE_SCENARIO_DIR) / _TIMINGS_FILENAME
+
+
+def _load_timings() -> dict[str, float]:
+    """Historical per-scenario execution seconds (keyed by `hash_scenario`) from previous sessions."""
+    try:
+        return json.loads(_timings_path().read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _record_timings(observed: dict[str, float]) -> None:
+    """Fold this session's timings into the history (equal-weight moving average) and persist atomically."""
+    if not observed:
+        return
+    history = _load_timings()
+    for h, seconds in observed.items():
+        history[h] = round((history[h] + seconds) / 2 if h in history else seconds, 3)
+    path = _timings_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, prefix=f".{path.name}.", delete=False) as tmp:
+        json.dump(history, tmp, indent=2, sort_keys=True)
+    os.replace(tmp.name, path)
+
+
+def _order_longest_first(scenarios: dict[str, str], history: dict[str, float]) -> dict[str, str]:
+    """Reorder scenarios by expected duration, descending. Never-seen scenarios go first.
+
+    Unknown scenarios are usually brand-new full renders (the slowest kind), and starting
+    the longest work first keeps one straggler from extending the tail of the run.
+    """
+    return dict(sorted(scenarios.items(), key=lambda item: history.get(item[0], float("inf")), reverse=True))
+
+
+def _run_scenarios(
+    scenarios: dict[str, str],
+    max_workers: int,
+    stats: dict | None = None,
+    required: dict[str, set[str] | None] | None = None,
+) -> dict[str, str]:
+    """Dispatch `{scenario_hash: tf_modifiers}` to the warm console pool. Return per-scenario statuses.
+
+    Scenarios are scheduled longest-expected-first from the timing history; successful
+    scenarios' execution times are written back to it. Queue vs execution totals are
+    accumulated into `stats` when given.
+    """
+    required = required or {}
+    ordered = _order_longest_first(scenarios, _load_timings())
+    pool = ConsolePool(max_workers=max_workers)
+    statuses = pool.run(
+        ordered,
+        lambda h, tfvars, session: _precompute_scenario(h, tfvars, session=session, wanted=required.get(h))[2],
+        on_error=lambda h, e: f"miss-err: worker-crash {e}",
+    )
+
+    observed = {h: timing[1] for h, timing in pool.timings.items() if not statuses[h].startswith("miss-err")}
+    _record_timings(observed)
+
+    if stats is not None:
+        queued = [q for q, _ in pool.timings.values()]
+        executed = [e for _, e in pool.timings.values()]
+        stats["dispatched"] = stats.get("dispatched", 0) + len(pool.timings)
+        stats["queued_s"] = stats.get("queued_s", 0.0) + sum(queued)
+        stats["max_queued_s"] = max([stats.get("max_queued_s", 0.0), *queued])
+        stats["execution_s"] = stats.get("execution_s", 0.0) + sum(executed)
+    return statuses
+
+
+def precompute_in_parallel(
+    scenarios: dict[str, str],
+    max_workers: int | None = None,
+    stats: dict | None = None,
+    required: dict[str, set[str] | None] | None = None,
+) -> dict[str, str]:
+    """Run the precompute over all unique scenarios on a warm console pool. Return status map.
+
+    Freshness is resolved up front (disk + manifest check only) so the pool never launches
+    a console for a scenario that doesn't need one: full hits are reported directly, and
+    scenarios whose only stale part renders without console are handled inline. The rest
+    are dispatched to `ConsolePool`, which keeps each worker's next console starting up while
+    the current scenario evaluates — see `tests/utils/terraform/console.py`.
+
+    `max_workers` defaults to `recommended_worker_count()` (half the cores, capped by memory).
+    Work is ordered longest-expected-first using per-scenario timings from previous
+    sessions (`tests/.scenario_cache/timings.json`). If `stats` is given it receives
+    `workers`, `dispatched`, `queued_s`, `max_queued_s` and `execution_s`. Per-phase timings
+    for every console run are written to `FP.PRECOMPUTE_PROFILE` (JSONL; see `profiling.py`).
+
+    `required` (`{scenario_hash: template_keys | None}`, from `collect_required_templates`)
+    limits each scenario to the templates its tests read; `None` entries and absent scenarios
+    get every template. `PRECOMPUTE_ALL_TEMPLATES=1` ignores it.
+    """
     if not scenarios:
         return {}
+    if required is None or not _selective_enabled():
+        required = {}
 
     Path(FP.CACHE_SCENARIO_DIR).mkdir(parents=True, exist_ok=True)
 
     # Clear override.auto.tfvars so each worker's -var-file is the authoritative tfvars source.
     Path(FP.TFVARS_AUTO_OVERRIDE_DST).unlink(missing_ok=True)
 
-    statuses: dict[str, str] = {}
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_precompute_scenario, h, tfvars): h for h, tfvars in scenarios.items()}
-        for future in concurrent.futures.as_completed(futures):
-            h = futures[future]
-            try:
-                _, _elapsed, status = future.result()
-            except Exception as e:
-                status = f"miss-err: worker-crash {e}"
-            statuses[h] = status
+    workers = max_workers or recommended_worker_count()
+    if stats is not None:
+        stats["workers"] = workers
+    profiling.reset()
 
+    statuses: dict[str, str] = {}
+    console_misses: dict[str, str] = {}
+    for h, tfvars in scenarios.items():
+        cache_dir = Path(FP.CACHE_SCENARIO_DIR) / hash_templatefile_cache_key(tfvars)
+        touch_scenario(cache_dir)  # LRU bookkeeping for `housekeeping.collect_garbage`
+        stale_templates, stale_files = _stale_parts(cache_dir, read_manifest(cache_dir), required.get(h))
+        if not stale_templates and not stale_files:
+            statuses[h] = "hit"
+        elif _needs_console(stale_templates, stale_files):
+            console_misses[h] = tfvars
+        else:
+            statuses[h] = _precompute_scenario(h, tfvars, wanted=required.get(h))[2]
+
+    if not console_misses:
+        profiling.write_jsonl(FP.PRECOMPUTE_PROFILE)
+        return statuses
+
+    statuses.update(_run_scenarios(console_misses, workers, stats, required))
+
+    profiling.write_jsonl(FP.PRECOMPUTE_PROFILE)
     return statuses
 
 
@@ -372,14 +665,14 @@ def _called_name(call: ast.Call) -> str | None:
     return None
 
 
-def _collect_delta_constant_names(tree: ast.AST) -> set[str]:
-    """Names of constants passed to `merge_deltas(...)`, excluding the OFF baseline."""
+def _collect_delta_constant_names(tree: ast.AST, exclude: set[str] = _BASELINE_CONST_NAMES) -> set[str]:
+    """Names of constants passed to `merge_deltas(...)`, excluding the OFF baseline by default."""
     names: set[str] = set()
     for node in ast.walk(tree):
         if not isinstance(node, ast.Call) or _called_name(node) != "merge_deltas":
             continue
         for arg in node.args:
-            if isinstance(arg, ast.Name) and arg.id not in _BASELINE_CONST_NAMES:
+            if isinstance(arg, ast.Name) and arg.id not in exclude:
                 names.add(arg.id)
     return names
 
@@ -492,6 +785,92 @@ def write_scenario_index(items) -> Path:
                 lines.append(f"| `{test_name}` | {joined} |")
             lines.append("")
 
+    # Shared by every session on this checkout: stage, then rename, so a reader (or a
+    # concurrent session's write) never sees a partial file.
     index_path = cache_root / "INDEX.md"
-    index_path.write_text("\n".join(lines))
+    staged = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+    staged.write_text("\n".join(lines))
+    staged.replace(index_path)
     return index_path
+
+
+## ------------------------------------------------------------------------------------
+## Selective rendering
+## ------------------------------------------------------------------------------------
+_BUNDLE_FIXTURE = "generated_test_files"
+
+
+def _templates_asserted_by(call: ast.Call, tree: ast.AST, globals_: dict) -> set[str] | None:
+    """Templates with non-empty expectations reaching the `assert_all_deltas` `call`; `None` if unresolvable."""
+    sources = [
+        arg
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and _called_name(node) == "merge_deltas"
+        for arg in node.args
+    ]
+    if len(call.args) > 1 and isinstance(call.args[1], ast.Name) and call.args[1].id in globals_:
+        sources.append(call.args[1])
+    if not sources or not all(isinstance(a, ast.Name) and isinstance(globals_.get(a.id), dict) for a in sources):
+        return None
+    return set().union(*(_templates_from_delta_constant(globals_[a.id]) for a in sources))
+
+
+def required_templates_for_item(item) -> set[str] | None:
+    """Templates a test reads from `generated_test_files`; `None` means "assume all of them".
+
+    Unlike `_compute_required_templates` (INDEX.md's "what does this test change" view), this
+    counts `BASELINE_ASSERTIONS` too: `assert_all_deltas` checks every template whose merged
+    entry is non-empty. Recognised uses of the fixture:
+      - `assert_all_deltas(generated_test_files, expected)` → every non-empty template of
+        each constant passed to `merge_deltas(...)`, or passed directly as `expected`
+      - `generated_test_files["<key>"]` → that template (testcontainer tests)
+    Tests that don't request the fixture (e.g. output-only tests) need no templates. Any
+    other use — passing the bundle on, iterating it, a computed key, an unresolvable
+    constant — falls back to `None`.
+    """
+    if _BUNDLE_FIXTURE not in getattr(item, "fixturenames", ()):
+        return set()
+    func = getattr(item, "function", None)
+    tree = _parse_function_ast(func) if func is not None else None
+    if tree is None:
+        return None
+    globals_ = getattr(func, "__globals__", {})
+
+    parents = {child: node for node in ast.walk(tree) for child in ast.iter_child_nodes(node)}
+    required: set[str] = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Name) or node.id != _BUNDLE_FIXTURE:
+            continue
+        parent = parents.get(node)
+        if (
+            isinstance(parent, ast.Subscript)
+            and parent.value is node
+            and isinstance(parent.slice, ast.Constant)
+            and isinstance(parent.slice.value, str)
+        ):
+            required.add(parent.slice.value)
+        elif isinstance(parent, ast.Call) and _called_name(parent) == "assert_all_deltas" and parent.args[0] is node:
+            asserted = _templates_asserted_by(parent, tree, globals_)
+            if asserted is None:
+                return None
+            required |= asserted
+        else:
+            return None
+    return required
+
+
+def collect_required_templates(items) -> dict[str, set[str] | None]:
+    """Per scenario hash, the union of `required_templates_for_item` over its tests (`None` = all).
+
+    Fed to `precompute_in_parallel` so each scenario renders only what its tests read.
+    """
+    required: dict[str, set[str] | None] = {}
+    for item in items:
+        marker = item.get_closest_marker("tfvars")
+        scenario_hash = hash_scenario(marker.args[0] if marker else "#NONE")
+        item_required = required_templates_for_item(item)
+        if item_required is None or (scenario_hash in required and required[scenario_hash] is None):
+            required[scenario_hash] = None
+        else:
+            required[scenario_hash] = required.get(scenario_hash, set()) | item_required
+    return required
@@ -0,0 +1,141 @@
+"""Per-phase timing profile for the scenario precompute.
+
+Each console run (one scenario, or one batched group of scenarios) records how long it
+spent in each phase:
+
+  payload_build      Python: 009/012 reads, secret substitution, mega-expression assembly
+  tfvars_write       Python: per-session tfvars tempfile
+  console_spawn      `Popen` of `terraform console` (process creation only)
+  console_warm_lead  time between spawn and first request — startup hidden behind the
+                     previous scenario by the warm pool (informational, not on the critical path)
+  console_evaluate   waiting on console: whatever init the warm lead didn't cover + evaluation
+  json_parse         Python: decoding the double-encoded JSON response
+  template_writes    Python: blob-store puts, locals/outputs writes, manifests
+  wave_lite_render   `sedalternative.py` subprocess for `wave-lite-rds.sql`
+
+`console_evaluate` large relative to `console_warm_lead` means startup isn't being hidden
+(too few queued scenarios per worker); the Python phases growing with scenario count
+means our own code is the bottleneck.
+
+Profiles are collected in-process (thread-safe — pool workers are threads) and written as
+JSONL, one object per console run, to `FP.PRECOMPUTE_PROFILE` in the session workspace
+(kept after the session when `CX_TEST_WORKSPACE` pins the workspace).
+"""
+
+import json
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+PHASES = (
+    "payload_build",
+    "tfvars_write",
+    "console_spawn",
+    "console_warm_lead",
+    "console_evaluate",
+    "json_parse",
+    "template_writes",
+    "wave_lite_render",
+)
+
+_collected: list[dict] = []
+_lock = threading.Lock()
+
+
+class PhaseProfile:
+    """Phase durations for one console run. Phases may be entered more than once; durations add up."""
+
+    def __init__(self, label: str, scenarios: list[str]):
+        self.label = label
+        self.scenarios = scenarios
+        self.phases: dict[str, float] = {}
+        self.status = ""
+        self._start = time.monotonic()
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Accumulate `seconds` onto `phase`."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as `name`."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, time.monotonic() - start)
+
+    def finish(self, status: str) -> None:
+        """Stamp the outcome and hand the profile to the session collector."""
+        self.status = status
+        record = {
+            "label": self.label,
+            "scenarios": self.scenarios,
+            "status": status,
+            "total": round(time.monotonic() - self._start, 4),
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+        }
+        with _lock:
+            _collected.append(record)
+
+
+def reset() -> None:
+    """Drop profiles from any previous precompute in this process."""
+    with _lock:
+        _collected.clear()
+
+
+def collected() -> list[dict]:
+    """Snapshot of the profiles recorded since the last `reset()`."""
+    with _lock:
+        return list(_collected)
+
+
+def write_jsonl(path: str | Path, profiles: list[dict] | None = None) -> Path:
+    """Write one JSON object per console run to `path` (overwritten each session)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in (collected() if profiles is None else profiles))
+    return path
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; small-N friendly (no interpolation past the observed max)."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(profiles: list[dict]) -> dict[str, dict[str, float]]:
+    """`{phase: {p50, p95, max, total}}` across all profiles that recorded the phase."""
+    summary: dict[str, dict[str, float]] = {}
+    for phase in PHASES:
+        values = sorted(p["phases"][phase] for p in profiles if phase in p["phases"])
+        if not values:
+            continue
+        summary[phase] = {
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "max": values[-1],
+            "total": sum(values),
+        }
+    return summary
+
+
+def format_summary(profiles: list[dict]) -> str:
+    """Fixed-width p50/p95/max/total table, one row per phase."""
+    summary = summarize(profiles)
+    if not summary:
+        return "Precompute profile: no console runs recorded."
+    lines = [
+        f"Precompute profile ({len(profiles)} runs):",
+        f"  {'phase':<18} {'p50':>9} {'p95':>9} {'max':>9} {'total':>9}",
+    ]
+    for phase, stats in summary.items():
+        lines.append(
+            f"  {phase:<18} {stats['p50']:>8.3f}s {stats['p95']:>8.3f}s {stats['max']:>8.3f}s {stats['total']:>8.2f}s"
+        )
+    return "\n".join(lines)
@@ -2,65 +2,128 @@
 
 Tests no longer invoke `terraform console` at runtime. Every templatefile is rendered
 upfront by `tests/utils/terraform/precompute.py` during `session_setup`, in parallel per
-scenario. This module just reads the per-scenario cache directory and returns the result
-in the shape consumers expect.
+scenario. This module just reads the per-scenario `manifest.json`, resolves each template
+to its content-addressed blob, and returns the result in the shape consumers expect.
+
+The bundle is lazy: a template's `content` is only parsed (YAML / JSON / kv) when a test
+reads it, and both bundles and parsed content are memoised for the whole pytest process.
 
 If `generate_tc_files` is called for a scenario whose precompute failed, the missing-file
 read raises `FileNotFoundError` — diagnosed via `tests/.scenario_cache/INDEX.md`, which
-flags failed scenarios with `⚠️ precompute failed`.
+flags failed scenarios with `⚠️ precompute failed`. Templates that no collected test in the
+scenario reads are not rendered at all (see `precompute.required_templates_for_item`); they
+stay in the bundle, but reading their `content` / `filepath` raises `FileNotFoundError`.
 """
 
+from collections.abc import Iterator, Mapping
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
+from tests.utils.cache.blobstore import read_manifest, resolve_entry
 from tests.utils.cache.cache import hash_templatefile_cache_key
+from tests.utils.cache.housekeeping import touch_scenario
 from tests.utils.config import FP, all_template_files
 
 
-# `all_template_files` key uses underscores; the actual on-disk filename uses hyphens.
-_WAVE_LITE_RDS_KEY = "wave_lite_rds"
-_WAVE_LITE_RDS_FILENAME = "wave-lite-rds.sql"
+# Process-wide memos. Hundreds of tests share a handful of scenarios (most use `#NONE`), so
+# each (scenario, template) is parsed at most once per pytest process. Keyed by the scenario
+# directory rather than the bare cache key so a redirected `FP.CACHE_SCENARIO_DIR` can't alias.
+_bundles: dict[str, Mapping[str, "RenderedTemplate"]] = {}
+_parsed_content: dict[tuple[str, str], Any] = {}
+
+
+class RenderedTemplate(Mapping):
+    """One pre-rendered template: `{extension, read_type, content, filepath, validation_type}`.
+
+    `content` is parsed with the template's `read_type` on first access and memoised for the
+    process; every other field is a plain value. Callers must treat `content` (like the blob at
+    `filepath`) as read-only — it is shared by every test using the same scenario.
+    """
+
+    __slots__ = ("_fields", "_memo_key")
+
+    def __init__(self, cache_dir: Path, key: str, meta: dict, filepath: Path | None):
+        self._memo_key = (str(cache_dir), key)
+        self._fields = {
+            "extension": meta["extension"],
+            "read_type": meta["read_type"],
+            "filepath": str(filepath) if filepath is not None else None,
+            "validation_type": meta["validation_type"],
+        }
+
+    def __getitem__(self, name: str) -> Any:
+        if name in ("content", "filepath") and self._fields["filepath"] is None:
+            cache_dir, key = self._memo_key
+            raise FileNotFoundError(
+                f"Template '{key}' was not rendered for {cache_dir}: no collected test in this scenario "
+                f"reads it (see `required_templates_for_item` in precompute.py). "
+                f"Set PRECOMPUTE_ALL_TEMPLATES=1 to render every template."
+            )
+        if name != "content":
+            return self._fields[name]
+        if self._memo_key not in _parsed_content:
+            _parsed_content[self._memo_key] = self._fields["read_type"](self._fields["filepath"])
+        return _parsed_content[self._memo_key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from ("extension", "read_type", "content", "filepath", "validation_type")
+
+    def __len__(self) -> int:
+        return 5
 
 
-def _cache_filename(key: str, extension: str) -> str:
-    """Map a template key to its on-disk filename inside the scenario cache directory."""
-    if key == _WAVE_LITE_RDS_KEY:
-        return _WAVE_LITE_RDS_FILENAME
-    return f"{key}{extension}"
+def clear_memo() -> None:
+    """Forget memoised bundles and parsed content (tests that rewrite a scenario in place)."""
+    _bundles.clear()
+    _parsed_content.clear()
 
 
 def generate_tc_files(tf_modifiers):
-    """Read every pre-rendered templatefile from this scenario's cache directory.
+    """Return the pre-rendered templatefile bundle for this scenario, resolving through its manifest.
 
     Args:
         tf_modifiers: The per-test tfvars block (from `@pytest.mark.tfvars(...)`). Used
             to compute the cache directory.
 
     Returns:
-        `{template_key: {extension, read_type, content, filepath, validation_type}}` —
-        the shape `assert_all_deltas` and the testcontainer tests expect.
+        Read-only `{template_key: RenderedTemplate}` — each value behaves like
+        `{extension, read_type, content, filepath, validation_type}`, the shape
+        `assert_all_deltas` and the testcontainer tests expect. Nothing is parsed until a
+        test reads `content`. `filepath` points into the shared blob store and must be
+        treated as read-only. The same bundle is returned for every call with the same
+        scenario for the rest of the process.
 
     Raises:
-        FileNotFoundError: a cache file is missing. Means precompute failed for this
-            scenario — check `tests/.scenario_cache/INDEX.md`.
+        FileNotFoundError: the manifest or a recorded blob is missing. Means precompute
+            failed for this scenario — check `tests/.scenario_cache/INDEX.md`. Templates
+            absent from the manifest (not selected for rendering) raise on access instead.
     """
     cache_key = hash_templatefile_cache_key(tf_modifiers)
     cache_dir = Path(FP.CACHE_SCENARIO_DIR) / cache_key
+    if str(cache_dir) in _bundles:
+        return _bundles[str(cache_dir)]
 
-    result: dict[str, dict] = {}
+    manifest = read_manifest(cache_dir)
+    templates = (manifest or {}).get("templates", {})
+    if manifest is not None:
+        touch_scenario(cache_dir)
+
+    result: dict[str, RenderedTemplate] = {}
     for key, meta in all_template_files.items():
-        filename = _cache_filename(key, meta["extension"])
-        filepath = cache_dir / filename
-        if not filepath.exists():
+        entry = templates.get(key)
+        if entry is None and manifest is not None:
+            # Deliberately not rendered for this scenario; fails only if a test reads it.
+            result[key] = RenderedTemplate(cache_dir, key, meta, None)
+            continue
+        filepath = resolve_entry(entry) if entry else None
+        if filepath is None or not filepath.exists():
             raise FileNotFoundError(
-                f"Expected pre-rendered template at {filepath}. "
+                f"Expected pre-rendered template '{key}' for {cache_dir} (blob: {filepath}). "
                 f"Precompute may have failed for this scenario — check tests/.scenario_cache/INDEX.md."
             )
-        read_type = meta["read_type"]
-        result[key] = {
-            "extension": meta["extension"],
-            "read_type": read_type,
-            "content": read_type(str(filepath)),
-            "filepath": str(filepath),
-            "validation_type": meta["validation_type"],
-        }
-    return result
+        result[key] = RenderedTemplate(cache_dir, key, meta, filepath)
+
+    bundle = MappingProxyType(result)
+    _bundles[str(cache_dir)] = bundle
+    return bundle
@@ -0,0 +1,117 @@
+"""Per-session overlay workspace that terraform runs in, instead of the project root.
+
+The overlay at `FP.WORKSPACE` symlinks every project entry (`.tf` files, `modules/`,
+`assets/`, ...) back to `FP.ROOT`, and keeps everything a session writes private:
+
+  - test tfvars (`terraform.tfvars`, `*.auto.tfvars`) are copied in, never linked, so the
+    deployer's own tfvars are neither read nor moved aside
+  - the generated secret fixtures are copied into `test-secrets/` (`stage_secrets`), so
+    another session regenerating `tests/datafiles/` can't delete them mid-precompute
+  - the precompute profile (`precompute_profile.jsonl`) is written here
+  - `tfplan` / `tfplan.json` / `terraform.tfstate` and the 009/012 JSON are written here
+  - `.terraform/` is the workspace's own data dir: provider and module directories link to
+    the root's (read-only after `terraform init`), small state files are copied
+
+So two pytest sessions — or pytest-xdist workers, one workspace each — can run against one
+checkout at the same time. Caches (`tests/.plan_cache`, `tests/.scenario_cache`) stay in
+the root and are shared; `tests/.scenario_cache/INDEX.md` is rewritten atomically by
+whichever session finishes its precompute last.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+
+from tests.utils.config import FP, WORKSPACE_PARENT
+
+# Root entries that belong to one session (or to the deployer) and are never linked.
+_PRIVATE_NAMES = {
+    ".git",
+    ".terraform",
+    "terraform.tfvars",
+    "terraform.tfstate",
+    "terraform.tfstate.backup",
+    "tfplan",
+    "tfplan.json",
+    "009_define_file_templates.json",
+    "012_outputs.json",
+    "test-secrets",
+    "precompute_profile.jsonl",
+}
+_PRIVATE_SUFFIXES = (".auto.tfvars", ".tfvars.backup")
+
+# Dropped into every workspace; `remove_workspace` refuses to delete a directory without it.
+_MARKER = ".cx-test-workspace"
+
+
+def _is_private(name: str) -> bool:
+    return name in _PRIVATE_NAMES or name.endswith(_PRIVATE_SUFFIXES)
+
+
+def build_workspace(workspace: str | Path | None = None, root: str | Path | None = None) -> Path:
+    """(Re)create the overlay of `root` (default `FP.ROOT`) at `workspace` (default `FP.WORKSPACE`).
+
+    Raises:
+        ValueError: `workspace` is the project root, or an existing non-workspace directory.
+    """
+    workspace = Path(workspace or FP.WORKSPACE)
+    root = Path(root or FP.ROOT).resolve()
+    if workspace.resolve() == root:
+        raise ValueError(f"Test workspace must not be the project root ({root}).")
+    remove_workspace(workspace)
+    workspace.mkdir(parents=True, exist_ok=True)
+    (workspace / _MARKER).write_text(str(root))
+
+    for entry in root.iterdir():
+        if not _is_private(entry.name):
+            (workspace / entry.name).symlink_to(entry, target_is_directory=entry.is_dir())
+
+    data_dir = root / ".terraform"
+    if data_dir.is_dir():
+        (workspace / ".terraform").mkdir()
+        for entry in data_dir.iterdir():
+            target = workspace / ".terraform" / entry.name
+            if entry.is_dir():
+                target.symlink_to(entry, target_is_directory=True)
+            else:
+                shutil.copy2(entry, target)
+    return workspace
+
+
+def remove_workspace(workspace: str | Path | None = None) -> None:
+    """Delete a workspace built by `build_workspace`. Symlinks are removed, never followed.
+
+    Raises:
+        ValueError: `workspace` exists but isn't an empty dir or a workspace (no marker file).
+    """
+    workspace = Path(workspace or FP.WORKSPACE)
+    if not workspace.exists():
+        return
+    if not (workspace / _MARKER).exists() and any(workspace.iterdir()):
+        raise ValueError(f"Refusing to delete {workspace}: not a test workspace (no {_MARKER}).")
+    shutil.rmtree(workspace)
+
+
+def stage_secrets() -> None:
+    """Copy the generated secret fixtures into the workspace. Call under `datafiles_lock`."""
+    for path in (FP.TOWER_SECRETS, FP.GROUNDSWELL_SECRETS, FP.SEQERAKIT_SECRETS, FP.WAVE_LITE_SECRETS):
+        staged = Path(path)
+        staged.parent.mkdir(mode=0o700, exist_ok=True)
+        shutil.copyfile(Path(FP.SECRETS_SRC_DIR) / staged.name, staged)
+
+
+@contextlib.contextmanager
+def datafiles_lock() -> Iterator[None]:
+    """Exclusive lock for regenerating `tests/datafiles/` and copying out of it (shared by every session on this checkout)."""
+    key = hashlib.sha256(FP.ROOT.encode()).hexdigest()[:16]
+    lock_path = Path(WORKSPACE_PARENT) / f"datafiles-{key}.lock"
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("w") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)